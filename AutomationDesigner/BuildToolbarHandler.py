@@ -21,4 +21,18 @@ def buildToolbarHandler(self):
         # Stop button
         self._stop_action = QAction("Stop", self)
         self._stop_action.triggered.connect(self._on_stop)
-        toolbar.addAction(self._stop_action)
\ No newline at end of file
+        toolbar.addAction(self._stop_action)
+
+        toolbar.addSeparator()
+
+        # Record button: captures keyboard/mouse input into a new Start → … → End chain
+        self._record_action = QAction("Record", self)
+        self._record_action.setCheckable(True)
+        self._record_action.toggled.connect(self._on_record)
+        toolbar.addAction(self._record_action)
+
+        # Trace button: records the run until unchecked, then saves a Chrome/Perfetto trace
+        self._trace_action = QAction("Trace", self)
+        self._trace_action.setCheckable(True)
+        self._trace_action.toggled.connect(self._on_trace)
+        toolbar.addAction(self._trace_action)
\ No newline at end of file
@@ -0,0 +1,52 @@
+# AutomationDesigner/BuildViewMenuHandler.py
+
+from PySide6.QtGui import QAction, QActionGroup
+
+import shared.globals as g
+from handlers.Overlay import OVERLAY_MODES
+from shared import Log
+
+def buildViewMenuHandler(self):
+    view_menu = self.menuBar().addMenu("View")
+
+    # Coordinates overlay (also toggled by F3)
+    self._overlay_action = QAction("Coordinates Overlay (F3)", self)
+    self._overlay_action.setCheckable(True)
+    self._overlay_action.toggled.connect(self._overlay.set_active)
+    view_menu.addAction(self._overlay_action)
+
+    # Where the overlay sits
+    mode_group = QActionGroup(self)
+    mode_group.setExclusive(True)
+    labels = {'Corner': "Overlay in Top-Right Corner", 'Follow': "Overlay Follows Cursor"}
+    for mode in OVERLAY_MODES:
+        mode_action = QAction(labels.get(mode, mode), self)
+        mode_action.setCheckable(True)
+        mode_action.setChecked(mode == g.overlay_mode)
+        mode_action.triggered.connect(lambda checked=False, mode=mode: self._overlay.set_mode(mode))
+        mode_group.addAction(mode_action)
+        view_menu.addAction(mode_action)
+
+    # Pixel color under the cursor
+    color_action = QAction("Show Pixel Color", self)
+    color_action.setCheckable(True)
+    color_action.setChecked(g.overlay_show_color)
+    color_action.toggled.connect(self._overlay.set_show_color)
+    view_menu.addAction(color_action)
+
+    view_menu.addSeparator()
+
+    # Log level per area (engine = node steps, handlers = hotkeys/listeners, ...)
+    logging_menu = view_menu.addMenu("Logging")
+    for area in ['', *Log.AREAS]:
+        area_menu = logging_menu.addMenu(area or "Default")
+        level_group = QActionGroup(self)
+        level_group.setExclusive(True)
+        current = Log.getLevel(area)
+        for name, level in Log.LEVEL_NAMES.items():
+            level_action = QAction(name.capitalize(), self)
+            level_action.setCheckable(True)
+            level_action.setChecked(level == current)
+            level_action.triggered.connect(lambda checked=False, area=area, level=level: Log.setLevel(area, level))
+            level_group.addAction(level_action)
+            area_menu.addAction(level_action)
@@ -1,6 +1,9 @@
 # AutomationDesigner/ClearAllNodesFallbackHandler.py
 
+from handlers.BulkEdit import clearGraph
+
 def clearAllNodesFallbackHandler(self):
-    for node in list(self._graph.all_nodes()):
-        self._graph.remove_node(node)
-    print("[Main] All nodes cleared using fallback method.")
\ No newline at end of file
+    clearGraph(self._graph)
+    self._hotkey_index.rebuild([])
+    self._backdrop_index.invalidate()
+    print("[Main] All nodes cleared.")
\ No newline at end of file
@@ -0,0 +1,34 @@
+# AutomationDesigner/CompileStartPathHandler.py
+
+from engine.ExecutionPlan import NODE_FIELDS, compilePath
+
+def compileStartPathHandler(self, start_node):
+    """
+    Walk the live graph from start_node once (on the GUI thread) and return
+    an ExecutionPlan the loop worker can run without touching any node objects.
+    """
+    graph = self._graph
+
+    def get_node(node_id):
+        node = graph.get_node_by_id(node_id)
+        if node is None:
+            return None
+        fields = NODE_FIELDS.get(node.type_, ())
+        return node.type_, {name: node.get_property(name) for name in fields}
+
+    def get_next(node_id, port=None):
+        node = graph.get_node_by_id(node_id)
+        outputs = node.outputs()
+        if not outputs:
+            return None
+        # No port: the first output (a branching node's 'found'/main output)
+        out_port = outputs.get(port) if port is not None else outputs[list(outputs.keys())[0]]
+        if out_port is None:
+            return None
+        connected_ports = out_port.connected_ports()
+        if not connected_ports:
+            return None
+        next_node = connected_ports[0].node()
+        return next_node.id if next_node is not None else None
+
+    return compilePath(start_node.id, get_node, get_next)
@@ -1,7 +1,16 @@
 # AutomationDesigner/CopyPasteEventHandler.py
 
-from PySide6.QtCore import Qt, QTimer
-import traceback
+import json
+
+from PySide6.QtCore import Qt, QMimeData
+from PySide6.QtWidgets import QApplication
+
+from handlers.BulkEdit import bulkEdit
+
+# Clipboard format of copied nodes; the same JSON is also put on the clipboard as text
+# so a copy from one BAM window pastes into another.
+BAM_NODES_MIME = 'application/x-bam-nodes'
+PASTE_OFFSET = 20
 
 def copyPasteEventHandler(self, event):
     if event.modifiers() == Qt.ControlModifier:
@@ -22,84 +31,69 @@ def copySelectedNodesHandler(self):
         print("[Main_Copy] No nodes selected for copy.")
         return
 
-    self._clipboard = []
-    for node in selected:
-        # Corrected line: node.id is an attribute, not a method
-        if hasattr(node, 'copy') and callable(node.copy):
-            entry = node.copy()
-            self._clipboard.append(entry)
-        else:
-            print(f"[Main_Copy] ERROR: Node {node.id} has no 'copy' method!") # Corrected here too
-
-def pasteSelectedNodesHandler(self):
-    if not getattr(self, "_clipboard", None) or not self._clipboard:
-        print("[Main_Paste] Clipboard is empty. Nothing to paste.")
-        return
+    # Self-contained snapshot: the nodes (session format) and only the
+    # connections between them, so pasting never needs the originals.
+    data = self._graph._serialize(selected)
+    copied_ids = data['nodes'].keys()
+    data['connections'] = [
+        conn for conn in data.get('connections', [])
+        if conn['out'][0] in copied_ids and conn['in'][0] in copied_ids
+    ]
+    self._clipboard = data
 
-    orig_to_new = {}
-    newly_created_nodes_for_props = []
+    try:
+        payload = json.dumps(data)
+        mime = QMimeData()
+        mime.setData(BAM_NODES_MIME, payload.encode('utf-8'))
+        mime.setText(payload)
+        QApplication.clipboard().setMimeData(mime)
+    except Exception as e:
+        print(f"[Main_Copy] Could not put nodes on the system clipboard: {e}")
+    print(f"[Main_Copy] Copied {len(data['nodes'])} node(s), {len(data['connections'])} connection(s).")
 
-    for i, (orig_id, NodeClass, props_from_copy, (x_orig, y_orig)) in enumerate(self._clipboard):
-        new_node = NodeClass()
-        self._graph.add_node(new_node)
-        new_pos_x, new_pos_y = x_orig + 20, y_orig + 20
-        new_node.set_pos(new_pos_x, new_pos_y)
-        orig_to_new[orig_id] = new_node
-        newly_created_nodes_for_props.append({'node': new_node, 'props': props_from_copy, 'orig_id': orig_id})
+def _read_clipboard(self):
+    # System clipboard first (another BAM window may have copied), then our own copy
+    mime = QApplication.clipboard().mimeData()
+    if mime is not None:
+        try:
+            if mime.hasFormat(BAM_NODES_MIME):
+                return json.loads(bytes(mime.data(BAM_NODES_MIME)).decode('utf-8'))
+            if mime.hasText():
+                data = json.loads(mime.text())
+                if isinstance(data, dict) and isinstance(data.get('nodes'), dict):
+                    return data
+        except ValueError:
+            pass
+    return getattr(self, "_clipboard", None) or None
 
-    if not newly_created_nodes_for_props:
-        print("[Main_Paste] No nodes were actually created from clipboard.")
+def pasteSelectedNodesHandler(self):
+    data = _read_clipboard(self)
+    if not data or not data.get('nodes'):
+        print("[Main_Paste] Clipboard is empty. Nothing to paste.")
         return
-        
-    def apply_all_properties():
-        for item_idx, item in enumerate(newly_created_nodes_for_props):
-            node_to_set = item['node']
-            copied_props = item['props']
-
-            for name, val in copied_props.items():
-                try:
-                    if name in ['id', 'pos', 'selected', 'type_']:
-                        continue
-
-                    if name == 'color':
-                        if isinstance(val, (list, tuple)) and len(val) in (3, 4) and all(isinstance(x, int) for x in val):
-                            color_list_to_set = list(val)
-                            node_to_set.set_property(name, color_list_to_set, push_undo=False)
-                    elif hasattr(node_to_set, f'set_{name}'):
-                        setter_method = getattr(node_to_set, f'set_{name}')
-                        setter_method(val)
-                    else:
-                        node_to_set.set_property(name, val, push_undo=False)
-                except Exception:
-                    traceback.print_exc() 
-
-    QTimer.singleShot(0, apply_all_properties)
-
-    # Connection Rebuilding 
-    for orig_id_conn, _, _, _ in self._clipboard:
-        try:
-            original_node_in_graph = next(n for n in self._graph.all_nodes() if n.id == orig_id_conn)
-            newly_pasted_node_equivalent = orig_to_new[orig_id_conn]
 
-            for out_port in original_node_in_graph.output_ports():
-                for original_dest_port in out_port.connected_ports():
-                    original_dest_node_id = original_dest_port.node().id
-                    
-                    if original_dest_node_id in orig_to_new: 
-                        new_source_node_for_conn = newly_pasted_node_equivalent
-                        new_dest_node_for_conn = orig_to_new[original_dest_node_id]
-                        
-                        new_src_port = new_source_node_for_conn.get_output(out_port.name())
-                        new_dst_port = new_dest_node_for_conn.get_input(original_dest_port.name())
+    # Offset the copies so they don't sit exactly on top of the originals
+    nodes = {}
+    for node_id, node_data in data['nodes'].items():
+        node_data = dict(node_data)
+        x, y = node_data.get('pos', (0, 0))
+        node_data['pos'] = [x + PASTE_OFFSET, y + PASTE_OFFSET]
+        nodes[node_id] = node_data
+    data = {'nodes': nodes, 'connections': data.get('connections', [])}
 
-                        if new_src_port and new_dst_port:
-                            new_src_port.connect_to(new_dst_port)
-        except Exception: 
-            pass 
+    pasted = insertNodesHandler(self, data, f"Paste {len(nodes)} node(s)")
+    print(f"[Main_Paste] Pasted {len(pasted)} node(s).")
 
-    # Reselection
-    new_nodes_instances = list(orig_to_new.values())
-    if new_nodes_instances:
+def insertNodesHandler(self, data, label):
+    """
+    Add a session fragment ({'nodes', 'connections'}) to the graph and select it.
+    One undo step, one repaint: NodeGraphQt creates every node (with new ids)
+    and connects them through its id → node map.
+    """
+    with bulkEdit(self._graph, label):
         self._graph.clear_selection()
-        for n_instance in new_nodes_instances:
-            n_instance.set_selected(True)
\ No newline at end of file
+        inserted = list(self._graph._deserialize(data))
+        for node in inserted:
+            node.set_selected(True)
+            self._hotkey_index.add_node(node)
+    return inserted
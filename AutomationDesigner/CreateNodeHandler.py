@@ -7,4 +7,5 @@ def createNodeHandler(self, node_label, node_map):
 
         new_node = NodeClass()
         self._graph.add_node(new_node)
-        new_node.set_pos(self._last_scene_pos.x(), self._last_scene_pos.y())
\ No newline at end of file
+        new_node.set_pos(self._last_scene_pos.x(), self._last_scene_pos.y())
+        self._hotkey_index.add_node(new_node)
\ No newline at end of file
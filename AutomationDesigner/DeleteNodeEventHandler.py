@@ -4,6 +4,8 @@ from PySide6.QtGui import QKeyEvent
 from PySide6.QtWidgets import QMessageBox
 from PySide6.QtCore import Qt
 
+from handlers.BulkEdit import deleteNodes
+
 def deleteNodeEventHandler(self, event: QKeyEvent):
     # Check for Delete or Backspace key
     if event.key() == Qt.Key.Key_Delete or event.key() == Qt.Key.Key_Backspace:
@@ -13,8 +15,9 @@ def deleteNodeEventHandler(self, event: QKeyEvent):
                                         f"Are you sure you want to delete {len(selected_nodes)} selected node(s)?",
                                         QMessageBox.Yes | QMessageBox.No, QMessageBox.No)
             if confirm == QMessageBox.Yes:
-                for node in selected_nodes:
-                    self._graph.remove_node(node)
+                # One pass, one undo entry, one repaint (graph signals are held back)
+                for node_id in deleteNodes(self._graph, selected_nodes):
+                    self._hotkey_index.remove_node_id(node_id)
                 print(f"Deleted {len(selected_nodes)} node(s).")
                 self.saveGraphs()
             event.accept()
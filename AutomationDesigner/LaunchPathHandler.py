@@ -0,0 +1,29 @@
+# AutomationDesigner/LaunchPathHandler.py
+
+import threading
+
+import shared.globals as g
+from engine.AsyncRunner import PathTask
+from engine.RunToken import RunToken
+
+def launchPathHandler(self, start_node, trigger_ns=None):
+    # Compile the Start node's path and run it on the configured engine:
+    # a thread of its own, or a coroutine on the app's asyncio loop (g.executor)
+    start_id = start_node.id
+    token = RunToken()
+    self._loop_tokens[start_id] = token
+
+    plan = self._compile_start_path(start_node)
+
+    if g.executor == 'asyncio':
+        worker = PathTask(self._run_loop_async(plan, token, trigger_ns), name=f"Path-{start_id}")
+    else:
+        worker = threading.Thread(
+            target=self._run_loop,
+            args=(plan, token, trigger_ns),
+            daemon=True
+        )
+        worker.start()
+    self._loop_threads[start_id] = worker
+    self._highlight_timer.start()
+    return worker
@@ -0,0 +1,18 @@
+# AutomationDesigner/OnHotkeyEventsHandler.py
+
+from handlers.KeyboardListener import drainHotkeyEvents
+
+def onHotkeyEventsHandler(self):
+    # Runs on the GUI thread when the keyboard listener signals new presses.
+    # Events are handled in the order they were pressed, none are dropped.
+    for trigger_ns, key_str in drainHotkeyEvents():
+        if key_str == 'F1':
+            print("[Main] Hard start detected! Starting automation.")
+            self._hard_start(trigger_ns)
+        elif key_str == 'F2':
+            print("[Main] Hard stop detected! Stopping automation.")
+            self._on_stop()
+        elif key_str == 'F3':
+            self._overlay_action.toggle()
+        else:
+            self._dispatch_hotkey(key_str, trigger_ns)
@@ -1,33 +1,42 @@
 # AutomationDesigner/OnLoadHandler.py
 
 from PySide6.QtWidgets import QFileDialog, QMessageBox
-import json
 import os
 
+from shared.GraphJournal import loadGraphWithJournal
+from handlers.BulkEdit import bulkEdit
+
 def onLoadHandler(self, file_path=None):
     if file_path is None:
         file_path, _ = QFileDialog.getOpenFileName(self, "Open Graph",
                                                 self.DEFAULT_GRAPH_FILE,
-                                                "Graph Files (*.json);;All Files (*)")
+                                                "Graph Files (*.json *.bamz);;All Files (*)")
     if file_path and os.path.exists(file_path):
         self._on_stop() # Stop any running loops before loading a new graph
         try:
             # IMPORTANT: Before deserializing, clear existing nodes
             self._clear_all_nodes_fallback()
 
-            # Read the JSON file content into a dictionary
-            with open(file_path, 'r') as f:
-                graph_data = json.load(f)
+            # Read the graph file (JSON or compact .bamz) into a dictionary and
+            # replay the edits journaled since it was last written in full
+            graph_data, base, replayed = loadGraphWithJournal(file_path)
+            if replayed:
+                print(f"[Main] Recovered {replayed} journaled edit(s) for: {file_path}")
 
-            # Deserialize the graph from the file
-            self._graph.deserialize_session(graph_data)
+            # Deserialize the graph from the file (one repaint, indexes rebuilt below)
+            with bulkEdit(self._graph):
+                self._graph.deserialize_session(graph_data)
+            self._hotkey_index.rebuild(self._graph.all_nodes())
+            self._backdrop_index.invalidate()
             print(f"[Main] Graph loaded from: {file_path}")
             self.DEFAULT_GRAPH_FILE = file_path
+            self._journal.reset(file_path, self._graph.serialize_session(), base, replayed)
         except Exception as e:
             QMessageBox.critical(self, "Load Error", f"Failed to load graph: {e}\n"
                                 "Please ensure node classes are registered.")
             print(f"[Main] Failed to load graph: {e}")
     elif file_path: # If file_path was provided but didn't exist (e.g., first launch)
         print(f"[Main] No graph file found at '{file_path}'. Starting with empty canvas.")
+        self._journal.reset(file_path, self._graph.serialize_session())
     else: # User cancelled file dialog
         print("[Main] Load operation cancelled.")
\ No newline at end of file
@@ -2,10 +2,13 @@
 
 from PySide6.QtCore import QTimer
 
+from shared.Log import getLogger
+
+log = getLogger('AutomationDesigner.OnLoopIterationFinished')
+
 def onLoopIterationFinishedHandler(self, start_id: str):
-        print(f"[Main] Loop iteration finished for Start Node {start_id}.")
-        if start_id in self._loop_stop_flags and self._loop_stop_flags[start_id].is_set():
+        log.debug("[Main] Loop iteration finished for Start Node %s.", start_id)
+        if start_id in self._loop_tokens and self._loop_tokens[start_id].stopped:
                 QTimer.singleShot(0, lambda: self._clear_highlights_for_path(start_id))
                 if start_id in self._loop_threads: del self._loop_threads[start_id]
-                if start_id in self._loop_stop_flags: del self._loop_stop_flags[start_id]
-                if start_id in self._loop_pause_flags: del self._loop_pause_flags[start_id]
\ No newline at end of file
+                if start_id in self._loop_tokens: del self._loop_tokens[start_id]
\ No newline at end of file
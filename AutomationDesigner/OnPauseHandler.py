@@ -1,6 +1,6 @@
 # AutomationDesigner/OnPauseHandler.py
 
 def onPauseHandler(self):
-    for start_id, pause_event in self._loop_pause_flags.items():
-        pause_event.set()
+    for start_id, token in self._loop_tokens.items():
+        token.pause()
     print("[Main] All loops paused. (will resume when Play is clicked again)")
\ No newline at end of file
@@ -1,16 +1,19 @@
 # AutomationDesigner/OnPlayHandler.py
 
 from PySide6.QtWidgets import QMessageBox
-import threading
 
-def onPlayHandler(self, NODE_DEFAULT_COLOR, StartNode):
-    r, g, b = NODE_DEFAULT_COLOR
+import shared.globals as g
+from handlers.HighlightPipeline import paintNode
+
+def onPlayHandler(self, NODE_DEFAULT_COLOR, StartNode, trigger_ns=None):
     for node in self._graph.all_nodes():
-        node.set_color(r, g, b)
+        paintNode(node, NODE_DEFAULT_COLOR)
     self._last_highlighted_node = None
 
     self._highlighted_nodes.clear()
     self._highlighted_backdrops.clear()
+    self._active_paths_highlights = {} # everything was just repainted default
+    self._backdrop_index.reset_highlights()
 
     # Find all StartNode instances using all_nodes()
     all_nodes = self._graph.all_nodes()
@@ -24,21 +27,11 @@ def onPlayHandler(self, NODE_DEFAULT_COLOR, StartNode):
         start_id = start_node.id
         
         if start_id not in self._loop_threads or not self._loop_threads[start_id].is_alive():
-            stop_event = threading.Event()
-            pause_event = threading.Event()
-            self._loop_stop_flags[start_id] = stop_event
-            self._loop_pause_flags[start_id] = pause_event
-
-            thread = threading.Thread(
-                target=self._run_loop,
-                args=(start_node, stop_event, pause_event),
-                daemon=True
-            )
-            self._loop_threads[start_id] = thread
-            thread.start()
-            print(f"[Main] Launched loop thread for Start Node {start_id}")
-        elif start_id in self._loop_pause_flags:
-            self._loop_pause_flags[start_id].clear()
+            self._launch_path(start_node, trigger_ns)
+            print(f"[Main] Launched loop ({g.executor}) for Start Node {start_id}")
+        elif start_id in self._loop_tokens:
+            self._loop_tokens[start_id].resume()
+            self._highlight_timer.start()
             print(f"[Main] Unpaused loop thread for Start Node {start_id}")
         else:
             print(f"[Main] Start Node {start_id} is already running and not in a pausable state (or not previously paused).")
\ No newline at end of file
@@ -0,0 +1,27 @@
+# AutomationDesigner/OnRecordHandler.py
+
+import shared.globals as g
+from engine.MacroRecorder import recorder, buildMacroSession
+from handlers.MouseListener import acquireMouseHook, releaseMouseHook
+from AutomationDesigner.CopyPasteEventHandler import insertNodesHandler
+
+def onRecordHandler(self, checked):
+    if checked:
+        recorder.start()
+        acquireMouseHook()
+        self._record_action.setText("Stop Recording")
+        print("[Main_Record] Recording keyboard and mouse input...")
+        return
+
+    # The click on "Stop Recording" itself is dropped from the macro
+    buffer = recorder.stop()
+    releaseMouseHook()
+    self._record_action.setText("Record")
+    if not len(buffer):
+        print("[Main_Record] Nothing was recorded.")
+        return
+
+    origin = (self._last_scene_pos.x(), self._last_scene_pos.y())
+    data = buildMacroSession(buffer, g.record_move_tolerance_px, g.record_min_delay_ms, origin)
+    inserted = insertNodesHandler(self, data, f"Record {len(data['nodes'])} node(s)")
+    print(f"[Main_Record] {len(buffer)} event(s) recorded → {len(inserted)} node(s).")
@@ -1,22 +1,26 @@
 # AutomationDesigner/OnSaveHandler.py
 
 from PySide6.QtWidgets import QFileDialog, QMessageBox
-import json
+
+from shared.GraphFormat import saveGraphFile
+from shared.GraphJournal import snapshotBase
 
 def onSaveHandler(self):
     file_path, _ = QFileDialog.getSaveFileName(self, "Save Graph",
                                                  self.DEFAULT_GRAPH_FILE,
-                                                 "Graph Files (*.json);;All Files (*)")
+                                                 "Graph Files (*.json);;Compact Graph Files (*.bamz);;All Files (*)")
     if file_path:
         try:
             graph_data = self._graph.serialize_session()
 
-            # 2. Manually write the dictionary to the specified JSON file
-            with open(file_path, 'w') as f:
-                json.dump(graph_data, f, indent=4) # Using indent for readability in the JSON file
+            # 2. Write it (JSON or compact .bamz, by extension) through a temp file + rename
+            #    so a crash never leaves a half-written graph
+            data = saveGraphFile(file_path, graph_data)
 
             print(f"[Main] Graph saved to: {file_path}")
             self.DEFAULT_GRAPH_FILE = file_path
+            # 3. Auto-saves now journal against this file
+            self._journal.saved_as(file_path, graph_data, snapshotBase(data))
         except Exception as e:
             QMessageBox.critical(self, "Save Error", f"Failed to save graph: {e}")
             print(f"[Main] Failed to save graph: {e}")
\ No newline at end of file
@@ -3,23 +3,19 @@
 
 def onStopHandler(self, NODE_DEFAULT_COLOR, BackdropNode):
     active_loops_were_present = False
-    if hasattr(self, '_loop_stop_flags') and self._loop_stop_flags:
+    if hasattr(self, '_loop_tokens') and self._loop_tokens:
         active_loops_were_present = True
 
-        all_start_ids_to_stop = list(self._loop_stop_flags.keys())
+        all_start_ids_to_stop = list(self._loop_tokens.keys())
         
         for start_id in all_start_ids_to_stop:
-            if start_id in self._loop_stop_flags:
-                self._loop_stop_flags[start_id].set()
-            
-            if hasattr(self, '_loop_pause_flags') and start_id in self._loop_pause_flags:
-                self._loop_pause_flags[start_id].clear()
+            if start_id in self._loop_tokens:
+                # Wakes the worker out of any wait or pause; it releases held keys/buttons itself
+                self._loop_tokens[start_id].stop()
 
-            if hasattr(self, '_clear_highlights_for_path'):
-                self._clear_highlights_for_path(start_id) 
-        
-        if hasattr(self, '_active_paths_highlights'):
-            self._active_paths_highlights.clear()
+            self._highlights.clear(start_id)
+
+        self._apply_highlights()
 
     if active_loops_were_present:
         print("[Main] All loops signaled to stop and their highlights cleared.")
@@ -0,0 +1,31 @@
+# AutomationDesigner/OnTraceHandler.py
+
+from PySide6.QtWidgets import QFileDialog, QMessageBox
+
+import shared.globals as g
+from engine import Tracer
+
+def onTraceHandler(self, checked):
+    if checked:
+        Tracer.startTracing(g.trace_capacity)
+        print("[Main_Trace] Tracing node execution, delay overshoot and input calls...")
+        return
+
+    tracer = Tracer.stopTracing()
+    if tracer is None or not len(tracer):
+        print("[Main_Trace] Nothing was traced.")
+        return
+
+    file_path, _ = QFileDialog.getSaveFileName(
+        self, "Save Trace", "bam_trace.json", "Chrome Trace (*.json);;All Files (*)"
+    )
+    if not file_path:
+        print("[Main_Trace] Trace discarded.")
+        return
+    try:
+        tracer.export(file_path)
+    except OSError as e:
+        QMessageBox.warning(self, "Trace", f"Could not write the trace:\n{e}")
+        return
+    print(f"[Main_Trace] {len(tracer)} records ({tracer.dropped} dropped) saved to {file_path} "
+          f"- open it in chrome://tracing or ui.perfetto.dev")
@@ -1,63 +1,57 @@
 # AutomationDesigner/RunLoopHandler.py
 
-import time
-from PySide6.QtCore import QTimer
+from engine.PlanRunner import runPlan
+from engine.AsyncRunner import runPlanAsync, AsyncPathTimer
+from engine.Timing import PathTimer, perf_counter_ns
+from shared.Log import getLogger
 
+log = getLogger('AutomationDesigner.RunLoop')
 
-def runLoopHandler(self, start_node, stop_event, pause_event, EndNode, DelayNode):
-    # 'self' is the AutomationDesigner instance
-    start_id = start_node.id
-    # print(f"[LoopWorker-{start_id}] Thread started.") # Optional
-
-    try:
-        while not stop_event.is_set():
-            while pause_event.is_set() and not stop_event.is_set():
-                time.sleep(0.1)
-            if stop_event.is_set(): break
-
-            self._clear_highlights_for_path(start_id)
-            self._highlight_node_in_path(start_id, start_node.id)
-            
-            start_node.process()
-            current_node = start_node
 
-            while True: 
-                if isinstance(current_node, EndNode): break
-                if stop_event.is_set(): break
+def _pathCallbacks(self, plan, trigger_ns):
+    # 'trigger_ns' is the perf_counter_ns of the hotkey press that started the path, if any
+    start_id = plan.start_id
 
-                outputs = current_node.outputs()
-                if not outputs: break
+    def on_step(node_id):
+        nonlocal trigger_ns
+        if trigger_ns is not None:
+            latency_ms = (perf_counter_ns() - trigger_ns) / 1e6
+            self._hotkey_latencies_ms.append(latency_ms)
+            log.debug("[Hotkey] Start Node %s: hotkey to first action %.2f ms", start_id, latency_ms)
+            trigger_ns = None
+        # Only publish; the GUI thread repaints once per highlight frame
+        self._highlights.publish(start_id, node_id)
 
-                out_port = outputs[list(outputs.keys())[0]]
-                connected_ports = out_port.connected_ports()
-                if not connected_ports: break
+    def on_iteration():
+        self._loop_controller.loop_iteration_finished.emit(start_id)
 
-                next_node = connected_ports[0].node()
-                if next_node is None: break
-                if stop_event.is_set(): break
+    return on_step, on_iteration
 
-                self._clear_highlights_for_path(start_id)
-                self._highlight_node_in_path(start_id, next_node.id)
 
-                if isinstance(next_node, DelayNode):
-                    next_node.process(stop_event=stop_event)
-                else:
-                    next_node.process()
+def _pathFinished(self, plan, token, timer, tag):
+    start_id = plan.start_id
+    timer.stats.report(f"{tag} {start_id}")
+    if token.stopped:
+        log.debug("[RunLoop %s] Loop ending, clearing its highlight.", start_id)
+        self._highlights.clear(start_id)
 
-                if stop_event.is_set(): return 
-                current_node = next_node
-            # End of inner traversal loop
 
-            if stop_event.is_set(): break 
+def runLoopHandler(self, plan, token, trigger_ns=None):
+    # 'self' is the AutomationDesigner instance
+    # 'plan' is the ExecutionPlan compiled on the GUI thread when Play/hotkey fired
+    on_step, on_iteration = _pathCallbacks(self, plan, trigger_ns)
+    timer = PathTimer()
+    try:
+        runPlan(plan, token, on_step=on_step, on_iteration=on_iteration, timer=timer)
+    finally:
+        _pathFinished(self, plan, token, timer, "Timing")
 
-            if isinstance(current_node, EndNode):
-                if current_node.get_property('repeat') == 'Single':
-                    # REMOVE: self._loop_controller.node_started.emit(f"clear:{end_id}")
-                    stop_event.set()
 
-            self._loop_controller.loop_iteration_finished.emit(start_id)
-            if stop_event.is_set(): break
+async def runLoopAsyncHandler(self, plan, token, trigger_ns=None):
+    # Same as runLoopHandler, as a coroutine on the GUI's asyncio loop
+    on_step, on_iteration = _pathCallbacks(self, plan, trigger_ns)
+    timer = AsyncPathTimer(token)
+    try:
+        await runPlanAsync(plan, token, on_step=on_step, on_iteration=on_iteration, timer=timer)
     finally:
-        if stop_event.is_set():
-            print(f"[RUN_LOOP_DEBUG {start_id}] Loop ending, scheduling _clear_highlights_for_path via End block.")
-            self._clear_highlights_for_path(start_id)
\ No newline at end of file
+        _pathFinished(self, plan, token, timer, "Lag")
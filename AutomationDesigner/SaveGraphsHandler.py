@@ -1,14 +1,22 @@
 # AutomationDesigner/SaveGraphsHandler.py
 
-import json
+def scheduleSaveGraphsHandler(self):
+    # (Re)start the debounce window: a burst of edits results in a single save
+    self._autosave_timer.start()
 
 def saveGraphsHandler(self):
+    # Only the nodes edited since the last save are serialized (GUI thread) and
+    # appended to the graph's journal (autosave thread); the journal is folded
+    # into a full snapshot every g.journal_compact_records records.
     try:
-        graph_data = self._graph.serialize_session()
-
-        with open(self.DEFAULT_GRAPH_FILE, 'w') as f:
-            json.dump(graph_data, f, indent=4)
+        self._journal.flush()
+    except Exception as e:
+        print(f"[Main] Failed to journal edits, saving a full snapshot instead: {e}")
+        self._journal.compact()
 
-        print(f"[Main] Auto-saved graph to: {self.DEFAULT_GRAPH_FILE}")
+def compactGraphsHandler(self):
+    # Full snapshot of the graph, replacing the journal (used on exit)
+    try:
+        self._journal.compact()
     except Exception as e:
-        print(f"[Main] Failed to auto-save graph on exit: {e}")
\ No newline at end of file
+        print(f"[Main] Failed to snapshot graph for auto-save: {e}")
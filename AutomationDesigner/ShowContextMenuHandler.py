@@ -11,7 +11,7 @@ def showContextMenuHandler(self, view_pos):
         add_menu = menu.addMenu('Add Node')
 
         # Add each node type
-        for node_label in ['Start', 'End', 'Delay', 'Keyboard', 'Mouse']:
+        for node_label in ['Start', 'End', 'Delay', 'Keyboard', 'Mouse', 'Capture Screen', 'Find Image']:
             action = add_menu.addAction(node_label)
             action.triggered.connect(lambda checked=False, nl=node_label: self._create_node(nl))
 
@@ -0,0 +1,96 @@
+# batch.py
+#
+# Run many saved graphs at once, one worker process each (up to --workers):
+#     python batch.py graphs/*.json --iterations 100
+#     python batch.py graphs/*.bamz --duration 60 --workers 8 --json summary.json
+
+import shared.globals as g
+g.ensure_initialized()
+
+import argparse
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+
+from engine.BatchRunner import initWorker, runGraphFile
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="BAM " + g.version + " - batch graph runner")
+    parser.add_argument('graphs', nargs='+', help="graph files written by BAM (.json or .bamz)")
+    parser.add_argument('--iterations', type=int, default=1,
+                        help="stop each Start path after this many passes (0 = no limit, default: %(default)s)")
+    parser.add_argument('--duration', type=float, default=0.0,
+                        help="stop each graph after this many seconds (0 = no limit, default: %(default)s)")
+    parser.add_argument('--workers', type=int, default=os.cpu_count(),
+                        help="worker processes (default: %(default)s)")
+    parser.add_argument('--input', choices=('null', 'pynput'), default='null',
+                        help="input backend of each worker: count calls only, or send real input (default: %(default)s)")
+    parser.add_argument('--spin-ms', type=float, default=g.timing_spin_window_ms,
+                        help="busy-wait window before each delay deadline, in ms (default: %(default)s)")
+    parser.add_argument('--json', metavar='PATH', help="also write the summary as JSON")
+    parser.add_argument('--log', default=g.log_levels, metavar='LEVELS',
+                        help="log levels of the workers, e.g. 'debug' or 'info,engine=debug' (default: %(default)s)")
+    parser.add_argument('--verbose', action='store_true', help="show every worker's log messages")
+    return parser.parse_args(argv)
+
+
+def failed(file_path, error):
+    return {'graph': file_path, 'ok': False, 'error': error, 'pid': None,
+            'paths': {}, 'duration_s': 0.0, 'input_calls': 0}
+
+
+def print_summary(results):
+    for r in results:
+        if not r['ok']:
+            print(f"[Batch] FAIL {r['graph']}: {r['error']}")
+            continue
+        iterations = sum(p['iterations'] for p in r['paths'].values())
+        worst_lag = max((p['lag']['max_ms'] for p in r['paths'].values()), default=0.0)
+        print(f"[Batch] OK   {r['graph']}: {len(r['paths'])} path(s), {iterations} iteration(s), "
+              f"{r['input_calls']} input call(s), {r['duration_s']:.2f} s, worst delay overshoot {worst_lag:.3f} ms")
+    failures = sum(not r['ok'] for r in results)
+    print(f"[Batch] {len(results) - failures}/{len(results)} graph(s) passed.")
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    if not args.iterations and not args.duration:
+        print("[Batch] Need --iterations and/or --duration, repeating paths would never end.")
+        return 2
+
+    results = {}  # submission index -> result, so a graph listed twice runs and reports twice
+    with ProcessPoolExecutor(max_workers=max(1, args.workers),
+                             initializer=initWorker, initargs=(args.input, args.spin_ms, args.log)) as pool:
+        futures = {
+            pool.submit(runGraphFile, path, args.iterations, args.duration, args.verbose): (i, path)
+            for i, path in enumerate(args.graphs)
+        }
+        try:
+            for future in as_completed(futures):
+                i, path = futures[future]
+                try:
+                    results[i] = future.result()
+                except BrokenProcessPool as e:
+                    results[i] = failed(path, f"worker process died: {e}")
+                except Exception as e:
+                    results[i] = failed(path, f"{type(e).__name__}: {e}")
+                print(f"[Batch] Finished {path} ({len(results)}/{len(futures)})")
+        except KeyboardInterrupt:
+            print("[Batch] Interrupted, cancelling graphs that have not started.")
+            for future in futures:
+                future.cancel()
+
+    ordered = [results.get(i) or failed(path, "not run") for i, path in enumerate(args.graphs)]
+    print_summary(ordered)
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(ordered, f, indent=4)
+        print(f"[Batch] Summary written to: {args.json}")
+    return 0 if all(r['ok'] for r in ordered) else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
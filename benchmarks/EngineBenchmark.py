@@ -0,0 +1,352 @@
+# benchmarks/EngineBenchmark.py
+#
+# Path executor benchmark: compiled graphs run through runPlan / runPlanAsync
+# exactly as runLoopHandler runs them, against an in-memory input backend.
+#     python -m benchmarks.EngineBenchmark [--quick] [--only delay,scaling] [--json results.json]
+#
+# Measures per-node dispatch overhead, delay-free iterations per second, delay
+# accuracy/jitter percentiles, launch-to-first-action latency and how the
+# threads and asyncio executors scale with N concurrent Start paths.
+
+import argparse
+import asyncio
+import json
+import platform
+import sys
+import threading
+import time
+
+import shared.globals as g
+g.ensure_initialized()
+
+from engine.SessionGraph import SessionGraph
+from engine.PlanRunner import runPlan
+from engine.AsyncRunner import AsyncPathTimer, runPlanAsync
+from engine.Timing import PathTimer, perf_counter_ns
+from engine.RunToken import RunToken
+from engine.InputBackend import RecordingBackend
+from engine import InputActions
+from engine import Tracer
+from shared import Log
+from benchmarks.SyntheticGraphs import makeNode
+
+SECTIONS = ['dispatch', 'iterations', 'delay', 'launch', 'scaling']
+EXECUTORS = ['threads', 'asyncio']
+
+# Node chains between Start and End, as (node type, custom)
+_MOVE = ('Automation.MouseNode', {'button': 'Move', 'x': '100', 'y': '100'})
+_PRESS = ('Automation.KeyboardNode', {'key': 'A', 'type': 'Press', 'duration': '0'})
+_RELEASE = ('Automation.KeyboardNode', {'key': 'A', 'type': 'Release', 'duration': '0'})
+
+DISPATCH_CHAINS = {
+    'Mouse Move': [_MOVE],
+    'Key Press/Release': [_PRESS, _RELEASE],
+    'Delay 0': [('Automation.DelayNode', {'delay': '0'})],
+}
+# A typical delay-free macro step: press, release, move
+LOOP_CHAIN = [_PRESS, _RELEASE, _MOVE]
+
+
+def _session(chains, repeat='Repeat'):
+    """
+    Session with one Start → chain → End path per entry of chains.
+    """
+    nodes = {}
+    connections = []
+    for row, chain in enumerate(chains):
+        types = [('Automation.StartNode', None)] + list(chain) + [('Automation.EndNode', {'repeat': repeat})]
+        previous = None
+        for column, (node_type, custom) in enumerate(types):
+            node_id = f"0x{row:04x}{column:04x}"
+            nodes[node_id] = makeNode(node_type, (column * 200, row * 150), custom)
+            if previous is not None:
+                connections.append({'out': [previous, 'out'], 'in': [node_id, 'in']})
+            previous = node_id
+    return {'nodes': nodes, 'connections': connections}
+
+
+def _plans(chains, repeat='Repeat'):
+    graph = SessionGraph(_session(chains, repeat))
+    return [graph.compile(start_id) for start_id in graph.start_ids()]
+
+
+def _percentiles(samples_ns):
+    """
+    {'p50_ms', 'p90_ms', 'p99_ms', 'max_ms'} (nearest rank) of nanosecond samples.
+    """
+    if not samples_ns:
+        return {'count': 0, 'p50_ms': 0.0, 'p90_ms': 0.0, 'p99_ms': 0.0, 'max_ms': 0.0}
+    ordered = sorted(samples_ns)
+    last = len(ordered) - 1
+
+    def at(fraction):
+        return ordered[min(last, int(fraction * len(ordered)))] / 1e6
+
+    return {'count': len(ordered), 'p50_ms': at(0.50), 'p90_ms': at(0.90),
+            'p99_ms': at(0.99), 'max_ms': ordered[-1] / 1e6}
+
+
+def _overshoots(tracer):
+    kinds, begin, end = tracer.kind, tracer.begin, tracer.end
+    return [end[i] - begin[i] for i in range(len(tracer)) if kinds[i] == Tracer.KIND_OVERSHOOT]
+
+
+def _run_for(plans, executor, seconds=None, iterations=None):
+    """
+    Run every plan on executor until seconds have passed or each path did iterations passes.
+    Returns (elapsed_s, [passes per path]).
+    """
+    tokens = [RunToken() for _ in plans]
+    passes = [0] * len(plans)
+
+    def on_iteration(i):
+        def counted():
+            passes[i] += 1
+            if iterations is not None and passes[i] >= iterations:
+                tokens[i].stop()
+        return counted
+
+    started = perf_counter_ns()
+    if executor == 'asyncio':
+        async def run_all():
+            loop = asyncio.get_running_loop()
+            if seconds is not None:
+                loop.call_later(seconds, lambda: [token.stop() for token in tokens])
+            await asyncio.gather(*(
+                runPlanAsync(plan, tokens[i], on_iteration=on_iteration(i), timer=AsyncPathTimer(tokens[i], loop))
+                for i, plan in enumerate(plans)
+            ))
+        asyncio.run(run_all())
+    else:
+        threads = [
+            threading.Thread(target=runPlan, args=(plan, tokens[i]),
+                             kwargs={'on_iteration': on_iteration(i), 'timer': PathTimer()}, daemon=True)
+            for i, plan in enumerate(plans)
+        ]
+        for thread in threads:
+            thread.start()
+        if seconds is not None:
+            time.sleep(seconds)
+            for token in tokens:
+                token.stop()
+        for thread in threads:
+            thread.join()
+    elapsed_s = (perf_counter_ns() - started) / 1e9
+    InputActions.getInjector().flush()
+    return elapsed_s, passes
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Sections
+# ──────────────────────────────────────────────────────────────────────────────
+def benchDispatch(executor, iterations, chain_length=50):
+    """
+    Nanoseconds per node of a delay-free path, per node kind (chain_length nodes of that kind per pass).
+    """
+    results = {}
+    for name, unit in DISPATCH_CHAINS.items():
+        plan, = _plans([unit * (chain_length // len(unit))])
+        elapsed_s, passes = _run_for([plan], executor, iterations=iterations)
+        nodes = passes[0] * len(plan.instructions)
+        results[name] = {'nodes': nodes, 'ns_per_node': elapsed_s * 1e9 / nodes}
+    return results
+
+
+def benchIterations(executor, seconds):
+    plan, = _plans([LOOP_CHAIN])
+    elapsed_s, passes = _run_for([plan], executor, seconds=seconds)
+    return {'nodes_per_pass': len(plan.instructions), 'iterations': passes[0],
+            'iterations_per_s': passes[0] / elapsed_s}
+
+
+def benchDelay(executor, delays_ms, seconds):
+    """
+    Overshoot of every Delay wait (actual wake-up - deadline) and jitter of the loop period.
+    """
+    results = {}
+    for delay_ms in delays_ms:
+        plan, = _plans([[('Automation.DelayNode', {'delay': str(delay_ms)})]])
+        token = RunToken()
+        stamps = []
+
+        def on_iteration():
+            stamps.append(perf_counter_ns())
+            if (stamps[-1] - stamps[0]) / 1e9 >= seconds:
+                token.stop()
+
+        Tracer.startTracing(g.trace_capacity)
+        if executor == 'asyncio':
+            async def run_one():
+                await runPlanAsync(plan, token, on_iteration=on_iteration)
+            asyncio.run(run_one())
+        else:
+            runPlan(plan, token, on_iteration=on_iteration)
+        tracer = Tracer.stopTracing()
+
+        period_ns = delay_ms * 1_000_000
+        jitter = [abs(b - a - period_ns) for a, b in zip(stamps, stamps[1:])]
+        results[f"{delay_ms}ms"] = {
+            'overshoot': _percentiles(_overshoots(tracer)),
+            'period_jitter': _percentiles(jitter),
+            'drift_ms': ((stamps[-1] - stamps[0]) - (len(stamps) - 1) * period_ns) / 1e6 if len(stamps) > 1 else 0.0,
+        }
+    return results
+
+
+def benchLaunch(executor, trials):
+    """
+    Path launch → first node step (what the GUI logs) and → first input event
+    at the backend, for a path started the way launchPathHandler starts it.
+    The hotkey side before the launch (keyboard listener queue, GUI wakeup,
+    HotkeyIndex lookup, compiling the path) is not part of this number.
+    """
+    plan, = _plans([[_PRESS, _RELEASE]], repeat='Single')
+    injector = InputActions.getInjector()
+    backend = injector.backend
+    to_step, to_input = [], []
+
+    def on_step_recorder(first_step):
+        def on_step(node_id):
+            if not first_step:
+                first_step.append(perf_counter_ns())
+        return on_step
+
+    def record(trigger_ns, first_step):
+        injector.flush()
+        to_step.append(first_step[0] - trigger_ns)
+        to_input.append(backend.events[0][0] - trigger_ns)
+
+    async def run_trials_async():
+        for _ in range(trials):
+            backend.clear()
+            first_step = []
+            trigger_ns = perf_counter_ns()
+            await asyncio.ensure_future(runPlanAsync(plan, RunToken(), on_step=on_step_recorder(first_step)))
+            record(trigger_ns, first_step)
+
+    backend.keep_events = True
+    try:
+        if executor == 'asyncio':
+            asyncio.run(run_trials_async())
+        else:
+            for _ in range(trials):
+                backend.clear()
+                first_step = []
+                trigger_ns = perf_counter_ns()
+                thread = threading.Thread(target=runPlan, args=(plan, RunToken()),
+                                          kwargs={'on_step': on_step_recorder(first_step)}, daemon=True)
+                thread.start()
+                thread.join()
+                record(trigger_ns, first_step)
+    finally:
+        backend.keep_events = False
+        backend.clear()
+    return {'to_first_step': _percentiles(to_step), 'to_first_input': _percentiles(to_input)}
+
+
+def benchScaling(executor, path_counts, seconds, delay_ms=10):
+    """
+    N concurrent paths of Key Press → Delay → Key Release → Delay: achieved vs
+    ideal iterations per second, and the delay overshoot percentiles under load.
+    """
+    half = str(delay_ms // 2)
+    chain = [_PRESS, ('Automation.DelayNode', {'delay': half}), _RELEASE, ('Automation.DelayNode', {'delay': half})]
+    results = {}
+    for paths in path_counts:
+        plans = _plans([chain] * paths)
+        Tracer.startTracing(g.trace_capacity)
+        elapsed_s, passes = _run_for(plans, executor, seconds=seconds)
+        tracer = Tracer.stopTracing()
+        ideal = paths * 1000 / (2 * int(half))
+        achieved = sum(passes) / elapsed_s
+        results[str(paths)] = {
+            'iterations_per_s': achieved,
+            'efficiency': achieved / ideal,
+            'overshoot': _percentiles(_overshoots(tracer)),
+            'trace_dropped': tracer.dropped,
+        }
+    return results
+
+
+def run(sections=SECTIONS, executors=EXECUTORS, quick=False, path_counts=(1, 10, 50, 200)):
+    seconds = 0.5 if quick else 2.0
+    results = {}
+    for executor in executors:
+        r = results[executor] = {}
+        if 'dispatch' in sections:
+            r['dispatch'] = benchDispatch(executor, iterations=50 if quick else 400)
+        if 'iterations' in sections:
+            r['iterations'] = benchIterations(executor, seconds)
+        if 'delay' in sections:
+            r['delay'] = benchDelay(executor, (1, 5, 16), seconds)
+        if 'launch' in sections:
+            r['launch'] = benchLaunch(executor, trials=20 if quick else 100)
+        if 'scaling' in sections:
+            r['scaling'] = benchScaling(executor, path_counts, seconds)
+    return results
+
+
+def _print(results):
+    for executor, r in results.items():
+        tag = f"[Engine {executor}]"
+        for name, d in r.get('dispatch', {}).items():
+            print(f"{tag} dispatch {name}: {d['ns_per_node']:.0f} ns/node")
+        if 'iterations' in r:
+            i = r['iterations']
+            print(f"{tag} delay-free loop ({i['nodes_per_pass']} nodes): {i['iterations_per_s']:.0f} iterations/s")
+        for name, d in r.get('delay', {}).items():
+            o, j = d['overshoot'], d['period_jitter']
+            print(f"{tag} delay {name}: overshoot p50 {o['p50_ms']:.3f} / p99 {o['p99_ms']:.3f} / max {o['max_ms']:.3f} ms, "
+                  f"period jitter p99 {j['p99_ms']:.3f} ms, drift {d['drift_ms']:.3f} ms")
+        if 'launch' in r:
+            s, f = r['launch']['to_first_step'], r['launch']['to_first_input']
+            print(f"{tag} launch latency: first step p50 {s['p50_ms']:.3f} / p99 {s['p99_ms']:.3f} ms, "
+                  f"first input p50 {f['p50_ms']:.3f} / p99 {f['p99_ms']:.3f} ms")
+        for paths, d in r.get('scaling', {}).items():
+            o = d['overshoot']
+            print(f"{tag} {paths} paths: {d['iterations_per_s']:.0f} iterations/s ({d['efficiency']:.0%} of ideal), "
+                  f"overshoot p50 {o['p50_ms']:.3f} / p99 {o['p99_ms']:.3f} ms")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Path executor benchmark")
+    parser.add_argument('--only', metavar='SECTIONS', help=f"comma-separated subset of {','.join(SECTIONS)}")
+    parser.add_argument('--executor', choices=EXECUTORS, action='append', help="default: both")
+    parser.add_argument('--paths', type=int, action='append', help="concurrent paths for scaling, default 1, 10, 50, 200")
+    parser.add_argument('--spin-ms', type=float, default=g.timing_spin_window_ms,
+                        help="busy-wait window before each delay deadline, in ms (default: %(default)s)")
+    parser.add_argument('--quick', action='store_true', help="shorter runs (smoke test)")
+    parser.add_argument('--json', metavar='PATH', help="also write results as JSON")
+    args = parser.parse_args(argv)
+
+    sections = SECTIONS
+    if args.only:
+        sections = [s.strip() for s in args.only.split(',') if s.strip()]
+        unknown = set(sections) - set(SECTIONS)
+        if unknown:
+            parser.error(f"unknown section(s): {', '.join(sorted(unknown))}")
+
+    # Node steps must not be formatted/printed while measuring
+    Log.setLevel('', Log.WARNING)
+    g.timing_spin_window_ms = args.spin_ms
+    injector = InputActions.setBackend(RecordingBackend(keep_events=False))
+
+    results = run(sections, args.executor or EXECUTORS, args.quick, args.paths or (1, 10, 50, 200))
+    injector.close(timeout=5)
+    _print(results)
+
+    if args.json:
+        report = {
+            'bam_version': g.version,
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'spin_window_ms': g.timing_spin_window_ms,
+            'results': results,
+        }
+        with open(args.json, 'w') as f:
+            json.dump(report, f, indent=4)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
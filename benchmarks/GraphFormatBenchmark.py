@@ -0,0 +1,69 @@
+# benchmarks/GraphFormatBenchmark.py
+#
+# Size and load time of the pretty JSON graph format vs the compact .bamz format.
+#     python -m benchmarks.GraphFormatBenchmark [--nodes 5000] [--json results.json]
+#
+# The compact file is ~70x smaller, but loads only ~2x faster than JSON: the
+# decoder still has to build every node dict, list and connection that
+# json.loads builds, and that (not parsing) is most of the load time.
+
+import argparse
+import json
+import sys
+import time
+
+from shared.GraphFormat import encodeGraphFile, decodeGraphFile
+from benchmarks.SyntheticGraphs import makeSession
+
+
+def _best_of(fn, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - started)
+    return best * 1000
+
+
+def run(n_nodes, repeat=5):
+    session = makeSession(n_nodes)
+
+    json_bytes = encodeGraphFile('graph.json', session)
+    compact_bytes = encodeGraphFile('graph.bamz', session)
+
+    # Compared as JSON text, so True vs 1 or 160 vs 160.0 counts as a difference
+    decoded = json.dumps(decodeGraphFile(compact_bytes), sort_keys=True)
+    if decoded != json.dumps(json.loads(json_bytes), sort_keys=True):
+        raise AssertionError("compact format did not round-trip to the same session")
+
+    return {
+        'nodes': n_nodes,
+        'json_bytes': len(json_bytes),
+        'compact_bytes': len(compact_bytes),
+        'size_ratio': len(json_bytes) / len(compact_bytes),
+        'json_save_ms': _best_of(lambda: encodeGraphFile('graph.json', session), repeat),
+        'compact_save_ms': _best_of(lambda: encodeGraphFile('graph.bamz', session), repeat),
+        'json_load_ms': _best_of(lambda: decodeGraphFile(json_bytes), repeat),
+        'compact_load_ms': _best_of(lambda: decodeGraphFile(compact_bytes), repeat),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Graph file format benchmark")
+    parser.add_argument('--nodes', type=int, action='append', help="graph size(s), default 1000 and 5000")
+    parser.add_argument('--json', metavar='PATH', help="also write results as JSON")
+    args = parser.parse_args(argv)
+
+    results = [run(n) for n in (args.nodes or [1000, 5000])]
+    for r in results:
+        print(f"[GraphFormat] {r['nodes']} nodes: JSON {r['json_bytes']} B / {r['json_load_ms']:.1f} ms load, "
+              f"compact {r['compact_bytes']} B / {r['compact_load_ms']:.1f} ms load "
+              f"({r['size_ratio']:.1f}x smaller, {r['json_load_ms'] / r['compact_load_ms']:.1f}x faster load)")
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(results, f, indent=4)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,103 @@
+# benchmarks/SyntheticGraphs.py
+#
+# Session dictionaries shaped like NodeGraphQt serialize_session() output,
+# for benchmarks that must run without PySide6/NodeGraphQt.
+
+import random
+
+_BASE_NODE = {
+    'icon': None,
+    'color': [13, 18, 23, 255],
+    'border_color': [74, 84, 85, 255],
+    'text_color': [255, 255, 255, 180],
+    'disabled': False,
+    'selected': False,
+    'visible': True,
+    'width': 160.0,
+    'height': 120.0,
+    'layout_direction': 0,
+    'port_deletion_allowed': False,
+    'subgraph_session': {},
+}
+
+_CUSTOM_DEFAULTS = {
+    'Automation.StartNode':    ('Start',    {'key': 'None'}),
+    'Automation.EndNode':      ('End',      {'repeat': 'Repeat'}),
+    'Automation.DelayNode':    ('Delay',    {'delay': '1000'}),
+    'Automation.KeyboardNode': ('Keyboard', {'key': 'Enter', 'type': 'Hold', 'duration': '100'}),
+    'Automation.MouseNode':    ('Mouse',    {'x': '0', 'y': '0', 'button': 'Move', 'hold': '100',
+                                              'move_ms': '0', 'easing': 'Linear', 'anchor': 'Screen'}),
+    'Automation.CaptureNode':  ('Capture Screen', {'x': '0', 'y': '0', 'width': '0', 'height': '0', 'rate': '0'}),
+    'Automation.FindImageNode': ('Find Image', {'template': '', 'threshold': '0.9',
+                                                 'x': '0', 'y': '0', 'width': '0', 'height': '0'}),
+}
+
+_GRAPH = {
+    'layout_direction': 0,
+    'acyclic': True,
+    'pipe_collision': False,
+    'pipe_slicing': True,
+    'pipe_style': 1,
+    'accept_connection_types': {},
+    'reject_connection_types': {},
+}
+
+
+def makeNode(node_type, pos, custom=None):
+    name, defaults = _CUSTOM_DEFAULTS[node_type]
+    node = {'type_': node_type, 'name': name}
+    node.update({k: (list(v) if isinstance(v, list) else v) for k, v in _BASE_NODE.items()})
+    node['pos'] = [float(pos[0]), float(pos[1])]
+    node['custom'] = dict(defaults)
+    if custom:
+        node['custom'].update(custom)
+    return node
+
+
+def makeSession(n_nodes=1000, path_length=10, seed=0, delay_ms=None, repeat='Repeat'):
+    """
+    Start → (path_length - 2 action nodes) → End chains until n_nodes nodes exist.
+    delay_ms, if given, fixes every Delay node's value (e.g. 0 for delay-free loops).
+    """
+    rng = random.Random(seed)
+    nodes = {}
+    connections = []
+    next_id = 0x10000000
+
+    def new_id():
+        nonlocal next_id
+        next_id += rng.randint(1, 4096)
+        return hex(next_id)
+
+    path_index = 0
+    while len(nodes) < n_nodes:
+        y = path_index * 150
+        chain = []
+        start_id = new_id()
+        nodes[start_id] = makeNode('Automation.StartNode', (0, y), {'key': rng.choice(['None', 'A', 'B', 'F5'])})
+        chain.append(start_id)
+
+        for i in range(max(0, path_length - 2)):
+            node_id = new_id()
+            kind = rng.choice(['Automation.DelayNode', 'Automation.KeyboardNode', 'Automation.MouseNode'])
+            if kind == 'Automation.DelayNode':
+                custom = {'delay': str(delay_ms if delay_ms is not None else rng.choice([50, 100, 1000]))}
+            elif kind == 'Automation.KeyboardNode':
+                custom = {'key': rng.choice(['A', 'B', 'Enter', 'Space']), 'type': 'Press' if delay_ms == 0 else 'Hold',
+                          'duration': '0' if delay_ms == 0 else '100'}
+            else:
+                custom = {'x': str(rng.randint(0, 1919)), 'y': str(rng.randint(0, 1079)),
+                          'button': 'Move' if delay_ms == 0 else rng.choice(['Move', 'Left']),
+                          'hold': '0' if delay_ms == 0 else '100'}
+            nodes[node_id] = makeNode(kind, (200 * (i + 1), y), custom)
+            chain.append(node_id)
+
+        end_id = new_id()
+        nodes[end_id] = makeNode('Automation.EndNode', (200 * path_length, y), {'repeat': repeat})
+        chain.append(end_id)
+
+        for a, b in zip(chain, chain[1:]):
+            connections.append({'out': [a, 'out'], 'in': [b, 'in']})
+        path_index += 1
+
+    return {'graph': dict(_GRAPH), 'nodes': nodes, 'connections': connections}
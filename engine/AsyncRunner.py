@@ -0,0 +1,210 @@
+# engine/AsyncRunner.py
+#
+# Alternative to one thread per Start path: every path runs as a coroutine on
+# one asyncio loop (the qasync loop in the GUI, asyncio.run() headless).
+# Delays are loop timers, and input is only posted to the InputInjector
+# thread, so hundreds of paths cost hundreds of coroutines, not threads.
+
+import asyncio
+from bisect import bisect_right
+
+from engine.ExecutionPlan import OP_DELAY, OP_END
+from engine.PlanRunner import (
+    beginInstruction, endInstruction, anchorInstruction, motionSchedule,
+    MOTION_OPS, BLOCKING_OPS,
+)
+from engine.Timing import TimingStats, waitDeadlines, perf_counter_ns
+from engine import ScreenCapture
+from engine import Tracer
+
+
+class AsyncPathTimer:
+    """
+    asyncio counterpart of PathTimer for one path.
+    Waits are loop timers aimed at perf_counter_ns deadlines; a stop/pause of
+    the path's RunToken wakes the coroutine at once. The overshoot of each
+    wait is the path's scheduling lag, recorded in .stats; Delays keep to the
+    path's schedule (see Timing.waitDeadlines), so lag never accumulates
+    into drift.
+    """
+
+    def __init__(self, token, loop=None):
+        self.stats = TimingStats()
+        self._due_ns = None
+        self._token = token
+        self._loop = loop or asyncio.get_event_loop()
+        self._waiter = None
+        token.add_listener(self._on_token_changed)
+
+    def close(self):
+        self._token.remove_listener(self._on_token_changed)
+
+    def _on_token_changed(self):
+        # Called on whichever thread stopped/paused the token
+        self._loop.call_soon_threadsafe(self._wake)
+
+    def _wake(self):
+        if self._waiter is not None and not self._waiter.done():
+            self._waiter.set_result(None)
+
+    async def _block(self, timeout_s=None):
+        waiter = self._waiter = self._loop.create_future()
+        handle = self._loop.call_later(timeout_s, self._wake) if timeout_s is not None else None
+        try:
+            await waiter
+        finally:
+            if handle is not None:
+                handle.cancel()
+            self._waiter = None
+
+    async def sleep_until(self, deadline_ns):
+        """
+        Returns False if the token is stopped/paused before deadline_ns.
+        """
+        while not self._token.is_set():
+            remaining = deadline_ns - perf_counter_ns()
+            if remaining <= 0:
+                return True
+            await self._block(remaining / 1e9)
+        return False
+
+    async def checkpoint(self):
+        """
+        Suspend while paused. Returns False if the path has been stopped.
+        """
+        while self._token.paused and not self._token.stopped:
+            await self._block()
+        return not self._token.stopped
+
+    async def wait(self, node_id, ms, scheduled=False):
+        """
+        Wait ms milliseconds (on the path's schedule if scheduled). A pause
+        freezes the remaining time until resume; returns False if the token
+        is stopped first.
+        """
+        deadline_ns, due_ns = waitDeadlines(self._due_ns, ms * 1_000_000, scheduled)
+
+        while not await self.sleep_until(deadline_ns):
+            paused_at = perf_counter_ns()
+            if not await self.checkpoint():
+                self._due_ns = None
+                return False
+            paused_ns = perf_counter_ns() - paused_at
+            deadline_ns += paused_ns
+            due_ns += paused_ns
+
+        overshoot_ns = perf_counter_ns() - deadline_ns
+        self._due_ns = due_ns
+        self.stats.record(node_id, overshoot_ns)
+        return True
+
+    async def follow(self, node_id, offsets_ns, emit):
+        """
+        Coroutine version of PathTimer.follow: emit(i) offsets_ns[i] after now,
+        overdue steps skipped for the newest due one, paused while the token is.
+        """
+        origin = perf_counter_ns()
+        count = len(offsets_ns)
+        _, due_ns = waitDeadlines(self._due_ns, offsets_ns[-1] if count else 0, False)
+        i = 0
+        while i < count:
+            deadline_ns = origin + offsets_ns[i]
+            if not await self.sleep_until(deadline_ns):
+                paused_at = perf_counter_ns()
+                if not await self.checkpoint():
+                    self._due_ns = None
+                    return False
+                paused_ns = perf_counter_ns() - paused_at
+                origin += paused_ns
+                due_ns += paused_ns
+                continue
+
+            now = perf_counter_ns()
+            self.stats.record(node_id, now - deadline_ns)
+            i = bisect_right(offsets_ns, now - origin, i) - 1
+            emit(i)
+            i += 1
+        self._due_ns = due_ns
+        return True
+
+
+async def runPlanAsync(plan, token, on_step=None, on_iteration=None, timer=None):
+    """
+    Coroutine version of runPlan, same semantics and callbacks.
+    Returns the AsyncPathTimer with the measured lag.
+    """
+    loop = asyncio.get_running_loop()
+    if timer is None:
+        timer = AsyncPathTimer(token, loop)
+    timer.stats.path = plan.start_id
+    instructions = plan.instructions
+    count = len(instructions)
+
+    index = 0
+    iteration = 0
+    try:
+        while count and await timer.checkpoint():
+            instr = instructions[index]
+            if on_step is not None:
+                on_step(instr.node_id)
+            began_ns = perf_counter_ns()
+            if instr.anchored:
+                instr = anchorInstruction(instr, token)
+
+            # Input is only queued for the injector thread, so this never blocks the loop
+            wait_ms = beginInstruction(instr, token)
+            completed = True
+            if instr.op in MOTION_OPS:
+                offsets_ns, emit = motionSchedule(instr)
+                completed = await timer.follow(instr.node_id, offsets_ns, emit)
+            elif wait_ms is not None:
+                completed = await timer.wait(instr.node_id, wait_ms, instr.op == OP_DELAY)
+            if instr.op in BLOCKING_OPS:
+                # Screen grabs and image searches run on a worker thread, not on the loop
+                next_index = await loop.run_in_executor(None, endInstruction, instr, token, completed)
+            else:
+                next_index = endInstruction(instr, token, completed)
+            tracer = Tracer.active
+            if tracer is not None:
+                tracer.node(plan.start_id, iteration, instr, began_ns, perf_counter_ns())
+            if token.stopped: break
+
+            if next_index > index:
+                index = next_index
+                continue
+            ScreenCapture.newPass(token)
+            if next_index >= 0:
+                # Backwards: a branch going back, or a path that loops on itself starting over
+                if plan.cyclic and next_index == plan.loop_to:
+                    iteration += 1
+                index = next_index
+            else:
+                iteration += 1
+                index = 0
+                if instr.op == OP_END and instr.label == 'Single':
+                    token.stop()
+                if on_iteration is not None:
+                    on_iteration()
+
+            # A pass (or branch loop) without any wait must still let the other paths (and the GUI) run
+            await asyncio.sleep(0)
+    finally:
+        token.release_all()
+        timer.close()
+
+    return timer
+
+
+class PathTask:
+    """
+    Handle of a path running as an asyncio task; quacks like the
+    threading.Thread kept in _loop_threads for the threaded engine.
+    """
+
+    def __init__(self, coro, name=None):
+        self.task = asyncio.ensure_future(coro)
+        if name:
+            self.task.set_name(name)
+
+    def is_alive(self):
+        return not self.task.done()
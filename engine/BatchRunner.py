@@ -0,0 +1,118 @@
+# engine/BatchRunner.py
+#
+# Runs one saved graph to completion inside a worker process (see batch.py).
+# Everything here is module-level so ProcessPoolExecutor can pickle it.
+
+import asyncio
+import contextlib
+import os
+import time
+import traceback
+
+import shared.globals as g
+from engine import InputActions
+from engine.AsyncRunner import AsyncPathTimer, runPlanAsync
+from engine.InputBackend import createBackend
+from engine.RunToken import RunToken
+from engine.SessionGraph import loadSession
+from shared import Log
+
+def initWorker(input_mode='null', spin_ms=None, log_levels=None):
+    """
+    ProcessPoolExecutor initializer; every worker process has its own input
+    backend and injector thread (see engine/InputBackend.createBackend):
+      • 'pynput': real keyboard/mouse input
+      • 'null':   input events are only counted - for validating and soak-testing graphs
+    log_levels is a shared/Log.configure spec (e.g. 'engine=debug').
+    """
+    g.ensure_initialized()
+    Log.configure(log_levels or g.log_levels)
+    if spin_ms is not None:
+        g.timing_spin_window_ms = spin_ms
+    InputActions.setBackend(createBackend(input_mode))
+
+
+def _lag_summary(stats):
+    nodes = stats.summary()
+    waits = sum(s['count'] for s in nodes.values())
+    return {
+        'waits': waits,
+        'mean_ms': sum(s['mean_ms'] * s['count'] for s in nodes.values()) / waits if waits else 0.0,
+        'max_ms': max((s['max_ms'] for s in nodes.values()), default=0.0),
+    }
+
+
+async def _run_graph(graph, iterations, duration_s):
+    loop = asyncio.get_running_loop()
+    start_ids = graph.start_ids()
+    tokens = {start_id: RunToken() for start_id in start_ids}
+    counts = {start_id: 0 for start_id in start_ids}
+    timers = {}
+
+    def on_iteration(start_id):
+        def finished():
+            counts[start_id] += 1
+            if iterations and counts[start_id] >= iterations:
+                tokens[start_id].stop()
+        return finished
+
+    paths = []
+    for start_id in start_ids:
+        timers[start_id] = AsyncPathTimer(tokens[start_id], loop)
+        paths.append(runPlanAsync(graph.compile(start_id), tokens[start_id],
+                                  on_iteration=on_iteration(start_id), timer=timers[start_id]))
+
+    deadline = None
+    if duration_s:
+        deadline = loop.call_later(duration_s, lambda: [token.stop() for token in tokens.values()])
+    try:
+        await asyncio.gather(*paths)
+    finally:
+        if deadline is not None:
+            deadline.cancel()
+
+    return {
+        start_id: {'iterations': counts[start_id], 'lag': _lag_summary(timers[start_id].stats)}
+        for start_id in start_ids
+    }
+
+
+def runGraphFile(file_path, iterations=0, duration_s=0.0, verbose=False):
+    """
+    Run every Start path of file_path until each has done `iterations` passes
+    and/or `duration_s` seconds have passed (0 = no limit; paths ending in a
+    'Single' End node stop on their own). Never raises: failures end up in the result.
+    """
+    result = {
+        'graph': file_path,
+        'ok': False,
+        'error': None,
+        'pid': os.getpid(),
+        'paths': {},
+        'duration_s': 0.0,
+        'input_calls': 0,
+    }
+    started = time.perf_counter()
+    injector = InputActions.getInjector()
+    posted_before = injector.posted
+    try:
+        graph = loadSession(file_path)
+        if not graph.start_ids():
+            raise ValueError("graph has no Start nodes")
+        with contextlib.ExitStack() as stack:
+            if not verbose:
+                # Per-node messages from dozens of workers would only drown the summary
+                stack.enter_context(contextlib.redirect_stdout(stack.enter_context(open(os.devnull, 'w'))))
+            try:
+                result['paths'] = asyncio.run(_run_graph(graph, iterations, duration_s))
+            finally:
+                Log.flush()  # while stdout is still redirected
+        result['ok'] = True
+    except Exception as e:
+        result['error'] = f"{type(e).__name__}: {e}"
+        if verbose:
+            traceback.print_exc()
+    result['duration_s'] = time.perf_counter() - started
+    injector.flush(timeout=5)
+    result['input_calls'] = injector.posted - posted_before
+    return result
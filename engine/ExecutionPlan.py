@@ -0,0 +1,263 @@
+# engine/ExecutionPlan.py
+
+import os
+from typing import NamedTuple, Optional
+
+import shared.globals as g
+from engine.InputActions import resolveKey, resolveButton
+from engine.Trajectory import motionProfile, EASINGS
+from engine.ImageMatch import getTemplate
+from shared.Log import getLogger
+
+log = getLogger('engine.ExecutionPlan')
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Instruction kinds
+# ──────────────────────────────────────────────────────────────────────────────
+OP_START        = 0
+OP_DELAY        = 1
+OP_KEY_PRESS    = 2
+OP_KEY_RELEASE  = 3
+OP_KEY_HOLD     = 4
+OP_MOUSE_MOVE   = 5
+OP_MOUSE_CLICK  = 6
+OP_END          = 7
+OP_NOOP         = 8
+OP_MOUSE_GLIDE  = 9     # Move along a trajectory instead of jumping
+OP_MOUSE_DRAG   = 10    # Hold a button down along a trajectory
+OP_CAPTURE      = 11    # Grab a screen region into the path's frame
+OP_FIND_IMAGE   = 12    # Search the path's frame for a template; branches on the result
+
+# Instruction kind → name, for logs and traces
+OP_NAMES = {
+    OP_START: 'Start',
+    OP_DELAY: 'Delay',
+    OP_KEY_PRESS: 'Key Press',
+    OP_KEY_RELEASE: 'Key Release',
+    OP_KEY_HOLD: 'Key Hold',
+    OP_MOUSE_MOVE: 'Mouse Move',
+    OP_MOUSE_CLICK: 'Mouse Click',
+    OP_END: 'End',
+    OP_NOOP: 'No-op',
+    OP_MOUSE_GLIDE: 'Mouse Glide',
+    OP_MOUSE_DRAG: 'Mouse Drag',
+    OP_CAPTURE: 'Capture Screen',
+    OP_FIND_IMAGE: 'Find Image',
+}
+
+# Branching instructions → output port followed when the branch is taken (the first output is followed otherwise)
+BRANCH_PORTS = {
+    OP_FIND_IMAGE: 'not found',
+}
+BRANCH_PORT_NAMES = frozenset(BRANCH_PORTS.values())
+
+# MouseNode anchors: x/y are screen coordinates, or an offset from the path's last Find Image match
+MOUSE_ANCHORS = ['Screen', 'Found Image']
+
+# MouseNode button that drags, and the button it holds
+DRAG_BUTTON = 'Left'
+
+# Find Image confidence (normalized cross-correlation) that counts as found when none is set
+DEFAULT_FIND_THRESHOLD = 0.9
+
+# Node type_ (as written by NodeGraphQt) → custom properties the compiler reads
+NODE_FIELDS = {
+    'Automation.StartNode':    ('key',),
+    'Automation.EndNode':      ('repeat',),
+    'Automation.DelayNode':    ('delay',),
+    'Automation.KeyboardNode': ('key', 'type', 'duration'),
+    'Automation.MouseNode':    ('x', 'y', 'button', 'hold', 'move_ms', 'easing', 'anchor'),
+    'Automation.CaptureNode':  ('x', 'y', 'width', 'height', 'rate'),
+    'Automation.FindImageNode': ('template', 'threshold', 'x', 'y', 'width', 'height'),
+}
+
+
+class Instruction(NamedTuple):
+    op: int
+    node_id: str
+    key: object = None      # resolved key / button, ready for the input layer
+    label: str = ''         # original key / button name (for logs)
+    x: int = 0
+    y: int = 0
+    ms: int = 0
+    motion: object = None   # MotionProfile of a glide/drag (engine/Trajectory.py)
+    width: int = 0          # capture / search region size (0 = to the screen edge)
+    height: int = 0
+    threshold: float = 0.0  # Find Image: lowest confidence that counts as found
+    anchored: bool = False  # Mouse: x/y are an offset from the path's last match
+    next: int = -1          # index of the instruction that follows (-1 = end of the pass)
+    jump: int = -1          # branches: index to continue at when the branch is taken
+
+
+class ExecutionPlan(NamedTuple):
+    """
+    Immutable, flattened form of one Start path.
+      • instructions: tuple of Instruction, each pointing at the next one to run
+      • loop_to:      index to continue from after the last instruction
+      • repeat:       False when the path ends in a 'Single' End node
+      • cyclic:       True when the path loops back on itself without an End node
+    """
+    start_id: str
+    instructions: tuple
+    loop_to: int = 0
+    repeat: bool = True
+    cyclic: bool = False
+
+
+def _to_int(value):
+    try:
+        return int(value)
+    except (ValueError, TypeError):
+        return 0
+
+
+def _to_float(value, default=0.0):
+    try:
+        return float(value)
+    except (ValueError, TypeError):
+        return default
+
+
+def compileNode(node_type, node_id, props) -> Optional[Instruction]:
+    """
+    Turn one node's properties into a pre-resolved Instruction.
+    Unknown node types compile to a no-op so the path still advances.
+    """
+    if node_type == 'Automation.StartNode':
+        return Instruction(OP_START, node_id, label=str(props.get('key')))
+
+    if node_type == 'Automation.EndNode':
+        return Instruction(OP_END, node_id, label=str(props.get('repeat', 'Repeat')))
+
+    if node_type == 'Automation.DelayNode':
+        return Instruction(OP_DELAY, node_id, ms=max(0, _to_int(props.get('delay'))))
+
+    if node_type == 'Automation.KeyboardNode':
+        key_str = props.get('key')
+        action_type = props.get('type')
+        ms = _to_int(props.get('duration'))
+        if ms < 0:
+            log.error("[KeyboardNode] Duration cannot be negative. Received: %dms", ms)
+            return Instruction(OP_NOOP, node_id, label=str(key_str))
+        key = resolveKey(key_str)
+        if key is None:
+            log.error("[KeyboardNode] Key '%s' is not recognized or supported.", key_str)
+            return Instruction(OP_NOOP, node_id, label=str(key_str))
+        op = {
+            'Press': OP_KEY_PRESS,
+            'Release': OP_KEY_RELEASE,
+            'Hold': OP_KEY_HOLD,
+        }.get(action_type, OP_NOOP)
+        return Instruction(op, node_id, key=key, label=key_str, ms=ms)
+
+    if node_type == 'Automation.MouseNode':
+        x = _to_int(props.get('x'))
+        y = _to_int(props.get('y'))
+        button_str = props.get('button')
+        ms = max(0, _to_int(props.get('hold')))
+        move_ms = max(0, _to_int(props.get('move_ms')))
+        easing = props.get('easing') if props.get('easing') in EASINGS else 'Linear'
+        anchored = props.get('anchor') == 'Found Image'
+        if button_str == 'Move':
+            if move_ms:
+                return Instruction(OP_MOUSE_GLIDE, node_id, label=button_str, x=x, y=y, ms=move_ms,
+                                   motion=motionProfile(move_ms, g.mouse_motion_hz, easing), anchored=anchored)
+            return Instruction(OP_MOUSE_MOVE, node_id, label=button_str, x=x, y=y, anchored=anchored)
+        if button_str == 'Drag':
+            button = resolveButton(DRAG_BUTTON)
+            if button is None:
+                log.error("[MouseNode] Button '%s' not recognized", DRAG_BUTTON)
+                return Instruction(OP_NOOP, node_id, label=button_str)
+            return Instruction(OP_MOUSE_DRAG, node_id, key=button, label=button_str, x=x, y=y, ms=move_ms,
+                               motion=motionProfile(move_ms, g.mouse_motion_hz, easing), anchored=anchored)
+        button = resolveButton(button_str)
+        if button is None:
+            log.error("[MouseNode] Button '%s' not recognized", button_str)
+            return Instruction(OP_NOOP, node_id, label=str(button_str))
+        return Instruction(OP_MOUSE_CLICK, node_id, key=button, label=button_str, x=x, y=y, ms=ms, anchored=anchored)
+
+    if node_type == 'Automation.CaptureNode':
+        # ms: minimum time between two captures of this node (from rate, frames per second; 0 = no limit)
+        rate = _to_int(props.get('rate'))
+        return Instruction(OP_CAPTURE, node_id, x=_to_int(props.get('x')), y=_to_int(props.get('y')),
+                           width=max(0, _to_int(props.get('width'))), height=max(0, _to_int(props.get('height'))),
+                           ms=round(1000 / rate) if rate > 0 else 0)
+
+    if node_type == 'Automation.FindImageNode':
+        # key: the prepared Template (None if it cannot be loaded: the node never finds anything)
+        template_path = str(props.get('template') or '')
+        template = None
+        try:
+            template = getTemplate(template_path)
+        except (OSError, ValueError, RuntimeError) as e:
+            log.error("[FindImageNode] Template '%s' cannot be loaded: %s", template_path, e)
+        return Instruction(OP_FIND_IMAGE, node_id, key=template, label=os.path.basename(template_path),
+                           x=_to_int(props.get('x')), y=_to_int(props.get('y')),
+                           width=max(0, _to_int(props.get('width'))), height=max(0, _to_int(props.get('height'))),
+                           threshold=_to_float(props.get('threshold'), DEFAULT_FIND_THRESHOLD))
+
+    return Instruction(OP_NOOP, node_id, label=str(node_type))
+
+
+def compilePath(start_id, get_node, get_next) -> ExecutionPlan:
+    """
+    Walk a Start path once and flatten it into an ExecutionPlan.
+      • get_node(node_id) -> (node_type, props) or None
+      • get_next(node_id, port=None) -> id of the node wired to the first output
+                                        (or to the named output port), or None
+    The chain from the Start node comes first; the chains behind branch ports
+    (BRANCH_PORTS) follow it. Every instruction points at its successor.
+    """
+    instructions = []
+    index_of = {}
+    loop_to = 0
+    repeat = True
+    cyclic = False
+    branches = []   # (index of a branching instruction, node id behind its branch port)
+
+    def walk(node_id, main):
+        # Compile the chain starting at node_id; returns the index it starts at (-1: nothing there)
+        nonlocal loop_to, repeat, cyclic
+        head = previous = -1
+        while node_id is not None:
+            if node_id in index_of:
+                target = index_of[node_id]
+                if main:
+                    # Path loops back on itself: keep cycling from that node forever.
+                    loop_to = target
+                    cyclic = True
+                if previous < 0:
+                    return target
+                instructions[previous] = instructions[previous]._replace(next=target)
+                break
+
+            node = get_node(node_id)
+            if node is None:
+                break
+            node_type, props = node
+
+            index = index_of[node_id] = len(instructions)
+            instr = compileNode(node_type, node_id, props)
+            instructions.append(instr)
+            if previous < 0:
+                head = index
+            else:
+                instructions[previous] = instructions[previous]._replace(next=index)
+            previous = index
+
+            if instr.op in BRANCH_PORTS:
+                branches.append((index, get_next(node_id, BRANCH_PORTS[instr.op])))
+            if instr.op == OP_END:
+                if main:
+                    repeat = instr.label != 'Single'
+                break
+            node_id = get_next(node_id)
+        return head
+
+    walk(start_id, True)
+    while branches:
+        index, node_id = branches.pop(0)
+        target = walk(node_id, False)
+        instructions[index] = instructions[index]._replace(jump=target)
+
+    return ExecutionPlan(start_id, tuple(instructions), loop_to, repeat, cyclic)
@@ -0,0 +1,343 @@
+# engine/ImageMatch.py
+#
+# Template matching for the Find Image node. Score = zero-mean normalized
+# cross-correlation (1.0 = identical up to brightness/contrast). A full-size
+# search would correlate every template pixel at every screen position, so
+# the search runs coarse-to-fine: frame and template are halved a few times,
+# the coarsest level is searched everywhere (FFT correlation + integral-image
+# window sums), and only the best few candidates are followed back up the
+# pyramid, each level looking at a few pixels around the position the level
+# above found. Templates are loaded and prepared once and kept in memory.
+
+import os
+import struct
+import threading
+import zlib
+from typing import NamedTuple
+
+from shared.Log import getLogger
+
+try:
+    import numpy as np
+except ImportError:  # matching needs NumPy; the rest of the engine does not
+    np = None
+
+try:
+    from PIL import Image
+except ImportError:  # PNG templates are decoded below without Pillow
+    Image = None
+
+log = getLogger('engine.ImageMatch')
+
+# The coarsest pyramid level keeps the template at least this many px on its short side
+MIN_LEVEL_SIDE = 12
+MAX_LEVELS = 4
+# Coarse-level positions followed to full resolution (the best one wins)
+CANDIDATES = 3
+# Pixels searched around a candidate on each finer level
+REFINE_MARGIN = 2
+
+# Luma weights (x256) for B, G, R
+_LUMA_BGR = (29, 150, 77)
+
+
+class Match(NamedTuple):
+    """
+    Best position of a template in a frame, in screen coordinates.
+      • x, y:        center of the match (where a click should go)
+      • left, top:   top-left corner of the matched area
+      • confidence:  normalized cross-correlation, -1 ... 1
+    """
+    x: int
+    y: int
+    left: int
+    top: int
+    confidence: float
+
+
+class _Level:
+    __slots__ = ('pixels', 'height', 'width', 'norm', 'spectra')
+
+    def __init__(self, gray):
+        # Zero-mean template: correlating with it ignores the window mean for free
+        self.pixels = (gray - gray.mean()).astype(np.float64)
+        self.height, self.width = gray.shape
+        self.norm = float(np.sqrt((self.pixels * self.pixels).sum()))
+        self.spectra = {}   # FFT shape → conjugate spectrum of the template at that size
+
+
+class Template:
+    """
+    A template image prepared for matching: its gray pyramid (level 0 = full
+    size) and, per FFT size used so far, the template's spectrum.
+    """
+
+    def __init__(self, gray, source=''):
+        self.source = source
+        self.height, self.width = gray.shape
+        gray = gray.astype(np.float32)
+        levels = [_Level(gray)]
+        while len(levels) < MAX_LEVELS and min(gray.shape) // 2 >= MIN_LEVEL_SIDE:
+            gray = _halve(gray)
+            levels.append(_Level(gray))
+        self.levels = levels
+
+    def __repr__(self):
+        return f"Template({self.source!r}, {self.width}x{self.height}, {len(self.levels)} levels)"
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Loading (cached per file)
+# ──────────────────────────────────────────────────────────────────────────────
+_templates = {}
+_templates_lock = threading.Lock()
+
+
+def getTemplate(path):
+    """
+    The Template for an image file (PNG, anything Pillow reads, or a .npy array),
+    loaded once and kept until the file changes. Raises OSError/ValueError if
+    it cannot be read.
+    """
+    path = os.path.abspath(path)
+    st = os.stat(path)
+    key = (path, st.st_mtime_ns, st.st_size)
+    template = _templates.get(key)
+    if template is None:
+        template = Template(_grayFromRgb(loadImage(path)), os.path.basename(path))
+        with _templates_lock:
+            for stale in [k for k in _templates if k[0] == path]:
+                del _templates[stale]
+            _templates[key] = template
+        log.debug("[ImageMatch] Loaded %r", template)
+    return template
+
+
+def loadImage(path):
+    """
+    (height, width, 3 or 4) uint8 RGB(A) array of an image file.
+    """
+    if path.lower().endswith('.npy'):
+        array = np.load(path)
+        return array if array.ndim == 3 else np.repeat(array[:, :, None], 3, axis=2)
+    if Image is not None:
+        with Image.open(path) as image:
+            return np.asarray(image.convert('RGBA'))
+    with open(path, 'rb') as f:
+        return _decodePng(f.read())
+
+
+_PNG_SIGNATURE = b'\x89PNG\r\n\x1a\n'
+_PNG_CHANNELS = {0: 1, 2: 3, 3: 1, 4: 2, 6: 4}
+
+
+def _decodePng(data):
+    # 8-bit, non-interlaced PNG (what screenshot tools save) → RGB(A) array
+    if data[:8] != _PNG_SIGNATURE:
+        raise ValueError("not a PNG file (install Pillow for other formats)")
+    pos = 8
+    idat = []
+    palette = None
+    while pos < len(data):
+        length, kind = struct.unpack('>I4s', data[pos:pos + 8])
+        chunk = data[pos + 8:pos + 8 + length]
+        pos += 12 + length
+        if kind == b'IHDR':
+            width, height, depth, color, _, _, interlace = struct.unpack('>IIBBBBB', chunk)
+        elif kind == b'PLTE':
+            palette = np.frombuffer(chunk, dtype=np.uint8).reshape(-1, 3)
+        elif kind == b'IDAT':
+            idat.append(chunk)
+        elif kind == b'IEND':
+            break
+    if depth != 8 or interlace or color not in _PNG_CHANNELS:
+        raise ValueError("unsupported PNG (8-bit, non-interlaced only; install Pillow for others)")
+
+    bpp = _PNG_CHANNELS[color]
+    stride = width * bpp
+    raw = zlib.decompress(b''.join(idat))
+    rows = np.empty((height, stride), dtype=np.uint8)
+    previous = np.zeros(stride, dtype=np.uint8)
+    for y in range(height):
+        start = y * (stride + 1)
+        kind = raw[start]
+        line = np.frombuffer(raw, dtype=np.uint8, count=stride, offset=start + 1)
+        if kind == 0:
+            row = line.copy()
+        elif kind == 1:   # Sub: running sum per channel, wrapping at 256
+            row = np.cumsum(line.reshape(width, bpp), axis=0, dtype=np.uint8).reshape(stride)
+        elif kind == 2:   # Up
+            row = line + previous
+        else:             # Average / Paeth depend on the byte just decoded: one at a time
+            row = bytearray(line.tobytes())
+            up = previous.tobytes()
+            for i in range(stride):
+                a = row[i - bpp] if i >= bpp else 0
+                b = up[i]
+                if kind == 3:
+                    predictor = (a + b) >> 1
+                else:
+                    c = up[i - bpp] if i >= bpp else 0
+                    p = a + b - c
+                    pa, pb, pc = abs(p - a), abs(p - b), abs(p - c)
+                    predictor = a if pa <= pb and pa <= pc else (b if pb <= pc else c)
+                row[i] = (row[i] + predictor) & 0xFF
+            row = np.frombuffer(bytes(row), dtype=np.uint8)
+        rows[y] = row
+        previous = rows[y]
+
+    pixels = rows.reshape(height, width, bpp)
+    if color == 3:
+        return palette[pixels[:, :, 0]]
+    if color in (0, 4):
+        return np.repeat(pixels[:, :, :1], 3, axis=2)
+    return pixels
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Pyramids
+# ──────────────────────────────────────────────────────────────────────────────
+def _grayFromRgb(rgb):
+    r, g, b = (rgb[:, :, i].astype(np.uint16) for i in range(3))
+    return ((b * _LUMA_BGR[0] + g * _LUMA_BGR[1] + r * _LUMA_BGR[2]) >> 8).astype(np.float32)
+
+
+def _grayFromBgra(bgra):
+    # Integer luma (uint16, 0-255): half the cost of float weights on a full frame
+    return (bgra[:, :, 0] * np.uint16(_LUMA_BGR[0]) + bgra[:, :, 1] * np.uint16(_LUMA_BGR[1])
+            + bgra[:, :, 2] * np.uint16(_LUMA_BGR[2])) >> 8
+
+
+def _halve(image):
+    # 2x2 box average (odd last row/column dropped)
+    h, w = image.shape[0] // 2 * 2, image.shape[1] // 2 * 2
+    s = image[0:h:2, 0:w:2].astype(np.float32)
+    s += image[1:h:2, 0:w:2]
+    s += image[0:h:2, 1:w:2]
+    s += image[1:h:2, 1:w:2]
+    s *= 0.25
+    return s
+
+
+def _fftLength(n):
+    # Next length with only 2, 3, 5 as factors (fast for pocketfft)
+    while True:
+        m = n
+        for p in (2, 3, 5):
+            while m % p == 0:
+                m //= p
+        if m == 1:
+            return n
+        n += 1
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Scoring
+# ──────────────────────────────────────────────────────────────────────────────
+def _windowSums(image, h, w):
+    # Sum of every h x w window (valid positions) via an integral image
+    ii = np.zeros((image.shape[0] + 1, image.shape[1] + 1), dtype=np.float64)
+    np.cumsum(image, axis=0, out=ii[1:, 1:])
+    np.cumsum(ii[1:, 1:], axis=1, out=ii[1:, 1:])
+    return ii[h:, w:] - ii[:-h, w:] - ii[h:, :-w] + ii[:-h, :-w]
+
+
+def _nccMap(image, level):
+    """
+    NCC of the template level at every valid position of image (float array).
+    """
+    h, w = level.height, level.width
+    rows, cols = image.shape[0] - h + 1, image.shape[1] - w + 1
+    image = image.astype(np.float64, copy=False)
+
+    shape = (_fftLength(image.shape[0]), _fftLength(image.shape[1]))
+    spectrum = level.spectra.get(shape)
+    if spectrum is None:
+        spectrum = level.spectra[shape] = np.conj(np.fft.rfft2(level.pixels, shape))
+    numerator = np.fft.irfft2(np.fft.rfft2(image, shape) * spectrum, shape)[:rows, :cols]
+
+    n = h * w
+    s1 = _windowSums(image, h, w)
+    s2 = _windowSums(image * image, h, w)
+    variance = np.maximum(s2 - s1 * s1 / n, 0.0)
+    denominator = np.sqrt(variance) * level.norm
+    # Flat windows (no contrast) cannot match anything
+    flat = denominator < 1e-6 * n
+    denominator[flat] = 1.0
+    scores = numerator / denominator
+    scores[flat] = 0.0
+    return scores
+
+
+def _peaks(scores, count, h, w):
+    # Up to count best positions, at least a template size apart
+    scores = scores.copy()
+    peaks = []
+    for _ in range(count):
+        index = int(np.argmax(scores))
+        r, c = divmod(index, scores.shape[1])
+        if scores[r, c] <= 0 or not np.isfinite(scores[r, c]):
+            break
+        peaks.append((r, c))
+        scores[max(0, r - h // 2):r + h // 2 + 1, max(0, c - w // 2):c + w // 2 + 1] = -np.inf
+    return peaks
+
+
+def findTemplate(bgra, template, origin=(0, 0)):
+    """
+    Best Match of template in a (height, width, 4) BGRA array whose top-left
+    pixel is at screen position origin. None if the template does not fit.
+    """
+    frame_h, frame_w = bgra.shape[:2]
+    if template.height > frame_h or template.width > frame_w:
+        return None
+
+    pyramid = [_grayFromBgra(bgra)]
+    levels = template.levels
+    while len(pyramid) < len(levels):
+        pyramid.append(_halve(pyramid[-1]))
+    top = len(pyramid) - 1
+
+    coarse = levels[top]
+    scores = _nccMap(pyramid[top], coarse)
+    candidates = [(r, c, float(scores[r, c])) for r, c in _peaks(scores, CANDIDATES, coarse.height, coarse.width)]
+
+    for k in range(top - 1, -1, -1):
+        level, image = levels[k], pyramid[k]
+        max_r, max_c = image.shape[0] - level.height, image.shape[1] - level.width
+        refined = []
+        for r, c, _ in candidates:
+            r0, c0 = max(0, 2 * r - REFINE_MARGIN), max(0, 2 * c - REFINE_MARGIN)
+            r1, c1 = min(max_r, 2 * r + REFINE_MARGIN + 1), min(max_c, 2 * c + REFINE_MARGIN + 1)
+            region = image[r0:r1 + level.height, c0:c1 + level.width]
+            scores = _nccMap(region, level)
+            index = int(np.argmax(scores))
+            dr, dc = divmod(index, scores.shape[1])
+            refined.append((r0 + dr, c0 + dc, float(scores[dr, dc])))
+        candidates = refined
+
+    if not candidates:
+        return None
+    r, c, confidence = max(candidates, key=lambda candidate: candidate[2])
+    left, top_y = origin[0] + c, origin[1] + r
+    return Match(left + template.width // 2, top_y + template.height // 2, left, top_y, min(1.0, confidence))
+
+
+def findInFrame(frame, template, roi=None):
+    """
+    Search a ScreenCapture Frame, optionally only inside roi = (x, y, width, height)
+    in screen coordinates (width/height 0 = to the frame edge).
+    """
+    x0, y0 = frame.x, frame.y
+    x1, y1 = x0 + frame.width, y0 + frame.height
+    if roi is not None:
+        rx, ry, rw, rh = roi
+        x0, y0 = max(x0, rx), max(y0, ry)
+        if rw > 0:
+            x1 = min(x1, rx + rw)
+        if rh > 0:
+            y1 = min(y1, ry + rh)
+        if x1 <= x0 or y1 <= y0:
+            return None
+    pixels = frame.pixels[y0 - frame.y:y1 - frame.y, x0 - frame.x:x1 - frame.x]
+    return findTemplate(pixels, template, (x0, y0))
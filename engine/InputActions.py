@@ -0,0 +1,97 @@
+# engine/InputActions.py
+#
+# What the engine calls to produce input. Every action is posted to the
+# process-wide InputInjector and returns immediately; the injector thread
+# hands it to the selected InputBackend (shared/globals.input_backend, or
+# setBackend()).
+
+import threading
+
+import shared.globals as g
+from engine.InputBackend import createBackend
+from engine.InputInjector import InputInjector, KEY_DOWN, KEY_UP, MOVE, BUTTON_DOWN, BUTTON_UP
+
+_lock = threading.Lock()
+_injector = None
+
+
+def setBackend(backend):
+    """
+    Route all input to backend from now on (events already posted go to the previous one).
+    """
+    global _injector
+    with _lock:
+        previous, _injector = _injector, InputInjector(backend)
+    if previous is not None:
+        previous.close()
+    return _injector
+
+
+def getInjector():
+    if _injector is None:
+        with _lock:
+            if _injector is None:
+                return _install_default()
+    return _injector
+
+
+def _install_default():
+    global _injector
+    _injector = InputInjector(createBackend(g.input_backend))
+    return _injector
+
+
+def getBackend():
+    return getInjector().backend
+
+
+def resolveKey(key_str):
+    """
+    Translate a KeyboardNode key name into what the backend expects (None if unknown).
+    """
+    return getBackend().resolve_key(key_str)
+
+
+def resolveButton(button_str):
+    """
+    Translate a MouseNode button name into what the backend expects (None if unknown).
+    """
+    return getBackend().resolve_button(button_str)
+
+
+def cursorPosition():
+    """
+    Where the cursor is now, as (x, y), according to the backend.
+    """
+    return getBackend().cursor_position()
+
+
+def motionOrigin():
+    """
+    Where the next glide or drag starts, as (x, y): the target of the last
+    posted move while it is still queued (the backend has not seen it yet),
+    else the cursor position.
+    """
+    injector = getInjector()
+    last_move = injector.last_move
+    if last_move is not None and injector.pending():
+        return last_move
+    return injector.backend.cursor_position()
+
+
+def pressKey(key):
+    getInjector().post(KEY_DOWN, key)
+
+def releaseKey(key):
+    getInjector().post(KEY_UP, key)
+
+def moveMouse(x, y):
+    injector = getInjector()
+    injector.last_move = (x, y)
+    injector.post(MOVE, x, y)
+
+def pressButton(button):
+    getInjector().post(BUTTON_DOWN, button)
+
+def releaseButton(button):
+    getInjector().post(BUTTON_UP, button)
@@ -0,0 +1,133 @@
+# engine/InputBackend.py
+
+import shared.globals as g
+from engine.Timing import perf_counter_ns
+
+# Mouse button names a MouseNode can hold, and the button each one means
+BUTTON_NAMES = {
+    "Left": "Left",
+    "Right": "Right",
+    "Middle": "Middle",
+    "Center": "Middle",
+    "Mouse4": "Mouse4",
+    "Mouse5": "Mouse5",
+}
+
+
+class InputBackend:
+    """
+    Where keyboard/mouse events end up. Only the InputInjector thread calls
+    key_down ... button_up, one event at a time; resolve_key/resolve_button
+    run when a plan is compiled and turn node settings into whatever the
+    backend wants handed back later (None = not recognized).
+    """
+
+    name = 'base'
+
+    def resolve_key(self, key_str):
+        raise NotImplementedError
+
+    def resolve_button(self, button_str):
+        raise NotImplementedError
+
+    def key_down(self, key):
+        raise NotImplementedError
+
+    def key_up(self, key):
+        raise NotImplementedError
+
+    def move(self, x, y):
+        raise NotImplementedError
+
+    def button_down(self, button):
+        raise NotImplementedError
+
+    def button_up(self, button):
+        raise NotImplementedError
+
+    def cursor_position(self):
+        """
+        Current cursor position (x, y). Called from the path threads, not the injector.
+        """
+        raise NotImplementedError
+
+    def flush(self):
+        """
+        Called after every batch of events (e.g. to flush a display connection once).
+        """
+
+
+class RecordingBackend(InputBackend):
+    """
+    In-memory backend for tests, benchmarks and machines without a display.
+    Keys and buttons stay plain names; every event is kept as
+    (perf_counter_ns, op, args) in .events, unless keep_events is False
+    (then they are only counted).
+    """
+
+    name = 'recording'
+
+    def __init__(self, keep_events=True):
+        self.keep_events = keep_events
+        self.events = []
+        self.count = 0
+        self.position = (0, 0)
+        self.held = set()
+
+    def resolve_key(self, key_str):
+        if key_str is None or key_str == 'None':
+            return None
+        if len(key_str) == 1:
+            return key_str.lower()
+        if key_str in g.KEY_NAMES_AVAILABLE:
+            return key_str
+        return None
+
+    def resolve_button(self, button_str):
+        return BUTTON_NAMES.get(button_str)
+
+    def _record(self, op, *args):
+        self.count += 1
+        if self.keep_events:
+            self.events.append((perf_counter_ns(), op, args))
+
+    def key_down(self, key):
+        self.held.add(key)
+        self._record('key_down', key)
+
+    def key_up(self, key):
+        self.held.discard(key)
+        self._record('key_up', key)
+
+    def move(self, x, y):
+        self.position = (x, y)
+        self._record('move', x, y)
+
+    def button_down(self, button):
+        self.held.add(button)
+        self._record('button_down', button)
+
+    def button_up(self, button):
+        self.held.discard(button)
+        self._record('button_up', button)
+
+    def cursor_position(self):
+        return self.position
+
+    def clear(self):
+        self.events = []
+        self.count = 0
+
+
+def createBackend(name):
+    """
+    'pynput' (real input), 'recording' (kept in memory) or 'null' (only counted).
+    """
+    if name == 'pynput':
+        from engine.PynputBackend import PynputBackend
+        return PynputBackend()
+    if name == 'recording':
+        return RecordingBackend()
+    if name == 'null':
+        return RecordingBackend(keep_events=False)
+    raise ValueError(f"unknown input backend '{name}'")
@@ -0,0 +1,169 @@
+# engine/InputInjector.py
+
+import queue
+import threading
+
+from engine.Timing import perf_counter_ns
+from engine import Tracer
+from shared.Log import getLogger
+
+log = getLogger('engine.InputInjector')
+
+KEY_DOWN    = 'key_down'
+KEY_UP      = 'key_up'
+MOVE        = 'move'
+BUTTON_DOWN = 'button_down'
+BUTTON_UP   = 'button_up'
+
+_SYNC = 'sync'
+
+
+class InputInjector:
+    """
+    The one thread that talks to the input backend. Paths (threads or
+    coroutines) only post timestamped events to a queue and carry on; the
+    injector drains whatever is queued as one batch, drops cursor moves that
+    are immediately overtaken by another move, and hands the rest to the
+    backend in order.
+
+    Injection latency (post → hand-off) and throughput are kept in stats().
+    """
+
+    def __init__(self, backend, coalesce_moves=True):
+        self.backend = backend
+        self.coalesce_moves = coalesce_moves
+        self._queue = queue.SimpleQueue()
+        self._thread = threading.Thread(target=self._run, name='InputInjector', daemon=True)
+        self._closed = False
+
+        self._post_lock = threading.Lock()
+        self.posted = 0         # written by every posting thread, under _post_lock
+        self.handled = 0        # posted events the injector thread is done with (sent or coalesced)
+        self.last_move = None   # (x, y) of the newest posted move
+        self.injected = 0
+        self.coalesced = 0
+        self.failures = 0
+        self.batches = 0
+        self._latency_total_ns = 0
+        self._latency_max_ns = 0
+        self._busy_ns = 0
+
+        self._thread.start()
+
+    # ──────────────────────────────────────────────────────────────────────────
+    # Any thread
+    # ──────────────────────────────────────────────────────────────────────────
+    def post(self, op, *args):
+        with self._post_lock:
+            self.posted += 1
+        self._queue.put((perf_counter_ns(), op, args))
+
+    def pending(self):
+        """
+        True while posted events are still waiting for the injector thread
+        (always False right after flush() returns, unless others posted since).
+        """
+        return self.handled != self.posted
+
+    def flush(self, timeout=None):
+        """
+        Block until everything posted so far has been handed to the backend.
+        """
+        if self._closed:
+            return True
+        done = threading.Event()
+        self._queue.put((perf_counter_ns(), _SYNC, (done,)))
+        return done.wait(timeout)
+
+    def close(self, timeout=None):
+        if self._closed:
+            return
+        self.flush(timeout)
+        self._closed = True
+        self._queue.put(None)
+
+    def stats(self):
+        injected = self.injected
+        return {
+            'backend': self.backend.name,
+            'posted': self.posted,
+            'injected': injected,
+            'coalesced': self.coalesced,
+            'failures': self.failures,
+            'batches': self.batches,
+            'mean_latency_ms': self._latency_total_ns / injected / 1e6 if injected else 0.0,
+            'max_latency_ms': self._latency_max_ns / 1e6,
+            'events_per_s': injected / (self._busy_ns / 1e9) if self._busy_ns else 0.0,
+        }
+
+    def report(self, tag="Input"):
+        s = self.stats()
+        print(f"[{tag}] {s['backend']}: {s['injected']} events in {s['batches']} batches "
+              f"({s['coalesced']} moves coalesced, {s['failures']} failed), "
+              f"latency mean {s['mean_latency_ms']:.3f} ms, max {s['max_latency_ms']:.3f} ms, "
+              f"{s['events_per_s']:.0f} events/s")
+
+    # ──────────────────────────────────────────────────────────────────────────
+    # Injector thread
+    # ──────────────────────────────────────────────────────────────────────────
+    def _coalesce(self, batch):
+        # A move directly followed by another move would never be seen: skip it.
+        # Returns (events, counts): how many posted events each one stands for.
+        if not self.coalesce_moves:
+            return batch, [0 if event[1] == _SYNC else 1 for event in batch]
+        events = []
+        counts = []
+        for event in batch:
+            if event[1] == MOVE and events and events[-1][1] == MOVE:
+                events[-1] = event
+                counts[-1] += 1
+                self.coalesced += 1
+            else:
+                events.append(event)
+                counts.append(0 if event[1] == _SYNC else 1)
+        return events, counts
+
+    def _run(self):
+        backend = self.backend
+        while True:
+            first = self._queue.get()
+            if first is None:
+                return
+            batch = [first]
+            while True:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            stop = None in batch
+            if stop:
+                batch = [event for event in batch if event is not None]
+
+            started = perf_counter_ns()
+            events, counts = self._coalesce(batch)
+            for (posted_ns, op, args), count in zip(events, counts):
+                if op == _SYNC:
+                    backend.flush()
+                    args[0].set()
+                    continue
+                try:
+                    getattr(backend, op)(*args)
+                except Exception as e:
+                    self.failures += 1
+                    log.error("[Input] %s failed on %s%s: %s", backend.name, op, args, e)
+                done_ns = perf_counter_ns()
+                latency = done_ns - posted_ns
+                tracer = Tracer.active
+                if tracer is not None:
+                    tracer.inject(op, posted_ns, done_ns)
+                self.injected += 1
+                self.handled += count
+                self._latency_total_ns += latency
+                if latency > self._latency_max_ns:
+                    self._latency_max_ns = latency
+            backend.flush()
+            self.batches += 1
+            self._busy_ns += perf_counter_ns() - started
+            if stop:
+                return
@@ -0,0 +1,312 @@
+# engine/MacroRecorder.py
+#
+# Record mode: the keyboard/mouse listeners feed timestamped events into an
+# array-backed buffer while recording; on stop the buffer is turned into a
+# Start → Keyboard/Mouse/Delay … → End chain (a session fragment that
+# NodeGraphQt's _deserialize can insert). Mouse paths are reduced to the
+# points that matter (Ramer-Douglas-Peucker) and idle gaps become Delay nodes.
+
+import threading
+from array import array
+
+from engine.Timing import perf_counter_ns
+
+MOVE        = 0
+KEY_DOWN    = 1
+KEY_UP      = 2
+BUTTON_DOWN = 3
+BUTTON_UP   = 4
+
+# Buttons a MouseNode can replay (pynput Button.name → MouseNode button)
+RECORDABLE_BUTTONS = {'left': 'Left', 'right': 'Right', 'middle': 'Middle'}
+
+# Button of a MouseNode 'Drag' (engine/ExecutionPlan.DRAG_BUTTON); moving while it is held records a drag
+DRAG_BUTTON = 'Left'
+
+NODE_NAMES = {
+    'Automation.KeyboardNode': 'Keyboard',
+    'Automation.MouseNode': 'Mouse',
+}
+
+NODE_SPACING_X = 200
+NODE_SPACING_Y = 150
+NODES_PER_ROW = 12
+
+
+class EventBuffer:
+    """
+    Timestamped input events as parallel arrays (≈ 15 bytes per event instead of
+    a tuple of Python objects); key/button names are interned into .names.
+    Appends come from the listener threads.
+    """
+
+    def __init__(self):
+        self.t = array('q')      # perf_counter_ns
+        self.kind = array('b')   # MOVE / KEY_DOWN / ...
+        self.x = array('i')
+        self.y = array('i')
+        self.code = array('h')   # index into .names, -1 for moves
+        self.names = []
+        self._codes = {}
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.t)
+
+    def append(self, t_ns, kind, x=0, y=0, name=None):
+        with self._lock:
+            code = -1
+            if name is not None:
+                code = self._codes.get(name)
+                if code is None:
+                    code = self._codes[name] = len(self.names)
+                    self.names.append(name)
+            self.t.append(t_ns)
+            self.kind.append(kind)
+            self.x.append(int(x))
+            self.y.append(int(y))
+            self.code.append(code)
+
+    def truncate(self, length):
+        with self._lock:
+            for column in (self.t, self.kind, self.x, self.y, self.code):
+                del column[length:]
+
+    def name(self, i):
+        code = self.code[i]
+        return self.names[code] if code >= 0 else None
+
+
+class MacroRecorder:
+    """
+    Listener-facing side of Record mode. The on_* methods are cheap no-ops
+    while not recording, so the listeners can call them unconditionally.
+    """
+
+    def __init__(self):
+        self.recording = False
+        self.buffer = EventBuffer()
+        self._held_keys = set()
+        self._last_pos = None
+
+    def start(self):
+        self.buffer = EventBuffer()
+        self._held_keys = set()
+        self._last_pos = None
+        self.recording = True
+
+    def stop(self, drop_last_click=True):
+        """
+        Stop recording and return the buffer. drop_last_click removes the
+        trailing click that pressed the Stop button (and the moves leading to it).
+        """
+        self.recording = False
+        buffer = self.buffer
+        if drop_last_click:
+            buffer.truncate(_trailing_click_start(buffer))
+        return buffer
+
+    def on_key_down(self, key_str):
+        if not self.recording:
+            return
+        # Held keys auto-repeat; only the first press is part of the macro
+        if key_str in self._held_keys:
+            return
+        self._held_keys.add(key_str)
+        self.buffer.append(perf_counter_ns(), KEY_DOWN, name=key_str)
+
+    def on_key_up(self, key_str):
+        if not self.recording:
+            return
+        self._held_keys.discard(key_str)
+        self.buffer.append(perf_counter_ns(), KEY_UP, name=key_str)
+
+    def on_move(self, x, y):
+        if not self.recording or (x, y) == self._last_pos:
+            return
+        self._last_pos = (x, y)
+        self.buffer.append(perf_counter_ns(), MOVE, x, y)
+
+    def on_click(self, x, y, button_name, pressed):
+        if not self.recording:
+            return
+        button = RECORDABLE_BUTTONS.get(button_name)
+        if button is None:
+            return
+        self.buffer.append(perf_counter_ns(), BUTTON_DOWN if pressed else BUTTON_UP, x, y, button)
+
+
+# Process-wide recorder fed by handlers/KeyboardListener.py and handlers/MouseListener.py
+recorder = MacroRecorder()
+
+
+def _trailing_click_start(buffer):
+    end = len(buffer)
+    kinds = buffer.kind
+    i = end - 1
+    while i >= 0 and kinds[i] == BUTTON_UP:
+        i -= 1
+    if i < 0 or kinds[i] != BUTTON_DOWN:
+        return end
+    i -= 1
+    while i >= 0 and kinds[i] == MOVE:
+        i -= 1
+    return i + 1
+
+
+def simplifyPolyline(xs, ys, tolerance):
+    """
+    Ramer-Douglas-Peucker: indices of the points to keep so that no dropped
+    point is further than tolerance (px) from the kept polyline. The first and
+    last point are always kept.
+    """
+    count = len(xs)
+    if count <= 2 or tolerance <= 0:
+        return list(range(count))
+
+    keep = bytearray(count)
+    keep[0] = keep[-1] = 1
+    tolerance_sq = tolerance * tolerance
+    stack = [(0, count - 1)]
+    while stack:
+        first, last = stack.pop()
+        if last - first < 2:
+            continue
+        ax, ay = xs[first], ys[first]
+        dx, dy = xs[last] - ax, ys[last] - ay
+        length_sq = dx * dx + dy * dy
+
+        worst, worst_i = -1.0, first
+        for i in range(first + 1, last):
+            px, py = xs[i] - ax, ys[i] - ay
+            if length_sq:
+                # Squared distance to the line through first/last
+                cross = px * dy - py * dx
+                dist_sq = cross * cross / length_sq
+            else:
+                dist_sq = px * px + py * py
+            if dist_sq > worst:
+                worst, worst_i = dist_sq, i
+
+        if worst > tolerance_sq:
+            keep[worst_i] = 1
+            stack.append((first, worst_i))
+            stack.append((worst_i, last))
+
+    return [i for i in range(count) if keep[i]]
+
+
+def _actions(buffer, move_tolerance_px):
+    """
+    Buffer → [(start_ns, end_ns, node_type, custom)], in order.
+    """
+    ts, kinds, xs, ys = buffer.t, buffer.kind, buffer.x, buffer.y
+    count = len(buffer)
+    actions = []
+    open_keys = {}      # key name → index in actions of its pending Press
+    open_buttons = {}   # button name → index in actions of its pending click
+
+    i = 0
+    while i < count:
+        kind = kinds[i]
+
+        if kind == MOVE:
+            j = i
+            while j < count and kinds[j] == MOVE:
+                j += 1
+            if open_buttons:
+                # Moves while a button is down: a click keeps only the press, a drag only its end point
+                i = j
+                continue
+            kept = simplifyPolyline(xs[i:j], ys[i:j], move_tolerance_px)
+            # A click moves the cursor itself; the point it happens at is not needed twice
+            if j < count and kinds[j] == BUTTON_DOWN and (xs[j], ys[j]) == (xs[j - 1], ys[j - 1]):
+                kept = kept[:-1]
+            for k in kept:
+                t = ts[i + k]
+                actions.append((t, t, 'Automation.MouseNode',
+                                {'x': str(xs[i + k]), 'y': str(ys[i + k]), 'button': 'Move', 'hold': '0'}))
+            i = j
+            continue
+
+        name = buffer.name(i)
+        t = ts[i]
+        if kind == KEY_DOWN:
+            open_keys[name] = len(actions)
+            actions.append((t, t, 'Automation.KeyboardNode', {'key': name, 'type': 'Press', 'duration': '0'}))
+        elif kind == KEY_UP:
+            pending = open_keys.pop(name, None)
+            if pending is not None and pending == len(actions) - 1:
+                # Nothing happened while the key was down: one Hold node
+                start = actions[pending][0]
+                actions[pending] = (start, t, 'Automation.KeyboardNode',
+                                    {'key': name, 'type': 'Hold', 'duration': str(_ms(t - start))})
+            else:
+                actions.append((t, t, 'Automation.KeyboardNode', {'key': name, 'type': 'Release', 'duration': '0'}))
+        elif kind == BUTTON_DOWN:
+            open_buttons[name] = len(actions)
+            actions.append((t, t, 'Automation.MouseNode',
+                            {'x': str(xs[i]), 'y': str(ys[i]), 'button': name, 'hold': '0'}))
+        elif kind == BUTTON_UP:
+            pending = open_buttons.pop(name, None)
+            if pending is not None:
+                start, _, node_type, custom = actions[pending]
+                if name == DRAG_BUTTON and (custom['x'], custom['y']) != (str(xs[i]), str(ys[i])):
+                    # Released somewhere else: jump to where it was pressed, then drag
+                    actions[pending] = (start, start, node_type, dict(custom, button='Move'))
+                    actions.append((start, t, node_type,
+                                    {'x': str(xs[i]), 'y': str(ys[i]), 'button': 'Drag', 'hold': '0',
+                                     'move_ms': str(_ms(t - start)), 'easing': 'Linear'}))
+                else:
+                    # The click node holds the button for as long as it was held
+                    actions[pending] = (start, t, node_type, dict(custom, hold=str(_ms(t - start))))
+        i += 1
+
+    return actions
+
+
+def _ms(ns):
+    return max(0, int(round(ns / 1_000_000)))
+
+
+def buildMacroSession(buffer, move_tolerance_px=3.0, min_delay_ms=20, origin=(0.0, 0.0),
+                      start_key='None', repeat='Single'):
+    """
+    Turn a recorded buffer into a session fragment (NodeGraphQt session format,
+    placeholder ids) holding one Start → … → End chain laid out in rows from origin.
+      • move_tolerance_px: mouse path points closer than this to the simplified path are dropped
+      • min_delay_ms:      idle gaps shorter than this are not given a Delay node;
+                           their time is carried into the next gap instead
+    """
+    chain = [('Automation.StartNode', 'Start', {'key': start_key})]
+
+    last_end = buffer.t[0] if len(buffer) else 0
+    for start_ns, end_ns, node_type, custom in _actions(buffer, move_tolerance_px):
+        gap_ns = max(0, start_ns - last_end)
+        if _ms(gap_ns) >= min_delay_ms:
+            chain.append(('Automation.DelayNode', 'Delay', {'delay': str(_ms(gap_ns))}))
+            gap_ns = 0
+        # A skipped gap stays owed: it is measured into the next one
+        last_end = max(last_end, end_ns - gap_ns)
+        chain.append((node_type, NODE_NAMES[node_type], custom))
+
+    chain.append(('Automation.EndNode', 'End', {'repeat': repeat}))
+
+    nodes = {}
+    connections = []
+    ox, oy = origin
+    previous = None
+    for index, (node_type, name, custom) in enumerate(chain):
+        node_id = f"rec{index}"
+        row, column = divmod(index, NODES_PER_ROW)
+        nodes[node_id] = {
+            'type_': node_type,
+            'name': name,
+            'pos': [ox + column * NODE_SPACING_X, oy + row * NODE_SPACING_Y],
+            'custom': custom,
+        }
+        if previous is not None:
+            connections.append({'out': [previous, 'out'], 'in': [node_id, 'in']})
+        previous = node_id
+
+    return {'nodes': nodes, 'connections': connections}
@@ -0,0 +1,249 @@
+# engine/PlanRunner.py
+
+from engine.ExecutionPlan import (
+    Instruction,
+    OP_START, OP_DELAY,
+    OP_KEY_PRESS, OP_KEY_RELEASE, OP_KEY_HOLD,
+    OP_MOUSE_MOVE, OP_MOUSE_CLICK, OP_MOUSE_GLIDE, OP_MOUSE_DRAG,
+    OP_CAPTURE, OP_FIND_IMAGE, OP_END, OP_NOOP,
+)
+from engine import InputActions as actions
+from engine.Trajectory import trajectory
+from engine import ScreenCapture
+from engine.ImageMatch import findInFrame
+from engine.Timing import PathTimer, perf_counter_ns
+from engine.RunToken import RunToken
+from engine import Tracer
+from shared.Log import getLogger
+
+log = getLogger('engine.PlanRunner')
+
+# Instructions that follow a trajectory (timer.follow) instead of a single wait
+MOTION_OPS = (OP_MOUSE_GLIDE, OP_MOUSE_DRAG)
+
+# Instructions whose endInstruction is CPU/IO work (capture, image search) rather than a quick post
+BLOCKING_OPS = (OP_CAPTURE, OP_FIND_IMAGE)
+
+
+def motionSchedule(instr):
+    """
+    (offsets_ns, emit) for a glide/drag: the points from where the cursor will
+    be once earlier moves are through (actions.motionOrigin) to (x, y), and
+    emit(i) posting the move to point i.
+    """
+    offsets_ns, xs, ys = trajectory(instr.motion, actions.motionOrigin(), (instr.x, instr.y))
+    move = actions.moveMouse
+    return offsets_ns, lambda i: move(xs[i], ys[i])
+
+
+def anchorInstruction(instr, token):
+    """
+    A Mouse instruction anchored to 'Found Image' with x/y turned into screen
+    coordinates (offset from the path's last match), or a no-op if nothing was found yet.
+    """
+    match = ScreenCapture.lastMatch(token)
+    if match is None:
+        log.warning("[MouseNode: %s] Nothing found on this path yet, skipped.", instr.node_id)
+        return Instruction(OP_NOOP, instr.node_id, label=instr.label, next=instr.next)
+    return instr._replace(x=match.x + instr.x, y=match.y + instr.y, anchored=False)
+
+
+def findImage(instr, token):
+    """
+    Search the frame captured earlier in this pass (or, if there is none or it
+    does not cover the search region, a fresh capture of the region) for the
+    node's template. Returns True if it was found.
+    """
+    template = instr.key
+    if template is None:
+        return False
+    roi = (instr.x, instr.y, instr.width, instr.height)
+    frame = ScreenCapture.frameFor(token, *roi)
+    if frame is None:
+        frame = ScreenCapture.captureRegion(token, instr.node_id, *roi, current=False)
+        if frame is None:
+            return False
+
+    match = findInFrame(frame, template, roi)
+    found = match is not None and match.confidence >= instr.threshold
+    if match is not None:
+        log.debug("[FindImageNode: %s] '%s' best at (%d, %d), confidence %.3f: %s", instr.node_id, instr.label,
+                  match.x, match.y, match.confidence, "found" if found else "not found")
+    ScreenCapture.setMatch(token, match if found else None)
+    return found
+
+
+def beginInstruction(instr, token):
+    """
+    Everything an instruction does before its wait (if any).
+    Returns the wait in ms, or None if the instruction does not wait.
+    """
+    op = instr.op
+
+    if op == OP_DELAY:
+        log.debug("[DelayNode: %s] Beginning %d ms delay.", instr.node_id, instr.ms)
+        return instr.ms
+
+    elif op == OP_KEY_PRESS:
+        log.debug("[KeyboardNode: %s] Key='%s', Press", instr.node_id, instr.label)
+        actions.pressKey(instr.key)
+        token.holding(instr.key, actions.releaseKey)
+
+    elif op == OP_KEY_RELEASE:
+        log.debug("[KeyboardNode: %s] Key='%s', Release", instr.node_id, instr.label)
+        actions.releaseKey(instr.key)
+        token.released(instr.key)
+
+    elif op == OP_KEY_HOLD:
+        log.debug("[KeyboardNode: %s] Key='%s', Duration=%dms", instr.node_id, instr.label, instr.ms)
+        actions.pressKey(instr.key)
+        token.holding(instr.key, actions.releaseKey)
+        return instr.ms if instr.ms > 0 else None
+
+    elif op == OP_MOUSE_MOVE:
+        log.debug("[MouseNode: %s] Moving to (%d, %d)", instr.node_id, instr.x, instr.y)
+        actions.moveMouse(instr.x, instr.y)
+
+    elif op == OP_MOUSE_GLIDE:
+        log.debug("[MouseNode: %s] Moving to (%d, %d) over %dms", instr.node_id, instr.x, instr.y, instr.ms)
+
+    elif op == OP_MOUSE_DRAG:
+        log.debug("[MouseNode: %s] Dragging to (%d, %d) over %dms", instr.node_id, instr.x, instr.y, instr.ms)
+        actions.pressButton(instr.key)
+        token.holding(instr.key, actions.releaseButton)
+
+    elif op == OP_MOUSE_CLICK:
+        log.debug("[MouseNode: %s] Clicking at (%d, %d) with '%s', hold %dms",
+                  instr.node_id, instr.x, instr.y, instr.label, instr.ms)
+        actions.moveMouse(instr.x, instr.y)
+        actions.pressButton(instr.key)
+        token.holding(instr.key, actions.releaseButton)
+        return instr.ms if instr.ms > 0 else None
+
+    elif op == OP_CAPTURE:
+        # A rate-limited capture first waits for its next frame slot; the grab happens in endInstruction
+        return ScreenCapture.captureWaitMs(token, instr.node_id, instr.ms)
+
+    elif op == OP_FIND_IMAGE:
+        log.debug("[FindImageNode: %s] Searching for '%s'", instr.node_id, instr.label)
+
+    elif op == OP_START:
+        log.debug("[StartNode: %s] Fired (Key: %s).", instr.node_id, instr.label)
+
+    elif op == OP_END:
+        log.debug("[EndNode: %s] Reached. Repeat: %s", instr.node_id, instr.label)
+
+    return None
+
+
+def endInstruction(instr, token, completed=True):
+    """
+    Everything an instruction does after its wait. completed is False if the wait was cut short.
+    Returns the index of the instruction to run next (-1 = the pass is over).
+    """
+    op = instr.op
+
+    if op == OP_DELAY:
+        if completed:
+            log.debug("[DelayNode: %s] Completed delay.", instr.node_id)
+        else:
+            log.debug("[DelayNode: %s] Stopped early.", instr.node_id)
+
+    elif op == OP_KEY_HOLD:
+        actions.releaseKey(instr.key)
+        token.released(instr.key)
+
+    elif op == OP_MOUSE_CLICK or op == OP_MOUSE_DRAG:
+        actions.releaseButton(instr.key)
+        token.released(instr.key)
+
+    elif op == OP_CAPTURE and completed:
+        frame = ScreenCapture.captureRegion(token, instr.node_id, instr.x, instr.y, instr.width, instr.height, instr.ms)
+        if frame is not None:
+            log.debug("[CaptureNode: %s] Captured %dx%d at (%d, %d) in %.2f ms", instr.node_id,
+                      frame.width, frame.height, frame.x, frame.y, frame.latency_ns / 1e6)
+
+    elif op == OP_FIND_IMAGE:
+        if not findImage(instr, token):
+            return instr.jump
+
+    return instr.next
+
+
+def executeInstruction(instr, token=None, timer=None):
+    """
+    Perform a single pre-resolved instruction. No graph access happens here.
+    Delays and holds wait on timer (a PathTimer) so they hit their deadlines,
+    and wake up immediately when token (a RunToken) is paused or stopped.
+    Returns the index of the instruction to run next (-1 = the pass is over).
+    """
+    if token is None:
+        token = RunToken()
+    if timer is None:
+        timer = PathTimer()
+    if instr.anchored:
+        instr = anchorInstruction(instr, token)
+
+    wait_ms = beginInstruction(instr, token)
+    completed = True
+    if instr.op in MOTION_OPS:
+        offsets_ns, emit = motionSchedule(instr)
+        completed = timer.follow(instr.node_id, offsets_ns, emit, token)
+    elif wait_ms is not None:
+        completed = timer.wait(instr.node_id, wait_ms, token, instr.op == OP_DELAY)
+    return endInstruction(instr, token, completed)
+
+
+def runPlan(plan, token, on_step=None, on_iteration=None, timer=None):
+    """
+    Execute an ExecutionPlan until it finishes or token is stopped.
+    Pause takes effect between any two instructions and inside waits.
+      • on_step(node_id):  called before each instruction runs
+      • on_iteration():    called after each full pass through the path
+      • timer:             PathTimer collecting per-node overshoot (created if None)
+    Any key/button still held when the path stops is released.
+    Returns the PathTimer so callers can report measured overshoot.
+    """
+    if timer is None:
+        timer = PathTimer()
+    timer.stats.path = plan.start_id
+    instructions = plan.instructions
+    count = len(instructions)
+
+    index = 0
+    iteration = 0
+    try:
+        while count and token.checkpoint():
+            instr = instructions[index]
+            if on_step is not None:
+                on_step(instr.node_id)
+            tracer = Tracer.active
+            if tracer is None:
+                next_index = executeInstruction(instr, token, timer)
+            else:
+                began_ns = perf_counter_ns()
+                next_index = executeInstruction(instr, token, timer)
+                tracer.node(plan.start_id, iteration, instr, began_ns, perf_counter_ns())
+            if token.stopped: break
+
+            if next_index > index:
+                index = next_index
+                continue
+            ScreenCapture.newPass(token)
+            if next_index >= 0:
+                # Backwards: a branch going back, or a path that loops on itself starting over
+                if plan.cyclic and next_index == plan.loop_to:
+                    iteration += 1
+                index = next_index
+                continue
+
+            iteration += 1
+            index = 0
+            if instr.op == OP_END and instr.label == 'Single':
+                token.stop()
+            if on_iteration is not None:
+                on_iteration()
+    finally:
+        token.release_all()
+
+    return timer
@@ -0,0 +1,133 @@
+# engine/PynputBackend.py
+#
+# Real keyboard/mouse input through pynput. Only imported when this backend
+# is selected, so machines without a display can run the engine with another one.
+
+from pynput import keyboard
+from pynput.keyboard import Controller as KeyboardController
+from pynput.mouse import Button, Controller as MouseController
+
+from engine.InputBackend import InputBackend
+
+_PYNPUT_SPECIAL_KEY_TO_STRING_MAP = {
+    # Function Keys (F1-F3 are global hotkeys for start/stop/show coords)
+    keyboard.Key.f4: 'F4', keyboard.Key.f5: 'F5', keyboard.Key.f6: 'F6',
+    keyboard.Key.f7: 'F7', keyboard.Key.f8: 'F8', keyboard.Key.f9: 'F9',
+    keyboard.Key.f10: 'F10', keyboard.Key.f11: 'F11', keyboard.Key.f12: 'F12',
+
+    # Standard Action/Navigation Keys
+    keyboard.Key.enter: 'Enter',
+    keyboard.Key.space: 'Space',
+    keyboard.Key.tab: 'Tab',
+    keyboard.Key.esc: 'Esc',
+    keyboard.Key.backspace: 'Backspace',
+    keyboard.Key.delete: 'Delete',
+    keyboard.Key.insert: 'Insert',
+    keyboard.Key.home: 'Home',
+    keyboard.Key.end: 'End',
+    keyboard.Key.page_up: 'PageUp',
+    keyboard.Key.page_down: 'PageDown',
+
+    # Arrow Keys
+    keyboard.Key.up: 'Up', keyboard.Key.down: 'Down',
+    keyboard.Key.left: 'Left', keyboard.Key.right: 'Right',
+
+    # Modifier Keys
+    keyboard.Key.shift: 'Shift', keyboard.Key.shift_l: 'Shift', keyboard.Key.shift_r: 'Shift',
+    keyboard.Key.ctrl: 'Ctrl', keyboard.Key.ctrl_l: 'Ctrl', keyboard.Key.ctrl_r: 'Ctrl',
+    keyboard.Key.alt: 'Alt', keyboard.Key.alt_l: 'Alt', keyboard.Key.alt_r: 'Alt',
+    # keyboard.Key.alt_gr: 'AltGr',
+    keyboard.Key.cmd: 'Meta', keyboard.Key.cmd_l: 'Meta', keyboard.Key.cmd_r: 'Meta', # Windows/Command key
+
+    keyboard.Key.caps_lock: 'CapsLock',
+    keyboard.Key.num_lock: 'NumLock',
+    keyboard.Key.scroll_lock: 'ScrollLock',
+
+    # Special Purpose
+    keyboard.Key.print_screen: 'PrintScreen',
+    keyboard.Key.pause: 'Pause',
+    keyboard.Key.menu: 'Menu',
+    # keyboard.Key.sys_req: 'SysReq',
+
+    # Multimedia keys
+    keyboard.Key.media_volume_up: 'VolumeUp',
+    keyboard.Key.media_volume_down: 'VolumeDown',
+    keyboard.Key.media_volume_mute: 'VolumeMute',
+    keyboard.Key.media_play_pause: 'MediaPlay',
+    #keyboard.Key.media_stop: 'MediaStop',
+    keyboard.Key.media_previous: 'MediaPrevious',
+    keyboard.Key.media_next: 'MediaNext',
+}
+
+_KEYPAD_KEY_CODES_TO_STRING_MAP = {
+    96: 'Num0',  # Numpad 0
+    97: 'Num1',  # Numpad 1
+    98: 'Num2',  # Numpad 2
+    99: 'Num3',  # Numpad 3
+    100: 'Num4', # Numpad 4
+    101: 'Num5', # Numpad 5
+    102: 'Num6', # Numpad 6
+    103: 'Num7', # Numpad 7
+    104: 'Num8', # Numpad 8
+    105: 'Num9', # Numpad 9
+    110: 'Num.', # Numpad .   # for some reason, this is not in the Pynput map
+}
+
+_STRING_TO_PYNPUT_KEY_MAP = {v: k for k, v in _PYNPUT_SPECIAL_KEY_TO_STRING_MAP.items()}
+_STRING_TO_KEYPAD_VK_MAP = {v: k for k, v in _KEYPAD_KEY_CODES_TO_STRING_MAP.items()}
+
+MOUSE_ACTION_MAP = {
+    "Left": Button.left,
+    "Right": Button.right,
+    "Middle": Button.middle,
+    "Center": Button.middle,
+    "Mouse4": Button.x1,  # Side button 1
+    "Mouse5": Button.x2,  # Side button 2
+}
+
+
+class PynputBackend(InputBackend):
+    name = 'pynput'
+
+    def __init__(self):
+        self.kb_controller = KeyboardController()
+        self.mouse = MouseController()
+        # Own connection for reads from the path threads; self.mouse belongs to the injector thread
+        self._cursor_reader = MouseController()
+
+    def resolve_key(self, key_str):
+        """
+        Translate a KeyboardNode key name into the object pynput expects.
+        Returns None when the key is not recognized.
+        """
+        if key_str is None or key_str == 'None':
+            return None
+        if key_str in _STRING_TO_PYNPUT_KEY_MAP:
+            return _STRING_TO_PYNPUT_KEY_MAP[key_str]
+        if key_str in _STRING_TO_KEYPAD_VK_MAP:
+            return keyboard.KeyCode.from_vk(_STRING_TO_KEYPAD_VK_MAP[key_str])
+        if len(key_str) == 1:
+            return key_str.lower()
+        return None
+
+    def resolve_button(self, button_str):
+        return MOUSE_ACTION_MAP.get(button_str)
+
+    def key_down(self, key):
+        self.kb_controller.press(key)
+
+    def key_up(self, key):
+        self.kb_controller.release(key)
+
+    def move(self, x, y):
+        self.mouse.position = (x, y)
+
+    def button_down(self, button):
+        self.mouse.press(button)
+
+    def button_up(self, button):
+        self.mouse.release(button)
+
+    def cursor_position(self):
+        x, y = self._cursor_reader.position
+        return int(x), int(y)
@@ -0,0 +1,115 @@
+# engine/RunToken.py
+
+import threading
+
+from shared.Log import getLogger
+
+log = getLogger('engine.RunToken')
+
+
+class RunToken:
+    """
+    Stop/pause state for one running path, shared by the GUI (or CLI) and the
+    loop worker. Built on a Condition so waits wake up the moment the state
+    changes instead of polling.
+
+    Also remembers which keys/buttons the path is currently holding, so they
+    can be released when the path is stopped.
+    """
+
+    def __init__(self):
+        self._cond = threading.Condition()
+        self._stopped = False
+        self._paused = False
+        self._held = {}  # key/button -> release function
+        self._listeners = []
+
+    # ──────────────────────────────────────────────────────────────────────────
+    # Control (any thread)
+    # ──────────────────────────────────────────────────────────────────────────
+    def stop(self):
+        with self._cond:
+            self._stopped = True
+            self._cond.notify_all()
+        self._changed()
+
+    def pause(self):
+        with self._cond:
+            self._paused = True
+            self._cond.notify_all()
+        self._changed()
+
+    def resume(self):
+        with self._cond:
+            self._paused = False
+            self._cond.notify_all()
+        self._changed()
+
+    def add_listener(self, callback):
+        """
+        callback() runs (on the calling thread) after every stop/pause/resume,
+        for waiters that cannot block on the Condition (e.g. coroutines).
+        """
+        self._listeners.append(callback)
+
+    def remove_listener(self, callback):
+        if callback in self._listeners:
+            self._listeners.remove(callback)
+
+    def _changed(self):
+        for callback in list(self._listeners):
+            callback()
+
+    @property
+    def stopped(self):
+        return self._stopped
+
+    @property
+    def paused(self):
+        return self._paused
+
+    # ──────────────────────────────────────────────────────────────────────────
+    # Worker side
+    # ──────────────────────────────────────────────────────────────────────────
+    def is_set(self):
+        """
+        True while the worker should not keep waiting (stopped or paused).
+        Same shape as threading.Event, so timing waits accept either.
+        """
+        return self._stopped or self._paused
+
+    def wait(self, timeout=None):
+        """
+        Block until timeout expires or the path is stopped/paused.
+        Returns is_set().
+        """
+        with self._cond:
+            if not (self._stopped or self._paused):
+                self._cond.wait(timeout)
+            return self._stopped or self._paused
+
+    def checkpoint(self):
+        """
+        Block while paused. Returns False if the path has been stopped.
+        """
+        with self._cond:
+            while self._paused and not self._stopped:
+                self._cond.wait()
+            return not self._stopped
+
+    def holding(self, key, release):
+        self._held[key] = release
+
+    def released(self, key):
+        self._held.pop(key, None)
+
+    def release_all(self):
+        """
+        Release every key/button this path pressed and never let go of.
+        """
+        held, self._held = self._held, {}
+        for key, release in held.items():
+            try:
+                release(key)
+            except Exception as e:
+                log.error("[RunToken] Failed to release %s: %s", key, e)
@@ -0,0 +1,699 @@
+# engine/ScreenCapture.py
+#
+# Screen capture for the Capture Screen node. A grabber copies a screen region
+# into a buffer allocated once per node - an X11 shared-memory image (XShm),
+# a Windows DIB section, or plain memory for the XGetImage fallback - and the
+# frame a path sees is a NumPy view over that buffer (height x width x 4,
+# BGRA). Capturing again overwrites the same memory: no allocation, no
+# conversion. Every path keeps its own buffers, so paths never see each
+# other's frames half-written.
+
+import ctypes
+import ctypes.util
+import os
+import sys
+import threading
+import weakref
+
+import shared.globals as g
+from engine.Timing import perf_counter_ns
+from shared.Log import getLogger
+
+try:
+    import numpy as np
+except ImportError:  # capture needs NumPy; the rest of the engine does not
+    np = None
+
+log = getLogger('engine.ScreenCapture')
+
+BACKENDS = ['auto', 'xshm', 'x11', 'gdi', 'null']
+
+# Screen size of the 'null' grabber when it is not given a screen image
+NULL_SCREEN_SIZE = (1920, 1080)
+
+
+class Frame:
+    """
+    One capture buffer, owned by a grabber.
+      • pixels:      (height, width, 4) uint8 BGRA view over the buffer
+      • x, y:        screen position of pixels[0, 0]
+      • captured_ns: perf_counter_ns when the last grab finished (0 = never grabbed)
+      • latency_ns:  how long the last grab took
+    """
+    __slots__ = ('x', 'y', 'width', 'height', 'pixels', 'captured_ns', 'latency_ns', '_resources')
+
+    def __init__(self, width, height, pixels, resources=None):
+        self.x = 0
+        self.y = 0
+        self.width = width
+        self.height = height
+        self.pixels = pixels
+        self.captured_ns = 0
+        self.latency_ns = 0
+        self._resources = resources
+
+    def __repr__(self):
+        return f"Frame({self.width}x{self.height} at ({self.x}, {self.y}))"
+
+
+def clipRegion(x, y, width, height, screen_size):
+    """
+    (x, y, width, height) of the region inside the screen; width/height 0 reach
+    to the screen edge. None if nothing of the region is on screen.
+    """
+    screen_w, screen_h = screen_size
+    x0, y0 = max(0, x), max(0, y)
+    x1 = screen_w if width <= 0 else min(screen_w, x + width)
+    y1 = screen_h if height <= 0 else min(screen_h, y + height)
+    if x1 <= x0 or y1 <= y0:
+        return None
+    return x0, y0, x1 - x0, y1 - y0
+
+
+class ScreenGrabber:
+    """
+    Where frames come from. allocate() creates a Frame of a fixed size once;
+    capture() fills it from the screen at (x, y) as often as needed. Grabs are
+    serialized per grabber (one display connection); latency is kept in stats().
+    """
+
+    name = 'base'
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.frames = 0
+        self.failures = 0
+        self._latency_total_ns = 0
+        self._latency_max_ns = 0
+
+    def screen_size(self):
+        raise NotImplementedError
+
+    def allocate(self, width, height):
+        raise NotImplementedError
+
+    def release(self, frame):
+        """
+        Free a frame's buffer; its pixels must not be used afterwards.
+        """
+
+    def _grab(self, frame, x, y):
+        raise NotImplementedError
+
+    def capture(self, frame, x, y):
+        """
+        Fill frame with the screen region at (x, y). Returns False if the grab failed.
+        """
+        with self._lock:
+            started = perf_counter_ns()
+            try:
+                ok = self._grab(frame, x, y)
+            except Exception as e:
+                log.error("[Capture] %s failed at (%d, %d) %dx%d: %s", self.name, x, y, frame.width, frame.height, e)
+                ok = False
+            done = perf_counter_ns()
+        if not ok:
+            self.failures += 1
+            return False
+        frame.x, frame.y = x, y
+        frame.captured_ns = done
+        frame.latency_ns = latency = done - started
+        self.frames += 1
+        self._latency_total_ns += latency
+        if latency > self._latency_max_ns:
+            self._latency_max_ns = latency
+        return True
+
+    def close(self):
+        pass
+
+    def stats(self):
+        frames = self.frames
+        return {
+            'backend': self.name,
+            'frames': frames,
+            'failures': self.failures,
+            'mean_latency_ms': self._latency_total_ns / frames / 1e6 if frames else 0.0,
+            'max_latency_ms': self._latency_max_ns / 1e6,
+        }
+
+    def report(self, tag="Capture"):
+        s = self.stats()
+        print(f"[{tag}] {s['backend']}: {s['frames']} frames ({s['failures']} failed), "
+              f"latency mean {s['mean_latency_ms']:.3f} ms, max {s['max_latency_ms']:.3f} ms")
+
+
+def _view(address, size, height, row_pixels, width):
+    # (height, width, 4) view over size bytes of foreign memory at address
+    raw = (ctypes.c_ubyte * size).from_address(address)
+    return np.ctypeslib.as_array(raw).reshape(height, row_pixels, 4)[:, :width]
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# 'null': no display (tests, benchmarks, CI)
+# ──────────────────────────────────────────────────────────────────────────────
+class NullGrabber(ScreenGrabber):
+    """
+    Grabs from .screen, a (height, width, 4) BGRA array standing in for the
+    display (black NULL_SCREEN_SIZE by default). Set .screen to feed test images.
+    """
+
+    name = 'null'
+
+    def __init__(self, screen=None):
+        super().__init__()
+        if screen is None:
+            width, height = NULL_SCREEN_SIZE
+            screen = np.zeros((height, width, 4), dtype=np.uint8)
+        self.screen = screen
+
+    def screen_size(self):
+        return self.screen.shape[1], self.screen.shape[0]
+
+    def allocate(self, width, height):
+        return Frame(width, height, np.zeros((height, width, 4), dtype=np.uint8))
+
+    def _grab(self, frame, x, y):
+        np.copyto(frame.pixels, self.screen[y:y + frame.height, x:x + frame.width])
+        return True
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# X11: XShm (shared memory, no copy) with an XGetImage fallback
+# ──────────────────────────────────────────────────────────────────────────────
+_ZPIXMAP = 2
+_ALL_PLANES = ctypes.c_ulong(-1).value
+_IPC_PRIVATE = 0
+_IPC_CREAT = 0o1000
+_IPC_RMID = 0
+
+
+class _XImage(ctypes.Structure):
+    _fields_ = [
+        ('width', ctypes.c_int),
+        ('height', ctypes.c_int),
+        ('xoffset', ctypes.c_int),
+        ('format', ctypes.c_int),
+        ('data', ctypes.c_void_p),
+        ('byte_order', ctypes.c_int),
+        ('bitmap_unit', ctypes.c_int),
+        ('bitmap_bit_order', ctypes.c_int),
+        ('bitmap_pad', ctypes.c_int),
+        ('depth', ctypes.c_int),
+        ('bytes_per_line', ctypes.c_int),
+        ('bits_per_pixel', ctypes.c_int),
+        ('red_mask', ctypes.c_ulong),
+        ('green_mask', ctypes.c_ulong),
+        ('blue_mask', ctypes.c_ulong),
+        # obdata and the function table follow; never touched from Python
+    ]
+
+
+class _XShmSegmentInfo(ctypes.Structure):
+    _fields_ = [
+        ('shmseg', ctypes.c_ulong),
+        ('shmid', ctypes.c_int),
+        ('shmaddr', ctypes.c_void_p),
+        ('readOnly', ctypes.c_int),
+    ]
+
+
+class _XErrorEvent(ctypes.Structure):
+    _fields_ = [
+        ('type', ctypes.c_int),
+        ('display', ctypes.c_void_p),
+        ('resourceid', ctypes.c_ulong),
+        ('serial', ctypes.c_ulong),
+        ('error_code', ctypes.c_ubyte),
+        ('request_code', ctypes.c_ubyte),
+        ('minor_code', ctypes.c_ubyte),
+    ]
+
+
+_XErrorHandler = ctypes.CFUNCTYPE(ctypes.c_int, ctypes.c_void_p, ctypes.POINTER(_XErrorEvent))
+
+# Xlib's default error handler exits the process; X errors are counted here instead
+_x_errors = []
+
+
+@_XErrorHandler
+def _on_x_error(display, event):
+    _x_errors.append(event.contents.error_code)
+    return 0
+
+
+def _load(name):
+    path = ctypes.util.find_library(name)
+    if path is None:
+        raise RuntimeError(f"lib{name} not found")
+    return ctypes.CDLL(path)
+
+
+def _prototype(lib, name, restype, *argtypes):
+    fn = getattr(lib, name)
+    fn.restype = restype
+    fn.argtypes = argtypes
+    return fn
+
+
+class X11Grabber(ScreenGrabber):
+    """
+    Root window of an X display ($DISPLAY - a real one or Xvfb). With
+    use_shm the server writes each frame straight into a shared-memory
+    segment the Frame views ('xshm'); without it, or when the server cannot
+    share memory with us (remote display), XGetImage is copied into the
+    Frame's buffer ('x11').
+    """
+
+    def __init__(self, use_shm=True, display_name=None):
+        super().__init__()
+        x11 = _load('X11')
+        vp, ulong, int_ = ctypes.c_void_p, ctypes.c_ulong, ctypes.c_int
+        image_p = ctypes.POINTER(_XImage)
+        self._XOpenDisplay = _prototype(x11, 'XOpenDisplay', vp, ctypes.c_char_p)
+        self._XCloseDisplay = _prototype(x11, 'XCloseDisplay', int_, vp)
+        self._XSync = _prototype(x11, 'XSync', int_, vp, int_)
+        self._XGetImage = _prototype(x11, 'XGetImage', image_p, vp, ulong, int_, int_, ctypes.c_uint,
+                                     ctypes.c_uint, ulong, int_)
+        self._XDestroyImage = _prototype(x11, 'XDestroyImage', int_, image_p)
+        _prototype(x11, 'XSetErrorHandler', vp, _XErrorHandler)(_on_x_error)
+
+        self._display = self._XOpenDisplay(display_name.encode() if display_name else None)
+        if not self._display:
+            raise RuntimeError(f"cannot open X display '{display_name or os.environ.get('DISPLAY', '')}'")
+        screen = _prototype(x11, 'XDefaultScreen', int_, vp)(self._display)
+        self._root = _prototype(x11, 'XRootWindow', ulong, vp, int_)(self._display, screen)
+        self._visual = _prototype(x11, 'XDefaultVisual', vp, vp, int_)(self._display, screen)
+        self._depth = _prototype(x11, 'XDefaultDepth', int_, vp, int_)(self._display, screen)
+        self._size = (_prototype(x11, 'XDisplayWidth', int_, vp, int_)(self._display, screen),
+                      _prototype(x11, 'XDisplayHeight', int_, vp, int_)(self._display, screen))
+
+        self.use_shm = False
+        if use_shm:
+            try:
+                xext = _load('Xext')
+                libc = ctypes.CDLL(ctypes.util.find_library('c'), use_errno=True)
+                self._XShmCreateImage = _prototype(xext, 'XShmCreateImage', image_p, vp, vp, ctypes.c_uint, int_,
+                                                   vp, ctypes.POINTER(_XShmSegmentInfo), ctypes.c_uint, ctypes.c_uint)
+                self._XShmAttach = _prototype(xext, 'XShmAttach', int_, vp, ctypes.POINTER(_XShmSegmentInfo))
+                self._XShmDetach = _prototype(xext, 'XShmDetach', int_, vp, ctypes.POINTER(_XShmSegmentInfo))
+                self._XShmGetImage = _prototype(xext, 'XShmGetImage', int_, vp, ulong, image_p, int_, int_, ulong)
+                self._shmget = _prototype(libc, 'shmget', int_, int_, ctypes.c_size_t, int_)
+                self._shmat = _prototype(libc, 'shmat', vp, int_, vp, int_)
+                self._shmdt = _prototype(libc, 'shmdt', int_, vp)
+                self._shmctl = _prototype(libc, 'shmctl', int_, int_, int_, vp)
+                self.use_shm = bool(_prototype(xext, 'XShmQueryExtension', int_, vp)(self._display))
+            except (RuntimeError, AttributeError) as e:
+                log.warning("[Capture] XShm unavailable (%s), using XGetImage.", e)
+        self.name = 'xshm' if self.use_shm else 'x11'
+
+    def screen_size(self):
+        return self._size
+
+    def allocate(self, width, height):
+        with self._lock:
+            if self.use_shm:
+                frame = self._allocate_shm(width, height)
+                if frame is not None:
+                    return frame
+                log.warning("[Capture] X server cannot attach shared memory, using XGetImage.")
+                self.use_shm = False
+                self.name = 'x11'
+        return Frame(width, height, np.zeros((height, width, 4), dtype=np.uint8))
+
+    def _allocate_shm(self, width, height):
+        info = _XShmSegmentInfo()
+        image = self._XShmCreateImage(self._display, self._visual, self._depth, _ZPIXMAP,
+                                      None, ctypes.byref(info), width, height)
+        if not image:
+            return None
+        if image.contents.bits_per_pixel != 32:
+            self._XDestroyImage(image)
+            raise RuntimeError(f"unsupported X visual: {image.contents.bits_per_pixel} bits per pixel")
+        stride = image.contents.bytes_per_line
+        size = stride * height
+
+        info.shmid = self._shmget(_IPC_PRIVATE, size, _IPC_CREAT | 0o600)
+        if info.shmid < 0:
+            self._XDestroyImage(image)
+            return None
+        address = self._shmat(info.shmid, None, 0)
+        if address in (None, ctypes.c_void_p(-1).value):
+            self._shmctl(info.shmid, _IPC_RMID, None)
+            self._XDestroyImage(image)
+            return None
+        info.shmaddr = address
+        info.readOnly = 0
+        image.contents.data = address
+
+        del _x_errors[:]
+        attached = self._XShmAttach(self._display, ctypes.byref(info))
+        self._XSync(self._display, 0)
+        # Marked for removal now: the segment goes away once both sides detach (or exit)
+        self._shmctl(info.shmid, _IPC_RMID, None)
+        if not attached or _x_errors:
+            image.contents.data = None
+            self._XDestroyImage(image)
+            self._shmdt(address)
+            return None
+
+        pixels = _view(address, size, height, stride // 4, width)
+        return Frame(width, height, pixels, resources=(image, info))
+
+    def release(self, frame):
+        if frame._resources is None:
+            return
+        image, info = frame._resources
+        frame._resources = None
+        frame.pixels = None
+        with self._lock:
+            if not self._display:
+                return
+            self._XShmDetach(self._display, ctypes.byref(info))
+            self._XSync(self._display, 0)
+            image.contents.data = None   # the segment is not Xlib's to free
+            self._XDestroyImage(image)
+            self._shmdt(info.shmaddr)
+
+    def _grab(self, frame, x, y):
+        if frame._resources is not None:
+            image, _ = frame._resources
+            return bool(self._XShmGetImage(self._display, self._root, image, x, y, _ALL_PLANES))
+
+        image = self._XGetImage(self._display, self._root, x, y, frame.width, frame.height, _ALL_PLANES, _ZPIXMAP)
+        if not image:
+            return False
+        try:
+            contents = image.contents
+            if contents.bits_per_pixel != 32:
+                raise RuntimeError(f"unsupported X visual: {contents.bits_per_pixel} bits per pixel")
+            stride = contents.bytes_per_line
+            np.copyto(frame.pixels, _view(contents.data, stride * frame.height, frame.height, stride // 4, frame.width))
+        finally:
+            self._XDestroyImage(image)
+        return True
+
+    def close(self):
+        with self._lock:
+            if self._display:
+                self._XCloseDisplay(self._display)
+                self._display = None
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Windows: BitBlt into a DIB section (the Frame views the DIB's pixels)
+# ──────────────────────────────────────────────────────────────────────────────
+class _BITMAPINFOHEADER(ctypes.Structure):
+    _fields_ = [
+        ('biSize', ctypes.c_uint32),
+        ('biWidth', ctypes.c_int32),
+        ('biHeight', ctypes.c_int32),
+        ('biPlanes', ctypes.c_uint16),
+        ('biBitCount', ctypes.c_uint16),
+        ('biCompression', ctypes.c_uint32),
+        ('biSizeImage', ctypes.c_uint32),
+        ('biXPelsPerMeter', ctypes.c_int32),
+        ('biYPelsPerMeter', ctypes.c_int32),
+        ('biClrUsed', ctypes.c_uint32),
+        ('biClrImportant', ctypes.c_uint32),
+    ]
+
+
+_SRCCOPY = 0x00CC0020
+_CAPTUREBLT = 0x40000000
+_SM_CXSCREEN = 0
+_SM_CYSCREEN = 1
+
+
+class GdiGrabber(ScreenGrabber):
+    """
+    Primary screen via GDI. Each Frame is a top-down 32-bit DIB section
+    selected into its own memory DC; BitBlt writes the region into it.
+    """
+
+    name = 'gdi'
+
+    def __init__(self):
+        super().__init__()
+        if sys.platform != 'win32':
+            raise RuntimeError("GDI capture is only available on Windows")
+        self._user32 = ctypes.windll.user32
+        self._gdi32 = ctypes.windll.gdi32
+        vp = ctypes.c_void_p
+        for name, restype, argtypes in (
+            ('CreateCompatibleDC', vp, (vp,)),
+            ('CreateDIBSection', vp, (vp, ctypes.POINTER(_BITMAPINFOHEADER), ctypes.c_uint,
+                                      ctypes.POINTER(vp), vp, ctypes.c_uint32)),
+            ('SelectObject', vp, (vp, vp)),
+            ('BitBlt', ctypes.c_int, (vp, ctypes.c_int, ctypes.c_int, ctypes.c_int, ctypes.c_int,
+                                      vp, ctypes.c_int, ctypes.c_int, ctypes.c_uint32)),
+            ('DeleteObject', ctypes.c_int, (vp,)),
+            ('DeleteDC', ctypes.c_int, (vp,)),
+            ('GdiFlush', ctypes.c_int, ()),
+        ):
+            _prototype(self._gdi32, name, restype, *argtypes)
+        _prototype(self._user32, 'GetDC', vp, vp)
+        _prototype(self._user32, 'ReleaseDC', ctypes.c_int, vp, vp)
+        self._screen_dc = self._user32.GetDC(None)
+        if not self._screen_dc:
+            raise RuntimeError("cannot get the screen device context")
+
+    def screen_size(self):
+        return self._user32.GetSystemMetrics(_SM_CXSCREEN), self._user32.GetSystemMetrics(_SM_CYSCREEN)
+
+    def allocate(self, width, height):
+        header = _BITMAPINFOHEADER()
+        header.biSize = ctypes.sizeof(_BITMAPINFOHEADER)
+        header.biWidth = width
+        header.biHeight = -height   # negative: top-down rows, like every other frame
+        header.biPlanes = 1
+        header.biBitCount = 32
+        bits = ctypes.c_void_p()
+        with self._lock:
+            memory_dc = self._gdi32.CreateCompatibleDC(self._screen_dc)
+            bitmap = self._gdi32.CreateDIBSection(memory_dc, ctypes.byref(header), 0, ctypes.byref(bits), None, 0)
+            if not bitmap:
+                self._gdi32.DeleteDC(memory_dc)
+                raise RuntimeError(f"cannot create a {width}x{height} capture bitmap")
+            previous = self._gdi32.SelectObject(memory_dc, bitmap)
+        pixels = _view(bits.value, width * height * 4, height, width, width)
+        return Frame(width, height, pixels, resources=(memory_dc, bitmap, previous))
+
+    def release(self, frame):
+        if frame._resources is None:
+            return
+        memory_dc, bitmap, previous = frame._resources
+        frame._resources = None
+        frame.pixels = None
+        with self._lock:
+            self._gdi32.SelectObject(memory_dc, previous)
+            self._gdi32.DeleteObject(bitmap)
+            self._gdi32.DeleteDC(memory_dc)
+
+    def _grab(self, frame, x, y):
+        memory_dc = frame._resources[0]
+        ok = self._gdi32.BitBlt(memory_dc, 0, 0, frame.width, frame.height,
+                                self._screen_dc, x, y, _SRCCOPY | _CAPTUREBLT)
+        self._gdi32.GdiFlush()
+        return bool(ok)
+
+    def close(self):
+        with self._lock:
+            if self._screen_dc:
+                self._user32.ReleaseDC(None, self._screen_dc)
+                self._screen_dc = None
+
+
+def createGrabber(name='auto'):
+    """
+    'xshm' / 'x11' (X display, e.g. Xvfb), 'gdi' (Windows), 'null' (no display) or
+    'auto': the native one for this platform, falling back to 'null' without a display.
+    """
+    if name not in BACKENDS:
+        raise ValueError(f"unknown capture backend '{name}' (choose from {', '.join(BACKENDS)})")
+    if np is None:
+        raise RuntimeError("screen capture needs NumPy")
+    if name == 'null':
+        return NullGrabber()
+    if name == 'gdi':
+        return GdiGrabber()
+    if name in ('xshm', 'x11'):
+        return X11Grabber(use_shm=(name == 'xshm'))
+
+    try:
+        if sys.platform == 'win32':
+            return GdiGrabber()
+        return X11Grabber()
+    except RuntimeError as e:
+        log.warning("[Capture] No screen to capture (%s); frames will be black.", e)
+        return NullGrabber()
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Process-wide grabber and per-path frames
+# ──────────────────────────────────────────────────────────────────────────────
+_lock = threading.Lock()
+_grabber = None
+
+# RunToken → _PathFrames; entries (and their buffers) go when the path's token does
+_paths = weakref.WeakKeyDictionary()
+
+
+def setGrabber(grabber):
+    """
+    Capture from grabber from now on (frames already allocated stay with the previous one).
+    """
+    global _grabber
+    with _lock:
+        _grabber = grabber
+    return grabber
+
+
+def getGrabber():
+    global _grabber
+    if _grabber is None:
+        with _lock:
+            if _grabber is None:
+                _grabber = createGrabber(g.capture_backend)
+    return _grabber
+
+
+def activeGrabber():
+    """
+    The grabber if anything has captured yet, else None (nothing to report).
+    """
+    return _grabber
+
+
+class _PathFrames:
+    """
+    Capture state of one running path: a Frame per Capture node (sized to its
+    region), when each node may capture next (rate limit), the latest frame
+    and the last thing a Find Image node found in it.
+    """
+    __slots__ = ('frames', 'due_ns', 'last', 'match')
+
+    def __init__(self):
+        self.frames = {}
+        self.due_ns = {}
+        self.last = None
+        self.match = None
+
+
+def _releaseFrames(frames):
+    for grabber, frame in frames.values():
+        grabber.release(frame)
+
+
+def _pathFrames(token):
+    state = _paths.get(token)
+    if state is None:
+        with _lock:
+            state = _paths.get(token)
+            if state is None:
+                state = _paths[token] = _PathFrames()
+                weakref.finalize(token, _releaseFrames, state.frames)
+    return state
+
+
+def captureWaitMs(token, node_id, period_ms):
+    """
+    How long a Capture node limited to one frame per period_ms must wait before
+    it may capture again on this path (None if it may capture now).
+    """
+    if period_ms <= 0:
+        return None
+    due_ns = _pathFrames(token).due_ns.get(node_id)
+    if due_ns is None:
+        return None
+    remaining_ms = round((due_ns - perf_counter_ns()) / 1e6)
+    return remaining_ms if remaining_ms > 0 else None
+
+
+def captureRegion(token, node_id, x, y, width, height, period_ms=0, current=True):
+    """
+    Grab the region into this path's buffer for node_id and (if current) make
+    it the path's frame for the rest of the pass. width/height 0 reach to the
+    screen edge. Returns the Frame, or None if the region is off screen or
+    the grab failed.
+    """
+    grabber = getGrabber()
+    region = clipRegion(x, y, width, height, grabber.screen_size())
+    if region is None:
+        log.error("[CaptureNode: %s] Region (%d, %d) %dx%d is off screen.", node_id, x, y, width, height)
+        return None
+    x, y, width, height = region
+
+    state = _pathFrames(token)
+    entry = state.frames.get(node_id)
+    if entry is None or entry[0] is not grabber or (entry[1].width, entry[1].height) != (width, height):
+        if entry is not None:
+            entry[0].release(entry[1])
+        entry = state.frames[node_id] = (grabber, grabber.allocate(width, height))
+    frame = entry[1]
+
+    if not grabber.capture(frame, x, y):
+        return None
+    if period_ms > 0:
+        # Next slot on the period grid; a path that fell behind starts a new grid instead of bursting
+        period_ns = period_ms * 1_000_000
+        due_ns = state.due_ns.get(node_id, frame.captured_ns) + period_ns
+        if due_ns <= frame.captured_ns:
+            due_ns = frame.captured_ns + period_ns
+        state.due_ns[node_id] = due_ns
+    if current:
+        state.last = frame
+    return frame
+
+
+def lastFrame(token):
+    """
+    The most recent frame captured on this path in its current pass (None if
+    nothing was captured since the pass began).
+    """
+    state = _paths.get(token)
+    return state.last if state is not None else None
+
+
+def frameFor(token, x, y, width, height):
+    """
+    The path's current-pass frame if it covers the region (clipped to the
+    screen; width/height 0 = to the screen edge), else None.
+    """
+    frame = lastFrame(token)
+    if frame is None:
+        return None
+    region = clipRegion(x, y, width, height, getGrabber().screen_size())
+    if region is None:
+        return None
+    x, y, width, height = region
+    if (frame.x <= x and frame.y <= y
+            and x + width <= frame.x + frame.width and y + height <= frame.y + frame.height):
+        return frame
+    return None
+
+
+def newPass(token):
+    """
+    The path starts over (a new pass, or a branch jumping back): frames
+    captured so far are stale, so the next Find Image captures again unless
+    a Capture node runs first.
+    """
+    state = _paths.get(token)
+    if state is not None:
+        state.last = None
+
+
+def setMatch(token, match):
+    """
+    Remember what a Find Image node found on this path (None: it found nothing).
+    """
+    _pathFrames(token).match = match
+
+
+def lastMatch(token):
+    """
+    The path's last Find Image match (engine/ImageMatch.Match), or None.
+    """
+    state = _paths.get(token)
+    return state.match if state is not None else None
@@ -0,0 +1,62 @@
+# engine/SessionGraph.py
+
+from engine.ExecutionPlan import compilePath, BRANCH_PORT_NAMES
+from shared.GraphJournal import loadGraphWithJournal
+
+START_NODE_TYPE = 'Automation.StartNode'
+
+
+class SessionGraph:
+    """
+    Read-only view over a session dictionary as written by saveGraphsHandler
+    (NodeGraphQt serialize_session format). Needs neither PySide6 nor NodeGraphQt.
+    """
+
+    def __init__(self, session):
+        self.nodes = session.get('nodes', {}) or {}
+
+        # Only the first connection leaving a node matters to the engine,
+        # the same way the GUI follows connected_ports()[0]; branch ports
+        # (e.g. Find Image 'not found') are kept apart from the main output.
+        self._next_of = {}
+        self._branch_of = {}
+        for conn in session.get('connections', []) or []:
+            out_id, out_port = conn['out'][0], conn['out'][1]
+            if out_port in BRANCH_PORT_NAMES:
+                self._branch_of.setdefault((out_id, out_port), conn['in'][0])
+            elif out_id not in self._next_of:
+                self._next_of[out_id] = conn['in'][0]
+
+    def get_node(self, node_id):
+        node = self.nodes.get(node_id)
+        if node is None:
+            return None
+        return node.get('type_'), node.get('custom', {}) or {}
+
+    def get_next(self, node_id, port=None):
+        if port is None:
+            return self._next_of.get(node_id)
+        return self._branch_of.get((node_id, port))
+
+    def start_ids(self):
+        return [node_id for node_id, node in self.nodes.items() if node.get('type_') == START_NODE_TYPE]
+
+    def find_starts(self, selector):
+        """
+        Start nodes matching selector, which is either a node id or a hotkey name.
+        """
+        if selector in self.nodes and self.nodes[selector].get('type_') == START_NODE_TYPE:
+            return [selector]
+        return [
+            node_id for node_id in self.start_ids()
+            if (self.nodes[node_id].get('custom') or {}).get('key') == selector
+        ]
+
+    def compile(self, start_id):
+        return compilePath(start_id, self.get_node, self.get_next)
+
+
+def loadSession(file_path):
+    # Snapshot plus any journaled edits, i.e. exactly what the designer last had
+    session, _, _ = loadGraphWithJournal(file_path)
+    return SessionGraph(session)
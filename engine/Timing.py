@@ -0,0 +1,177 @@
+# engine/Timing.py
+
+import time
+from bisect import bisect_right
+
+import shared.globals as g
+from shared.Log import getLogger
+from engine import Tracer
+
+log = getLogger('engine.Timing')
+
+perf_counter_ns = time.perf_counter_ns
+
+
+def spinWindowNs():
+    """
+    Length of the busy-wait tail in nanoseconds (shared/globals.timing_spin_window_ms).
+    """
+    return int(g.timing_spin_window_ms * 1_000_000)
+
+
+def waitUntil(deadline_ns, token=None, spin_ns=None):
+    """
+    Wait until perf_counter_ns() reaches deadline_ns.
+    Sleeps through the bulk of the wait on token.wait (a RunToken or
+    threading.Event, so a stop wakes it immediately) and busy-waits only for
+    the last spin_ns to hit the deadline precisely.
+    Returns False if the token was set before the deadline.
+    """
+    if spin_ns is None:
+        spin_ns = spinWindowNs()
+
+    remaining = deadline_ns - perf_counter_ns()
+    if remaining > spin_ns:
+        timeout = (remaining - spin_ns) / 1e9
+        if token is not None:
+            if token.wait(timeout):
+                return False
+        else:
+            time.sleep(timeout)
+
+    while perf_counter_ns() < deadline_ns:
+        if token is not None and token.is_set():
+            return False
+        time.sleep(0)  # yield the GIL while spinning
+
+    return not (token is not None and token.is_set())
+
+
+class TimingStats:
+    """
+    Measured overshoot (actual wake-up minus deadline) per node, in nanoseconds.
+    One instance per running path, so no locking is needed. With .path set
+    (the Start node id), overshoots also go to the active Tracer.
+    """
+
+    def __init__(self):
+        self._by_node = {}  # node_id -> [count, total_ns, max_ns]
+        self.path = None
+
+    def record(self, node_id, overshoot_ns):
+        tracer = Tracer.active
+        if tracer is not None and self.path is not None:
+            tracer.overshoot(self.path, node_id, overshoot_ns)
+        entry = self._by_node.get(node_id)
+        if entry is None:
+            self._by_node[node_id] = [1, overshoot_ns, overshoot_ns]
+            return
+        entry[0] += 1
+        entry[1] += overshoot_ns
+        if overshoot_ns > entry[2]:
+            entry[2] = overshoot_ns
+
+    def summary(self):
+        """
+        {node_id: {'count', 'mean_ms', 'max_ms'}} for every node that waited.
+        """
+        return {
+            node_id: {
+                'count': count,
+                'mean_ms': total / count / 1e6,
+                'max_ms': max_ns / 1e6,
+            }
+            for node_id, (count, total, max_ns) in self._by_node.items()
+        }
+
+    def report(self, tag):
+        for node_id, s in self.summary().items():
+            log.info("[%s] Node %s: %d waits, overshoot mean %.3f ms, max %.3f ms",
+                     tag, node_id, s['count'], s['mean_ms'], s['max_ms'])
+
+
+# A path further behind its schedule than this (a pause, a slow image search)
+# starts a new schedule instead of rushing through its next Delays
+MAX_CATCH_UP_NS = 50_000_000
+
+
+def waitDeadlines(due_ns, duration_ns, scheduled):
+    """
+    (deadline_ns, due_ns) of a wait of duration_ns, given where the path's
+    schedule stands (due_ns: when its previous wait was due to end, None at
+    the start). A scheduled wait (a Delay) ends duration_ns after that, so
+    oversleeping and the time spent between waits are made up by the next
+    Delays. Other waits (holds, capture slots) last duration_ns from now
+    and only move the schedule on.
+    """
+    now = perf_counter_ns()
+    if due_ns is None or now - due_ns > MAX_CATCH_UP_NS:
+        due_ns = now
+    due_ns += duration_ns
+    return (max(due_ns, now) if scheduled else now + duration_ns), due_ns
+
+
+class PathTimer:
+    """
+    Deadline-based waits for one running path.
+    Delays keep to the path's schedule (see waitDeadlines), so over a long
+    loop neither oversleeping nor node dispatch accumulates into drift;
+    key/button holds always last their full length.
+    """
+
+    def __init__(self):
+        self.stats = TimingStats()
+        self._due_ns = None
+
+    def wait(self, node_id, ms, token=None, scheduled=False):
+        """
+        Wait ms milliseconds (on the path's schedule if scheduled). A pause
+        freezes the remaining time until resume; returns False if the token
+        is stopped first.
+        """
+        deadline_ns, due_ns = waitDeadlines(self._due_ns, ms * 1_000_000, scheduled)
+
+        while not waitUntil(deadline_ns, token):
+            paused_at = perf_counter_ns()
+            if not token.checkpoint():
+                self._due_ns = None
+                return False
+            paused_ns = perf_counter_ns() - paused_at
+            deadline_ns += paused_ns
+            due_ns += paused_ns
+
+        overshoot_ns = perf_counter_ns() - deadline_ns
+        self._due_ns = due_ns
+        self.stats.record(node_id, overshoot_ns)
+        return True
+
+    def follow(self, node_id, offsets_ns, emit, token=None):
+        """
+        Call emit(i) offsets_ns[i] after now, for every step of a schedule (e.g. a
+        mouse trajectory). Steps already overdue when the path wakes up are skipped
+        for the newest due one, so a late wake-up never slows the motion down.
+        A pause freezes the schedule; returns False if the token is stopped first.
+        """
+        origin = perf_counter_ns()
+        count = len(offsets_ns)
+        _, due_ns = waitDeadlines(self._due_ns, offsets_ns[-1] if count else 0, False)
+        i = 0
+        while i < count:
+            deadline_ns = origin + offsets_ns[i]
+            if not waitUntil(deadline_ns, token):
+                paused_at = perf_counter_ns()
+                if not token.checkpoint():
+                    self._due_ns = None
+                    return False
+                paused_ns = perf_counter_ns() - paused_at
+                origin += paused_ns
+                due_ns += paused_ns
+                continue
+
+            now = perf_counter_ns()
+            self.stats.record(node_id, now - deadline_ns)
+            i = bisect_right(offsets_ns, now - origin, i) - 1
+            emit(i)
+            i += 1
+        self._due_ns = due_ns
+        return True
@@ -0,0 +1,176 @@
+# engine/Tracer.py
+#
+# Opt-in execution tracing. While a Tracer is active, the runners record a
+# span for every node a path executes (tagged with the Start path and the
+# iteration), every delay overshoot (deadline → actual wake-up) and every
+# input hand-off of the injector (post → backend done). Records go into
+# preallocated arrays, so tracing adds no allocations to a running path; the
+# result exports as Chrome trace-event JSON for chrome://tracing / Perfetto.
+
+import itertools
+import json
+import os
+import threading
+from array import array
+from time import perf_counter_ns
+
+# Only the standard library here: engine/Timing.py and engine/InputInjector.py import this module
+
+KIND_NODE      = 0
+KIND_OVERSHOOT = 1
+KIND_INJECT    = 2
+
+DEFAULT_CAPACITY = 1 << 20
+INJECTOR_TRACK = 'InputInjector'
+
+
+class Tracer:
+    """
+    Fixed-capacity trace buffer shared by every path. Slots are claimed with
+    an atomic counter, so paths on different threads never lock; records past
+    capacity are counted in .dropped instead of growing the buffer.
+    Columns per record: kind, op, track (path), name (node id / input op),
+    iteration, begin_ns, end_ns - strings are interned into .strings.
+    """
+
+    def __init__(self, capacity=DEFAULT_CAPACITY):
+        self.capacity = capacity
+        self.kind = array('b', bytes(capacity))
+        self.op = array('b', bytes(capacity))
+        self.track = array('i', bytes(4 * capacity))
+        self.name = array('i', bytes(4 * capacity))
+        self.iteration = array('i', bytes(4 * capacity))
+        self.begin = array('q', bytes(8 * capacity))
+        self.end = array('q', bytes(8 * capacity))
+        self.strings = []
+        self._string_ids = {}
+        self._intern_lock = threading.Lock()
+        self._next = itertools.count()
+        self._count = None   # records claimed, fixed by finish()
+        self.started_ns = perf_counter_ns()
+        self.stopped_ns = None
+
+    def finish(self):
+        if self._count is None:
+            self._count = next(self._next)
+            self.stopped_ns = perf_counter_ns()
+        return self
+
+    def __len__(self):
+        return min(self.finish()._count, self.capacity)
+
+    @property
+    def dropped(self):
+        return max(0, self.finish()._count - self.capacity)
+
+    def intern(self, text):
+        index = self._string_ids.get(text)
+        if index is None:
+            with self._intern_lock:
+                index = self._string_ids.get(text)
+                if index is None:
+                    index = len(self.strings)
+                    self.strings.append(text)
+                    self._string_ids[text] = index
+        return index
+
+    def _record(self, kind, op, track, name, iteration, begin_ns, end_ns):
+        i = next(self._next)
+        if i >= self.capacity:
+            return
+        self.kind[i] = kind
+        self.op[i] = op
+        self.track[i] = self.intern(track)
+        self.name[i] = self.intern(name)
+        self.iteration[i] = iteration
+        self.begin[i] = begin_ns
+        self.end[i] = end_ns
+
+    def node(self, path, iteration, instr, begin_ns, end_ns):
+        self._record(KIND_NODE, instr.op, path, instr.node_id, iteration, begin_ns, end_ns)
+
+    def overshoot(self, path, node_id, overshoot_ns):
+        end_ns = perf_counter_ns()
+        self._record(KIND_OVERSHOOT, -1, path, node_id, -1, end_ns - overshoot_ns, end_ns)
+
+    def inject(self, op_name, posted_ns, done_ns):
+        self._record(KIND_INJECT, -1, INJECTOR_TRACK, op_name, -1, posted_ns, done_ns)
+
+    # ──────────────────────────────────────────────────────────────────────────
+    # Export
+    # ──────────────────────────────────────────────────────────────────────────
+    def toChromeTrace(self):
+        """
+        Chrome trace-event format: one process, one track (tid) per Start path
+        plus one for the input injector; times in µs from the start of tracing.
+        """
+        from engine.ExecutionPlan import OP_NAMES
+        pid = os.getpid()
+        origin = self.started_ns
+        strings = self.strings
+        tids = {}
+        events = []
+
+        for i in range(len(self)):
+            track = strings[self.track[i]]
+            tid = tids.setdefault(track, len(tids) + 1)
+            name = strings[self.name[i]]
+            kind = self.kind[i]
+            begin = self.begin[i]
+            event = {
+                'pid': pid,
+                'tid': tid,
+                'ph': 'X',
+                'ts': (begin - origin) / 1000,
+                'dur': max(0, self.end[i] - begin) / 1000,
+            }
+            if kind == KIND_NODE:
+                event['name'] = OP_NAMES.get(self.op[i], str(self.op[i]))
+                event['cat'] = 'node'
+                event['args'] = {'node': name, 'path': track, 'iteration': self.iteration[i]}
+            elif kind == KIND_OVERSHOOT:
+                event['name'] = 'overshoot'
+                event['cat'] = 'timing'
+                event['args'] = {'node': name, 'path': track}
+            else:
+                event['name'] = name
+                event['cat'] = 'input'
+            events.append(event)
+
+        events.sort(key=lambda e: e['ts'])
+        metadata = [{'pid': pid, 'tid': 0, 'ph': 'M', 'name': 'process_name', 'args': {'name': 'BAM'}}]
+        for track, tid in tids.items():
+            label = track if track == INJECTOR_TRACK else f"Start {track}"
+            metadata.append({'pid': pid, 'tid': tid, 'ph': 'M', 'name': 'thread_name', 'args': {'name': label}})
+
+        return {
+            'traceEvents': metadata + events,
+            'displayTimeUnit': 'ms',
+            'otherData': {'records': len(self), 'dropped': self.dropped},
+        }
+
+    def export(self, file_path):
+        with open(file_path, 'w', encoding='utf-8') as f:
+            json.dump(self.toChromeTrace(), f)
+        return file_path
+
+
+# The tracer the runners record into, or None (tracing off: one global read per node)
+active = None
+
+
+def startTracing(capacity=DEFAULT_CAPACITY):
+    global active
+    active = Tracer(capacity)
+    return active
+
+
+def stopTracing():
+    """
+    Stop recording; returns the finished Tracer (None if tracing was off).
+    """
+    global active
+    tracer, active = active, None
+    if tracer is not None:
+        tracer.finish()
+    return tracer
@@ -0,0 +1,112 @@
+# engine/Trajectory.py
+#
+# Smooth mouse motion for MouseNode Move/Drag with a move time. The timing
+# and easing of a motion only depend on its duration, rate and easing, so
+# they are computed once per node at compile time; when the node runs, the
+# start → end points are produced in one vectorized step and the runner only
+# walks the finished lists on a deadline schedule.
+
+from functools import lru_cache
+
+try:
+    import numpy as np
+except ImportError:  # pure-Python fallback, fine for short or slow motions
+    np = None
+
+EASINGS = ['Linear', 'EaseIn', 'EaseOut', 'EaseInOut', 'Smooth']
+
+
+class MotionProfile:
+    """
+    Schedule of one motion:
+      • offsets_ns: time of each step after the motion starts (last = duration)
+      • progress:   eased 0 → 1 fraction of the way covered at that step
+    """
+    __slots__ = ('duration_ms', 'rate_hz', 'easing', 'offsets_ns', 'progress')
+
+    def __init__(self, duration_ms, rate_hz, easing, offsets_ns, progress):
+        self.duration_ms = duration_ms
+        self.rate_hz = rate_hz
+        self.easing = easing
+        self.offsets_ns = offsets_ns
+        self.progress = progress
+
+    def __len__(self):
+        return len(self.offsets_ns)
+
+    def __repr__(self):
+        return f"MotionProfile({self.duration_ms} ms, {len(self)} steps, {self.easing})"
+
+
+def _ease(easing, t):
+    # t is a NumPy array (or a float without NumPy); every curve maps 0 → 0 and 1 → 1
+    if easing == 'EaseIn':
+        return t * t * t
+    if easing == 'EaseOut':
+        u = 1 - t
+        return 1 - u * u * u
+    if easing == 'EaseInOut':
+        # Half-cosine: gentle at both ends
+        if np is not None:
+            return 0.5 - 0.5 * np.cos(np.pi * t)
+        import math
+        return 0.5 - 0.5 * math.cos(math.pi * t)
+    if easing == 'Smooth':
+        # Smootherstep: zero speed and acceleration at both ends
+        return t * t * t * (t * (t * 6 - 15) + 10)
+    return t
+
+
+@lru_cache(maxsize=256)
+def motionProfile(duration_ms, rate_hz, easing='Linear'):
+    """
+    One step every 1/rate_hz seconds over duration_ms (at least one step, at the end).
+    Cached: every node with the same settings shares the arrays.
+    """
+    duration_ms = max(0, int(duration_ms))
+    rate_hz = max(1, int(rate_hz))
+    steps = max(1, round(duration_ms * rate_hz / 1000))
+    duration_ns = duration_ms * 1_000_000
+
+    if np is not None:
+        t = np.arange(1, steps + 1, dtype=np.float64) / steps
+        offsets = np.rint(t * duration_ns).astype(np.int64)
+        progress = _ease(easing, t)
+        progress[-1] = 1.0
+    else:
+        t = [i / steps for i in range(1, steps + 1)]
+        offsets = [round(v * duration_ns) for v in t]
+        progress = [_ease(easing, v) for v in t]
+        progress[-1] = 1.0
+    return MotionProfile(duration_ms, rate_hz, easing, offsets, progress)
+
+
+def trajectory(profile, start, end):
+    """
+    (offsets_ns, xs, ys) as plain lists for the runner to walk. Steps that would
+    not move the cursor (same pixel as the step before, or as start) are left out; the last
+    step always stays so the motion ends exactly on end.
+    """
+    sx, sy = start
+    ex, ey = end
+    if np is not None:
+        p = profile.progress
+        xs = np.rint(sx + (ex - sx) * p).astype(np.int64)
+        ys = np.rint(sy + (ey - sy) * p).astype(np.int64)
+        moved = np.empty(len(p), dtype=bool)
+        moved[0] = xs[0] != sx or ys[0] != sy
+        moved[1:] = (xs[1:] != xs[:-1]) | (ys[1:] != ys[:-1])
+        moved[-1] = True
+        return (profile.offsets_ns[moved].tolist(), xs[moved].tolist(), ys[moved].tolist())
+
+    offsets, xs, ys = [], [], []
+    last = (sx, sy)
+    count = len(profile)
+    for i, (offset, p) in enumerate(zip(profile.offsets_ns, profile.progress)):
+        point = (round(sx + (ex - sx) * p), round(sy + (ey - sy) * p))
+        if point != last or i == count - 1:
+            offsets.append(offset)
+            xs.append(point[0])
+            ys.append(point[1])
+            last = point
+    return offsets, xs, ys
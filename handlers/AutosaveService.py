@@ -0,0 +1,140 @@
+# handlers/AutosaveService.py
+
+import os
+import threading
+import time
+
+from shared.GraphFormat import atomicWrite, encodeGraphFile
+from shared.GraphJournal import appendJournal, removeJournal, snapshotBase
+
+
+class AutosaveService:
+    """
+    Writes session snapshots and edit-journal appends on a background thread,
+    in the order they were handed over from the GUI thread.
+
+    submit() takes a full snapshot (encoded by file extension, .json or compact
+    .bamz); a newer snapshot of the same file replaces one still waiting, along
+    with the journal appends it already contains. Writing a snapshot removes
+    its journal. append() adds encoded journal records and is never dropped.
+    Metrics of the last write are kept in last_duration_ms / last_size_bytes.
+    """
+
+    def __init__(self, encode=encodeGraphFile):
+        self._encode = encode
+        self._cond = threading.Condition()
+        self._jobs = []         # ('snapshot', file_path, graph_data, journal_path) / ('append', file_path, journal_path, [bytes])
+        self._bases = {}        # file_path -> base of the snapshot last written there
+        self._busy = False
+        self._closed = False
+        self._thread = None
+
+        self.saves = 0
+        self.appends = 0
+        self.failures = 0
+        self.last_duration_ms = 0.0
+        self.last_size_bytes = 0
+
+    def submit(self, file_path, graph_data, journal_path=None):
+        with self._cond:
+            if self._closed:
+                return
+            self._jobs = [job for job in self._jobs if job[1] != file_path]
+            self._jobs.append(('snapshot', file_path, graph_data, journal_path))
+            self._wake()
+
+    def append(self, file_path, journal_path, data: bytes):
+        with self._cond:
+            if self._closed:
+                return
+            last = self._jobs[-1] if self._jobs else None
+            if last is not None and last[0] == 'append' and last[2] == journal_path:
+                last[3].append(data)
+            else:
+                self._jobs.append(('append', file_path, journal_path, [data]))
+            self._wake()
+
+    def adopt(self, file_path, base, journal_path=None):
+        """
+        A snapshot of file_path was written outside the service (load, Save As):
+        drop queued writes for it, remove its journal and journal on top of base from now on.
+        """
+        with self._cond:
+            self._jobs = [job for job in self._jobs if job[1] != file_path]
+            self._cond.wait_for(lambda: not self._busy)
+            self._bases[file_path] = base
+            if journal_path:
+                removeJournal(journal_path)
+
+    def _wake(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name='AutosaveService', daemon=True)
+            self._thread.start()
+        self._cond.notify_all()
+
+    def flush(self, timeout=None):
+        """
+        Block until every submitted snapshot and append has been written. Returns False on timeout.
+        """
+        with self._cond:
+            return self._cond.wait_for(lambda: not self._jobs and not self._busy, timeout)
+
+    def close(self, timeout=None):
+        self.flush(timeout)
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+
+    def _run(self):
+        while True:
+            with self._cond:
+                self._cond.wait_for(lambda: self._jobs or self._closed)
+                if not self._jobs:
+                    return
+                job = self._jobs.pop(0)
+                self._busy = True
+
+            try:
+                if job[0] == 'snapshot':
+                    self._write(*job[1:])
+                else:
+                    self._append(*job[1:])
+            finally:
+                with self._cond:
+                    self._busy = False
+                    self._cond.notify_all()
+
+    def _write(self, file_path, graph_data, journal_path=None):
+        started = time.perf_counter()
+        try:
+            data = self._encode(file_path, graph_data)
+            atomicWrite(file_path, data)
+            self._bases[file_path] = snapshotBase(data)
+            if journal_path:
+                removeJournal(journal_path)
+        except Exception as e:
+            self.failures += 1
+            print(f"[Autosave] Failed to auto-save graph: {e}")
+            return
+        self.saves += 1
+        self.last_duration_ms = (time.perf_counter() - started) * 1000
+        self.last_size_bytes = len(data)
+        print(f"[Autosave] Auto-saved graph to: {file_path} ({self.last_size_bytes} bytes, {self.last_duration_ms:.1f} ms)")
+
+    def _append(self, file_path, journal_path, chunks):
+        started = time.perf_counter()
+        data = b''.join(chunks)
+        try:
+            base = self._bases.get(file_path)
+            if base is None and os.path.exists(file_path):
+                with open(file_path, 'rb') as f:
+                    base = self._bases[file_path] = snapshotBase(f.read())
+            appendJournal(journal_path, data, base)
+        except Exception as e:
+            self.failures += 1
+            print(f"[Autosave] Failed to append to journal: {e}")
+            return
+        self.appends += 1
+        self.last_duration_ms = (time.perf_counter() - started) * 1000
+        self.last_size_bytes = len(data)
+        print(f"[Autosave] Journaled edits to: {journal_path} ({self.last_size_bytes} bytes, {self.last_duration_ms:.1f} ms)")
@@ -0,0 +1,124 @@
+# handlers/BackdropIndex.py
+
+from handlers.HighlightPipeline import paintNode
+
+class BackdropIndex:
+    """
+    node_id → backdrops containing it, plus a per-backdrop count of highlighted
+    nodes inside it. Highlighting a node is then O(backdrops of that node)
+    instead of a scan of every backdrop against every highlighted node.
+
+    The membership map is rebuilt lazily after anything that can move nodes
+    in or out of a backdrop (add, delete, move, resize, load, undo/redo).
+    """
+
+    def __init__(self, graph, BackdropNode, highlight_color, default_color):
+        self._graph = graph
+        self._BackdropNode = BackdropNode
+        self._highlight_color = highlight_color
+        self._default_color = default_color
+
+        self._backdrops_of = {}  # node_id -> tuple of BackdropNode
+        self._dirty = True
+
+        self._lit = set()        # highlighted (non-backdrop) node ids
+        self._counts = {}        # backdrop id -> number of lit nodes inside
+        self._painted = set()    # backdrop ids currently painted highlighted
+
+    # ──────────────────────────────────────────────────────────────────────────
+    # Membership
+    # ──────────────────────────────────────────────────────────────────────────
+    def invalidate(self, *args):
+        self._dirty = True
+
+    def watch(self):
+        """
+        Connect to the graph so any structural edit invalidates the map.
+        Every move, resize, add or delete goes through the undo stack.
+        """
+        self._graph.node_created.connect(self.invalidate)
+        self._graph.nodes_deleted.connect(self.invalidate)
+        self._graph.undo_stack().indexChanged.connect(self.invalidate)
+
+    def _ensure(self):
+        if not self._dirty:
+            return
+        self._dirty = False
+
+        backdrops_of = {}
+        for bp_node in self._graph.all_nodes():
+            if isinstance(bp_node, self._BackdropNode):
+                for node in bp_node.nodes():
+                    backdrops_of[node.id] = backdrops_of.get(node.id, ()) + (bp_node,)
+        self._backdrops_of = backdrops_of
+
+        # Membership changed under the current highlights: recount and repaint
+        counts = {}
+        for node_id in self._lit:
+            for bp_node in backdrops_of.get(node_id, ()):
+                counts[bp_node.id] = counts.get(bp_node.id, 0) + 1
+        self._counts = counts
+        self._repaint(set(self._painted) | set(counts))
+
+    def backdrops_of(self, node_id):
+        self._ensure()
+        return self._backdrops_of.get(node_id, ())
+
+    def parent_of(self, node_id):
+        backdrops = self.backdrops_of(node_id)
+        return backdrops[0] if backdrops else None
+
+    # ──────────────────────────────────────────────────────────────────────────
+    # Highlights
+    # ──────────────────────────────────────────────────────────────────────────
+    def update_highlights(self, added_ids, removed_ids):
+        """
+        Apply a net change of highlighted nodes and repaint only the backdrops
+        whose highlighted/not-highlighted state flipped.
+        """
+        self._ensure()
+        touched = set()
+
+        for node_id in removed_ids:
+            if node_id not in self._lit:
+                continue
+            self._lit.discard(node_id)
+            for bp_node in self._backdrops_of.get(node_id, ()):
+                self._counts[bp_node.id] = self._counts.get(bp_node.id, 1) - 1
+                touched.add(bp_node.id)
+
+        for node_id in added_ids:
+            if node_id in self._lit:
+                continue
+            self._lit.add(node_id)
+            for bp_node in self._backdrops_of.get(node_id, ()):
+                self._counts[bp_node.id] = self._counts.get(bp_node.id, 0) + 1
+                touched.add(bp_node.id)
+
+        self._repaint(touched)
+
+    def reset_highlights(self):
+        """
+        Forget all highlight state (e.g. after every node was repainted default).
+        """
+        self._lit.clear()
+        self._counts.clear()
+        self._painted.clear()
+
+    def _repaint(self, backdrop_ids):
+        for bp_id in backdrop_ids:
+            should_highlight = self._counts.get(bp_id, 0) > 0
+            if should_highlight == (bp_id in self._painted):
+                continue
+            bp_node = self._graph.get_node_by_id(bp_id)
+            if bp_node is None:
+                self._painted.discard(bp_id)
+                self._counts.pop(bp_id, None)
+                continue
+            if should_highlight:
+                paintNode(bp_node, self._highlight_color)
+                self._painted.add(bp_id)
+            else:
+                paintNode(bp_node, self._default_color)
+                self._painted.discard(bp_id)
+            bp_node.update()
@@ -0,0 +1,54 @@
+# handlers/BulkEdit.py
+
+from contextlib import contextmanager
+
+from PySide6.QtWidgets import QGraphicsScene
+
+
+@contextmanager
+def bulkEdit(graph, label=None):
+    """
+    Transaction for adding/removing many nodes at once:
+      • viewport repaints are suspended until the end
+      • the scene's BSP index is switched off (rebuilt once afterwards)
+      • graph signals are blocked - callers update their own indexes
+      • with a label, everything done inside is a single undo entry
+    """
+    view = graph.viewer()
+    scene = view.scene()
+    index_method = scene.itemIndexMethod()
+    undo_stack = graph.undo_stack()
+
+    view.setUpdatesEnabled(False)
+    scene.setItemIndexMethod(QGraphicsScene.NoIndex)
+    was_blocked = graph.blockSignals(True)
+    if label:
+        undo_stack.beginMacro(label)
+    try:
+        yield
+    finally:
+        if label:
+            undo_stack.endMacro()
+        graph.blockSignals(was_blocked)
+        scene.setItemIndexMethod(index_method)
+        view.setUpdatesEnabled(True)
+
+
+def deleteNodes(graph, nodes, label=None):
+    """
+    Remove nodes (and their connections) in one pass and one undo entry.
+    """
+    nodes = list(nodes)
+    if not nodes:
+        return []
+    with bulkEdit(graph, label or f"Delete {len(nodes)} node(s)"):
+        graph.delete_nodes(nodes)
+    return [node.id for node in nodes]
+
+
+def clearGraph(graph):
+    """
+    Remove every node without undo history (before loading or starting a new graph).
+    """
+    with bulkEdit(graph):
+        graph.clear_session()
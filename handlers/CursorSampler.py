@@ -0,0 +1,92 @@
+# handlers/CursorSampler.py
+
+import threading
+
+from engine import InputActions
+from shared.Log import getLogger
+
+log = getLogger('handlers.CursorSampler')
+
+
+class CursorSampler:
+    """
+    Cursor position on demand instead of a global mouse-move hook.
+    With no subscribers nothing runs and position() asks the input backend.
+    While someone is subscribed (e.g. the F3 overlay), one thread samples the
+    position at the highest rate any subscriber asked for and calls every
+    callback(x, y) only when the position changed - from the sampler thread,
+    so GUI consumers must hop to their own thread.
+    """
+
+    def __init__(self, read_position=None):
+        self._read_position = read_position or InputActions.cursorPosition
+        self._lock = threading.Lock()
+        self._subscribers = {}  # callback → rate_hz
+        self._thread = None
+        self._stop = None
+        self._last = None
+
+    def position(self):
+        """
+        (x, y) of the cursor: the last sample while sampling, else a fresh backend query.
+        """
+        last = self._last
+        if last is not None and self._thread is not None:
+            return last
+        return self._read_position()
+
+    def subscribe(self, callback, rate_hz=60):
+        with self._lock:
+            self._subscribers[callback] = max(1, rate_hz)
+            if self._thread is None:
+                self._stop = threading.Event()
+                self._last = None
+                self._thread = threading.Thread(target=self._run, args=(self._stop,),
+                                                name='CursorSampler', daemon=True)
+                self._thread.start()
+                log.debug("[CursorSampler] Sampling started.")
+
+    def unsubscribe(self, callback):
+        with self._lock:
+            self._subscribers.pop(callback, None)
+            if self._subscribers or self._thread is None:
+                return
+            self._stop.set()
+            self._thread = None
+            log.debug("[CursorSampler] Sampling stopped.")
+
+    def close(self):
+        with self._lock:
+            self._subscribers.clear()
+            if self._thread is not None:
+                self._stop.set()
+                self._thread = None
+
+    def _run(self, stop):
+        while True:
+            with self._lock:
+                subscribers = list(self._subscribers)
+                rate_hz = max(self._subscribers.values(), default=1)
+            if stop.is_set():
+                return
+
+            try:
+                position = tuple(self._read_position())
+            except Exception as e:
+                log.warning("[CursorSampler] Could not read the cursor position: %s", e)
+                position = self._last
+
+            if position is not None and position != self._last:
+                self._last = position
+                for callback in subscribers:
+                    try:
+                        callback(*position)
+                    except Exception as e:
+                        log.error("[CursorSampler] Subscriber failed: %s", e)
+
+            if stop.wait(1.0 / rate_hz):
+                return
+
+
+# Process-wide sampler shared by the overlay and anything else that needs the cursor
+cursorSampler = CursorSampler()
@@ -0,0 +1,221 @@
+# handlers/EditJournal.py
+
+import os
+
+import shared.globals as g
+from shared.GraphFormat import cloneValue
+from shared.GraphJournal import (
+    connectionKey,
+    diffConnections,
+    diffNode,
+    encodeRecords,
+    journalPathFor,
+)
+
+# Property changes that are runtime state (path highlights, selection), not edits
+_IGNORED_PROPERTIES = ('color', 'selected')
+
+
+class EditJournal:
+    """
+    Turns graph edits into journal records so an autosave writes only what
+    changed. Nodes touched since the last flush are tracked (from undo stack
+    commands and property changes); flush() serializes just those nodes,
+    diffs them against the last saved state and appends the records.
+
+    Every g.journal_compact_records records the journal is compacted into a
+    full snapshot (also on load and on close).
+    """
+
+    def __init__(self, graph, autosave):
+        self._graph = graph
+        self._autosave = autosave
+
+        self._on_edit = None
+        self._file_path = None
+        self._nodes = {}        # node_id -> copy of the node data as last written
+        self._conns = {}        # node_id -> set of connection keys touching it
+        self._dirty = set()     # node ids touched since the last flush
+        self._dirty_all = False
+        self._records = 0       # records in the journal since the last snapshot
+        self._undo_index = 0
+
+    # ──────────────────────────────────────────────────────────────────────────
+    # Tracking
+    # ──────────────────────────────────────────────────────────────────────────
+    def watch(self, on_edit=None):
+        """
+        Follow the graph; on_edit is called after every tracked edit (to schedule a save).
+        """
+        self._on_edit = on_edit
+        undo_stack = self._graph.undo_stack()
+        self._undo_index = undo_stack.index()
+        undo_stack.indexChanged.connect(self._on_undo_index_changed)
+        self._graph.property_changed.connect(self._on_property_changed)
+
+    def _on_undo_index_changed(self, index):
+        # Pushes, undos and redos all change the index; the commands in between
+        # are the ones that were (un)done.
+        undo_stack = self._graph.undo_stack()
+        low, high = sorted((self._undo_index, index))
+        self._undo_index = index
+        for i in range(low, high):
+            cmd = undo_stack.command(i)
+            if cmd is None or not self._mark_command(cmd):
+                self._dirty_all = True
+        self._edited()
+
+    def _mark_command(self, cmd):
+        found = False
+        for i in range(cmd.childCount()):
+            found = self._mark_command(cmd.child(i)) or found
+        nodes = list(getattr(cmd, 'nodes', None) or [])
+        if getattr(cmd, 'node', None) is not None:
+            nodes.append(cmd.node)
+        for attr in ('source', 'target'):
+            port = getattr(cmd, attr, None)
+            if port is not None and hasattr(port, 'node'):
+                nodes.append(port.node())
+        for node in nodes:
+            self._dirty.add(node.id)
+            found = True
+        return found
+
+    def _on_property_changed(self, node, name, value):
+        if name in _IGNORED_PROPERTIES:
+            return
+        self._dirty.add(node.id)
+        self._edited()
+
+    def _edited(self):
+        if self._on_edit is not None:
+            self._on_edit()
+
+    # ──────────────────────────────────────────────────────────────────────────
+    # Snapshots
+    # ──────────────────────────────────────────────────────────────────────────
+    def reset(self, file_path, session, base=None, replayed=0):
+        """
+        session is what file_path (plus its journal) holds right now, e.g. after a load.
+        A replayed or stale journal is compacted straight away.
+        """
+        self._file_path = file_path
+        self._set_state(session)
+        journal_path = journalPathFor(file_path)
+        if replayed or os.path.exists(journal_path) or base is None:
+            self.compact()
+        else:
+            self._autosave.adopt(file_path, base)
+
+    def saved_as(self, file_path, session, base):
+        """
+        session was just written to file_path outside the autosave (Save As).
+        """
+        self._file_path = file_path
+        self._set_state(session)
+        self._autosave.adopt(file_path, base, journalPathFor(file_path))
+
+    def compact(self):
+        """
+        Replace snapshot + journal with a fresh full snapshot.
+        """
+        if self._file_path is None:
+            return
+        session = self._graph.serialize_session()
+        self._set_state(session)
+        self._autosave.submit(self._file_path, session, journalPathFor(self._file_path))
+
+    def _set_state(self, session):
+        self._nodes = cloneValue(session.get('nodes', {}) or {})
+        self._conns = {}
+        for conn in session.get('connections', []) or []:
+            key = connectionKey(conn)
+            self._conns.setdefault(key[0], set()).add(key)
+            self._conns.setdefault(key[2], set()).add(key)
+        self._dirty.clear()
+        self._dirty_all = False
+        self._records = 0
+        self._undo_index = self._graph.undo_stack().index()
+
+    # ──────────────────────────────────────────────────────────────────────────
+    # Journal
+    # ──────────────────────────────────────────────────────────────────────────
+    def flush(self):
+        """
+        Append records for everything touched since the last flush. Returns the number written.
+        """
+        if self._file_path is None:
+            return 0
+        if not self._dirty and not self._dirty_all:
+            return 0
+
+        if self._dirty_all:
+            # Something changed that no command told us about: diff the whole graph
+            session = self._graph.serialize_session()
+            node_ids = set(self._nodes) | set(session['nodes'])
+            records = self._diff(node_ids, session)
+        else:
+            records = []
+            for node_id in self._dirty:
+                node = self._graph.get_node_by_id(node_id)
+                partial = self._graph._serialize([node]) if node is not None else {'nodes': {}, 'connections': []}
+                records += self._diff((node_id,), partial)
+
+        self._dirty.clear()
+        self._dirty_all = False
+        if not records:
+            return 0
+
+        self._records += len(records)
+        if self._records >= g.journal_compact_records:
+            self.compact()
+        else:
+            self._autosave.append(self._file_path, journalPathFor(self._file_path), encodeRecords(records))
+        return len(records)
+
+    def _diff(self, node_ids, session):
+        """
+        Records for node_ids between the last written state and session
+        (which holds those nodes and all of their connections), updating the state.
+        """
+        new_conns = {}
+        for conn in session.get('connections', []) or []:
+            key = connectionKey(conn)
+            new_conns.setdefault(key[0], set()).add(key)
+            new_conns.setdefault(key[2], set()).add(key)
+
+        records = []
+        for node_id in node_ids:
+            new = session['nodes'].get(node_id)
+            old = self._nodes.get(node_id)
+            if new is None:
+                if old is not None:
+                    records.append(['d', node_id])
+                    del self._nodes[node_id]
+                    self._set_conns(node_id, set())
+                continue
+            record = diffNode(node_id, old, new)
+            if record is not None:
+                records.append(record)
+                self._nodes[node_id] = cloneValue(new)
+
+        for node_id in node_ids:
+            if node_id not in self._nodes:
+                continue
+            old_keys = self._conns.get(node_id, set())
+            new_keys = new_conns.get(node_id, set())
+            if old_keys != new_keys:
+                records += diffConnections(old_keys, new_keys)
+                self._set_conns(node_id, new_keys)
+        return records
+
+    def _set_conns(self, node_id, keys):
+        # Keep both endpoints' entries in step
+        for key in self._conns.pop(node_id, set()) - keys:
+            other = key[2] if key[0] == node_id else key[0]
+            self._conns.get(other, set()).discard(key)
+        for key in keys:
+            other = key[2] if key[0] == node_id else key[0]
+            self._conns.setdefault(other, set()).add(key)
+        if keys:
+            self._conns[node_id] = set(keys)
@@ -0,0 +1,35 @@
+# handlers/HighlightPipeline.py
+
+
+def paintNode(node, color):
+    """
+    Recolor a node for highlighting without pushing an undo command
+    (set_color() would add one undo entry per highlight change).
+    """
+    node.set_property('color', (*color[:3], 255), push_undo=False)
+
+
+class HighlightPipeline:
+    """
+    Latest-value slots between loop workers and the GUI thread.
+
+    Workers only ever store "path start_id is now at node_id" (a single dict
+    item assignment, atomic under the GIL - no locks). The GUI thread reads a
+    snapshot once per frame and applies only what changed since the last
+    frame, so intermediate steps that were never painted cost nothing.
+    """
+
+    def __init__(self):
+        self._slots = {}  # start_id -> node_id currently running, or None when the path is cleared
+
+    def publish(self, start_id, node_id):
+        self._slots[start_id] = node_id
+
+    def clear(self, start_id):
+        self._slots[start_id] = None
+
+    def snapshot(self):
+        """
+        {start_id: node_id} for every path that currently has a highlight.
+        """
+        return {start_id: node_id for start_id, node_id in dict(self._slots).items() if node_id is not None}
@@ -0,0 +1,99 @@
+# handlers/HotkeyIndex.py
+
+
+class HotkeyIndex:
+    """
+    key string → StartNodes bound to it, kept up to date as the graph changes
+    so a hotkey press dispatches without scanning every node.
+    """
+
+    def __init__(self, StartNode):
+        self._StartNode = StartNode
+        self._by_key = {}   # key_str -> {node_id: node}
+        self._key_of = {}   # node_id -> key_str
+        self._dirty = False
+
+    # ──────────────────────────────────────────────────────────────────────────
+    # Updates
+    # ──────────────────────────────────────────────────────────────────────────
+    def add_node(self, node):
+        if not isinstance(node, self._StartNode):
+            return
+        try:
+            key_str = node.get_property('key')
+        except Exception:
+            return
+        self._bind(node, key_str)
+
+    def remove_node_id(self, node_id):
+        key_str = self._key_of.pop(node_id, None)
+        if key_str is None:
+            return
+        bound = self._by_key.get(key_str)
+        if bound is not None:
+            bound.pop(node_id, None)
+            if not bound:
+                del self._by_key[key_str]
+
+    def on_property_changed(self, node, name, value):
+        if name == 'key' and isinstance(node, self._StartNode):
+            self._bind(node, value)
+
+    def on_nodes_deleted(self, node_ids):
+        for node_id in node_ids:
+            self.remove_node_id(node_id)
+
+    def rebuild(self, nodes):
+        self._by_key.clear()
+        self._key_of.clear()
+        self._dirty = False
+        for node in nodes:
+            self.add_node(node)
+
+    def watch_undo_stack(self, undo_stack):
+        """
+        Undo/redo add and remove nodes without emitting node signals, so any
+        undo stack change that is not a fresh push marks the index stale.
+        """
+        last_count = [undo_stack.count()]
+
+        def on_index_changed(index):
+            count = undo_stack.count()
+            if count == last_count[0] or index < count:
+                self.invalidate()
+            last_count[0] = count
+
+        undo_stack.indexChanged.connect(on_index_changed)
+
+    def invalidate(self):
+        """
+        Mark the index stale (e.g. after undo/redo); rebuilt on next lookup.
+        """
+        self._dirty = True
+
+    def _bind(self, node, key_str):
+        self.remove_node_id(node.id)
+        if not key_str or key_str == 'None':
+            return
+        bound = self._by_key.setdefault(key_str, {})
+        bound[node.id] = node
+        self._key_of[node.id] = key_str
+        if len(bound) > 1:
+            print(f"[Hotkeys] Warning: key '{key_str}' is bound to {len(bound)} Start nodes: {', '.join(bound)}")
+
+    # ──────────────────────────────────────────────────────────────────────────
+    # Lookups
+    # ──────────────────────────────────────────────────────────────────────────
+    def nodes_for(self, key_str, all_nodes=None):
+        """
+        StartNodes bound to key_str. all_nodes is only called if the index is stale.
+        """
+        if self._dirty and all_nodes is not None:
+            self.rebuild(all_nodes())
+        return list(self._by_key.get(key_str, {}).values())
+
+    def duplicates(self):
+        """
+        {key_str: [node_id, ...]} for every key bound to more than one Start node.
+        """
+        return {key_str: list(bound) for key_str, bound in self._by_key.items() if len(bound) > 1}
@@ -2,8 +2,50 @@
 
 import shared.globals as g
 
+import queue
+import time
 from pynput import keyboard
 
+from engine.MacroRecorder import recorder
+from shared.Log import getLogger
+
+log = getLogger('handlers.KeyboardListener')
+
+# (perf_counter_ns timestamp, key string) for every hotkey press, in order.
+# Drained on the GUI thread; F1/F2/F3 arrive here as 'F1'/'F2'/'F3'.
+hotkey_queue = queue.SimpleQueue()
+
+_wakeup_callback = None
+_wakeup_pending = False
+
+def setHotkeyWakeup(callback):
+    """
+    Register the function that wakes the consumer (e.g. a queued Qt signal emit).
+    It is called from the listener thread, at most once per undrained batch.
+    """
+    global _wakeup_callback
+    _wakeup_callback = callback
+
+def drainHotkeyEvents():
+    """
+    Return all queued (timestamp_ns, key_str) events, oldest first.
+    """
+    global _wakeup_pending
+    _wakeup_pending = False
+    events = []
+    while True:
+        try:
+            events.append(hotkey_queue.get_nowait())
+        except queue.Empty:
+            return events
+
+def _push_hotkey(key_str):
+    global _wakeup_pending
+    hotkey_queue.put((time.perf_counter_ns(), key_str))
+    if _wakeup_callback is not None and not _wakeup_pending:
+        _wakeup_pending = True
+        _wakeup_callback()
+
 _PYNPUT_SPECIAL_KEY_TO_STRING_MAP = {
     # Function Keys (F1-F3 are global hotkeys for start/stop/show coords)
     keyboard.Key.f4: 'F4', keyboard.Key.f5: 'F5', keyboard.Key.f6: 'F6',
@@ -68,18 +110,7 @@ _KEYPAD_KEY_CODES_TO_STRING_MAP = {
     110: 'Num.',# Numpad .
 }
 
-def on_press(key):
-    if key == keyboard.Key.f1:
-        g.hard_start = True
-        return
-    if key == keyboard.Key.f2:
-        g.hard_stop = True
-        return
-    if key == keyboard.Key.f3:
-        g.show_coords = not g.show_coords
-        return 
-
-
+def _key_to_string(key):
     key_str = None
     try:
         if isinstance(key, keyboard.Key):
@@ -88,24 +119,41 @@ def on_press(key):
             if hasattr(key, 'vk') and key.vk in _KEYPAD_KEY_CODES_TO_STRING_MAP:
                 key_str = _KEYPAD_KEY_CODES_TO_STRING_MAP[key.vk]
             elif key.char is not None:
-                char = key.char
-                print(f"Key pressed: {char}")
                 key_str = key.char.upper() if len(key.char) == 1 and key.char.isalpha() else key.char
     except AttributeError:
         # Some keys might not have 'char' (e.g. dead keys on some layouts)
-        print(f"Error processing key {key}")
-        pass
+        log.warning("Error processing key %s", key)
+    return key_str
+
 
+def on_press(key):
+    if key == keyboard.Key.f1:
+        _push_hotkey('F1')
+        return
+    if key == keyboard.Key.f2:
+        _push_hotkey('F2')
+        return
+    if key == keyboard.Key.f3:
+        _push_hotkey('F3')
+        return 
+
+
+    key_str = _key_to_string(key)
     if key_str and key_str in g.KEY_NAMES_AVAILABLE and key_str != 'None':
         # if key_str not in ['F1', 'F2', 'F3']:
-        print(f"Global key pressed: {key_str}")
-        g.GLOBAL_KEY_PRESS_STATE[key_str] = True
+        log.debug("Global key pressed: %s", key_str)
+        recorder.on_key_down(key_str)
+        _push_hotkey(key_str)
     else:
-        print(f"Key {key} not recognized or not in available keys!")
+        log.debug("Key %s not recognized or not in available keys!", key)
 
 
 def on_release(key):
-    pass
+    if not recorder.recording:
+        return
+    key_str = _key_to_string(key)
+    if key_str and key_str in g.KEY_NAMES_AVAILABLE and key_str != 'None':
+        recorder.on_key_up(key_str)
 
     
 keyboardListener = keyboard.Listener(on_press=on_press, on_release=on_release)
\ No newline at end of file
@@ -7,4 +7,5 @@ from PySide6.QtCore import (
 
 class LoopController(QObject):
     loop_iteration_finished = Signal(str)
-    node_started = Signal(str)
\ No newline at end of file
+    node_started = Signal(str)
+    hotkey_pressed = Signal()
\ No newline at end of file
@@ -1,11 +1,56 @@
 # handlers/MouseListener.py
+#
+# Global mouse hook, only installed while something needs every move/click
+# (Record mode). The cursor position alone comes from handlers/CursorSampler.py.
 
-import shared.globals as g
+import threading
 
 from pynput.mouse import Listener as MouseListener
 
+from engine.MacroRecorder import recorder
+from shared.Log import getLogger
+
+log = getLogger('handlers.MouseListener')
+
+_lock = threading.Lock()
+_listener = None
+_users = 0
+
 def on_move(x, y):
-    g.mouse_x = x
-    g.mouse_y = y
-    
-mouseListener = MouseListener(on_move=on_move)
\ No newline at end of file
+    recorder.on_move(x, y)
+
+def on_click(x, y, button, pressed):
+    recorder.on_click(x, y, button.name, pressed)
+
+def acquireMouseHook():
+    """
+    Install the hook for one more user (a pynput listener cannot be restarted,
+    so every install creates a new one).
+    """
+    global _listener, _users
+    with _lock:
+        _users += 1
+        if _listener is None:
+            _listener = MouseListener(on_move=on_move, on_click=on_click)
+            _listener.start()
+            log.debug("[MouseListener] Hook installed.")
+
+def releaseMouseHook():
+    global _listener, _users
+    with _lock:
+        _users = max(0, _users - 1)
+        if _users or _listener is None:
+            return
+        listener, _listener = _listener, None
+    listener.stop()
+    listener.join()
+    log.debug("[MouseListener] Hook removed.")
+
+def stopMouseHook():
+    """
+    Remove the hook whatever the number of users (application exit).
+    """
+    global _users
+    with _lock:
+        _users = 1 if _listener is not None else 0
+    releaseMouseHook()
@@ -2,7 +2,6 @@
 
 import shared.globals as g
 
-import asyncio
 from PySide6.QtWidgets import (
     QApplication,
     QWidget,
@@ -10,17 +9,36 @@ from PySide6.QtWidgets import (
 )
 from PySide6.QtCore import (
     Qt,
-    QTimer,
+    QPoint,
+    Signal,
 )
 
+from handlers.CursorSampler import cursorSampler
+
+OVERLAY_MODES = ['Corner', 'Follow']
+FOLLOW_OFFSET = 16
+
 
 class Overlay(QWidget):
+    """
+    Cursor coordinates overlay (F3). Nothing runs while it is hidden; while
+    shown it is subscribed to the CursorSampler at the screen refresh rate and
+    only redraws when the cursor moved and the text (or place) changed.
+    Modes (shared/globals.overlay_mode):
+      • Corner: top-right corner of the primary screen
+      • Follow: next to the cursor
+    With g.overlay_show_color the pixel color under the cursor is shown too.
+    """
+    # Emitted from the sampler thread, handled on the GUI thread
+    cursor_moved = Signal(int, int)
+
     def __init__(self):
         super().__init__()
         self.setWindowFlags(
             Qt.FramelessWindowHint |
             Qt.WindowStaysOnTopHint |
-            Qt.Tool
+            Qt.Tool |
+            Qt.WindowTransparentForInput
         )
         self.setAttribute(Qt.WA_TranslucentBackground)
         self.label = QLabel("", self)
@@ -29,13 +47,83 @@ class Overlay(QWidget):
         self.resize(200, 30)
         self.hide()
 
-    def update_text(self, x, y):
-        """
-        Update the overlay text with the current mouse coordinates.
-        """
-        self.label.setText(f"X: {x}  Y: {y}")
-        self.label.adjustSize()
-        self.resize(self.label.size())
+        self._active = False
+        self._text = None
+        self.cursor_moved.connect(self._on_cursor_moved, Qt.QueuedConnection)
+        self._emit_cursor = self.cursor_moved.emit  # the sampler callback (kept to unsubscribe it)
+
+    @property
+    def active(self):
+        return self._active
+
+    def set_active(self, active):
+        if active == self._active:
+            return
+        self._active = active
+        if active:
+            self._text = None
+            x, y = cursorSampler.position()
+            self._on_cursor_moved(x, y)
+            self.show()
+            cursorSampler.subscribe(self._emit_cursor, self._refresh_rate())
+        else:
+            cursorSampler.unsubscribe(self._emit_cursor)
+            self.hide()
+
+    def toggle(self):
+        self.set_active(not self._active)
+
+    def set_mode(self, mode):
+        g.overlay_mode = mode if mode in OVERLAY_MODES else 'Corner'
+        self._redraw()
+
+    def set_show_color(self, show):
+        g.overlay_show_color = bool(show)
+        self._redraw()
+
+    def _redraw(self):
+        if self._active:
+            self._text = None
+            self._on_cursor_moved(*cursorSampler.position())
+
+    @staticmethod
+    def _refresh_rate():
+        screen = QApplication.primaryScreen()
+        rate = screen.refreshRate() if screen is not None else 0
+        return int(rate) if rate and rate > 0 else 60
+
+    @staticmethod
+    def _pixel_color(x, y):
+        point = QPoint(x, y)
+        screen = QApplication.screenAt(point)
+        if screen is None:
+            return None
+        origin = screen.geometry().topLeft()
+        image = screen.grabWindow(0, x - origin.x(), y - origin.y(), 1, 1).toImage()
+        if image.isNull():
+            return None
+        return image.pixelColor(0, 0)
+
+    def _on_cursor_moved(self, x, y):
+        if not self._active:
+            return  # a queued sample that arrived after the overlay was hidden
+
+        text = f"X: {x}  Y: {y}"
+        if g.overlay_show_color:
+            color = self._pixel_color(x, y)
+            if color is not None:
+                text += f"  RGB: {color.red()}, {color.green()}, {color.blue()}  {color.name().upper()}"
+
+        if text != self._text:
+            self._text = text
+            self.label.setText(text)
+            self.label.adjustSize()
+            self.resize(self.label.size())
+            if g.overlay_mode != 'Follow':
+                self.show_at_top_right()
+
+        if g.overlay_mode == 'Follow':
+            self.move(x + FOLLOW_OFFSET, y + FOLLOW_OFFSET)
 
     def show_at_top_right(self):
         """
@@ -43,25 +131,3 @@ class Overlay(QWidget):
         """
         screen_geometry = QApplication.primaryScreen().geometry()
         self.move(screen_geometry.width() - self.width(), 0)
-        self.show()
-
-async def overlay_update_loop():
-    """
-    Main loop to update the overlay with mouse coordinates.
-    This runs asynchronously and updates the overlay every 50ms.
-    """
-    overlay = Overlay()
-
-    timer = QTimer()
-    timer.timeout.connect(lambda: None)
-    timer.start(50)
-
-    while True:
-        if g.show_coords:
-            overlay.update_text(g.mouse_x, g.mouse_y)
-            if not overlay.isVisible():
-                overlay.show_at_top_right()
-        else:
-            if overlay.isVisible():
-                overlay.hide()
-        await asyncio.sleep(0.05)
\ No newline at end of file
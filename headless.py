@@ -0,0 +1,162 @@
+# headless.py
+#
+# Run saved graphs without the GUI:
+#     python headless.py autosave_graph.json
+#     python headless.py autosave_graph.json --start A --start 0x1f2e3d4c
+#     python headless.py autosave_graph.json --executor asyncio
+#     python headless.py autosave_graph.json --trace run_trace.json
+#     DISPLAY=:99 python headless.py autosave_graph.json --capture xshm   (e.g. under Xvfb)
+
+import shared.globals as g
+g.ensure_initialized()
+
+import argparse
+import asyncio
+import sys
+import threading
+
+from engine.SessionGraph import loadSession
+from engine.PlanRunner import runPlan
+from engine.Timing import PathTimer
+from engine.RunToken import RunToken
+from engine.AsyncRunner import AsyncPathTimer, runPlanAsync
+from engine import InputActions
+from engine.InputBackend import createBackend
+from engine import Tracer
+from engine import ScreenCapture
+from shared import Log
+
+log = Log.getLogger('headless')
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="BAM " + g.version + " - headless graph runner")
+    parser.add_argument('graph', help="graph file written by BAM (e.g. autosave_graph.json or a compact .bamz)")
+    parser.add_argument('--start', action='append', default=[], metavar='ID|KEY',
+                        help="Start node id or hotkey to run (repeatable, default: all Start nodes)")
+    parser.add_argument('--spin-ms', type=float, default=g.timing_spin_window_ms,
+                        help="busy-wait window before each delay deadline, in ms (default: %(default)s)")
+    parser.add_argument('--input', choices=('pynput', 'recording', 'null'), default=g.input_backend,
+                        help="input backend: real input, or recorded/counted only - no display needed (default: %(default)s)")
+    parser.add_argument('--executor', choices=('threads', 'asyncio'), default=g.executor,
+                        help="one thread per Start node, or all of them as coroutines on one loop (default: %(default)s)")
+    parser.add_argument('--capture', choices=ScreenCapture.BACKENDS, default=g.capture_backend,
+                        help="where Capture Screen nodes grab from; 'null' needs no display (default: %(default)s)")
+    parser.add_argument('--trace', metavar='PATH',
+                        help="record every node, delay overshoot and input call; write a Chrome/Perfetto trace to PATH")
+    parser.add_argument('--log', default=g.log_levels, metavar='LEVELS',
+                        help="log levels, e.g. 'debug' (every node step) or 'warning,engine.PlanRunner=debug' (default: %(default)s)")
+    return parser.parse_args(argv)
+
+
+def _on_iteration(start_id):
+    return lambda: log.info("[Headless] Loop iteration finished for Start Node %s.", start_id)
+
+
+def run_threads(plans, tokens):
+    timers = {}
+    threads = []
+    for start_id, plan in plans.items():
+        timers[start_id] = PathTimer()
+        thread = threading.Thread(
+            target=runPlan,
+            args=(plan, tokens[start_id]),
+            kwargs={'on_iteration': _on_iteration(start_id), 'timer': timers[start_id]},
+            daemon=True
+        )
+        threads.append(thread)
+        thread.start()
+        print(f"[Headless] Launched loop thread for Start Node {start_id}")
+
+    try:
+        for thread in threads:
+            while thread.is_alive():
+                thread.join(0.2)
+    except KeyboardInterrupt:
+        print("[Headless] Interrupted, stopping all loops.")
+        for token in tokens.values():
+            token.stop()
+        for thread in threads:
+            thread.join()
+    return timers
+
+
+def run_asyncio(plans, tokens):
+    timers = {}
+
+    async def run_all():
+        loop = asyncio.get_running_loop()
+        paths = []
+        for start_id, plan in plans.items():
+            timers[start_id] = AsyncPathTimer(tokens[start_id], loop)
+            paths.append(runPlanAsync(plan, tokens[start_id],
+                                      on_iteration=_on_iteration(start_id), timer=timers[start_id]))
+        print(f"[Headless] Running {len(paths)} Start Node(s) as coroutines")
+        await asyncio.gather(*paths)
+
+    try:
+        asyncio.run(run_all())
+    except KeyboardInterrupt:
+        print("[Headless] Interrupted, stopping all loops.")
+        for token in tokens.values():
+            token.stop()
+    return timers
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    Log.configure(args.log)
+    g.timing_spin_window_ms = args.spin_ms
+    g.capture_backend = args.capture
+    injector = InputActions.setBackend(createBackend(args.input))
+
+    try:
+        graph = loadSession(args.graph)
+    except (OSError, ValueError) as e:
+        print(f"[Headless] Failed to load graph: {e}")
+        return 1
+
+    if args.start:
+        start_ids = []
+        for selector in args.start:
+            matches = graph.find_starts(selector)
+            if not matches:
+                print(f"[Headless] No Start node matches '{selector}'.")
+                return 1
+            start_ids.extend(m for m in matches if m not in start_ids)
+    else:
+        start_ids = graph.start_ids()
+
+    if not start_ids:
+        print("[Headless] Graph has no Start nodes. Nothing to run.")
+        return 1
+
+    plans = {start_id: graph.compile(start_id) for start_id in start_ids}
+    tokens = {start_id: RunToken() for start_id in start_ids}
+    if args.trace:
+        Tracer.startTracing(g.trace_capacity)
+    if args.executor == 'asyncio':
+        timers = run_asyncio(plans, tokens)
+    else:
+        timers = run_threads(plans, tokens)
+
+    tag = "Lag" if args.executor == 'asyncio' else "Timing"
+    for start_id, timer in timers.items():
+        timer.stats.report(f"{tag} {start_id}")
+    injector.close(timeout=5)  # delivers any pending key/button releases
+    Log.flush()
+    injector.report()
+    grabber = ScreenCapture.activeGrabber()
+    if grabber is not None:
+        grabber.report()
+        grabber.close()
+    if args.trace:
+        tracer = Tracer.stopTracing()
+        tracer.export(args.trace)
+        print(f"[Headless] Trace with {len(tracer)} records ({tracer.dropped} dropped) written to {args.trace}")
+    print("[Headless] All loops finished.")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
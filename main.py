@@ -1,12 +1,14 @@
 # main.py
 
 import shared.globals as g
+from shared import Log
 g.ensure_initialized()
+Log.configure(g.log_levels)
 print("[DEBUG] shared/globals contains:", dir(g))
 
 import sys
-import threading
 import asyncio
+from collections import deque
 
 from PySide6.QtWidgets import (
     QApplication,
@@ -48,19 +50,28 @@ from nodes.EndNode import EndNode
 from nodes.DelayNode import DelayNode
 from nodes.KeyboardNode import KeyboardNode
 from nodes.MouseNode import MouseNode
+from nodes.CaptureNode import CaptureNode
+from nodes.FindImageNode import FindImageNode
 
 # ──────────────────────────────────────────────────────────────────────────────
 # HANDLERS
 # ──────────────────────────────────────────────────────────────────────────────
 
-from handlers.Overlay import overlay_update_loop
+from handlers.Overlay import Overlay
 from handlers.LoopController import LoopController
-
-from handlers.KeyboardListener import keyboardListener
+from handlers.HotkeyIndex import HotkeyIndex
+from handlers.HighlightPipeline import HighlightPipeline
+from handlers.BackdropIndex import BackdropIndex
+from handlers.AutosaveService import AutosaveService
+from handlers.EditJournal import EditJournal
+from engine.RunToken import RunToken
+from engine import InputActions
+
+from handlers.KeyboardListener import keyboardListener, setHotkeyWakeup
 keyboardListener.start()
 
-from handlers.MouseListener import mouseListener
-mouseListener.start()
+from handlers.MouseListener import stopMouseHook
+from handlers.CursorSampler import cursorSampler
 
 # ──────────────────────────────────────────────────────────────────────────────
 # AUTOMATION DESIGNER HANDLERS
@@ -72,16 +83,21 @@ from AutomationDesigner.OnNewGraphHandler import onNewGraphHandler
 from AutomationDesigner.OnSaveHandler import onSaveHandler
 from AutomationDesigner.ClearAllNodesFallbackHandler import clearAllNodesFallbackHandler
 from AutomationDesigner.OnLoadHandler import onLoadHandler
-from AutomationDesigner.SaveGraphsHandler import saveGraphsHandler
+from AutomationDesigner.SaveGraphsHandler import saveGraphsHandler, scheduleSaveGraphsHandler, compactGraphsHandler
 from AutomationDesigner.BuildFileMenuHandler import buildFileMenuHandler
+from AutomationDesigner.BuildViewMenuHandler import buildViewMenuHandler
 from AutomationDesigner.ShowContextMenuHandler import showContextMenuHandler
 from AutomationDesigner.CreateNodeHandler import createNodeHandler
 from AutomationDesigner.OnPlayHandler import onPlayHandler
 from AutomationDesigner.OnPauseHandler import onPauseHandler
 from AutomationDesigner.OnStopHandler import onStopHandler
-from AutomationDesigner.RunLoopHandler import runLoopHandler
+from AutomationDesigner.OnRecordHandler import onRecordHandler
+from AutomationDesigner.OnTraceHandler import onTraceHandler
+from AutomationDesigner.RunLoopHandler import runLoopHandler, runLoopAsyncHandler
+from AutomationDesigner.LaunchPathHandler import launchPathHandler
+from AutomationDesigner.CompileStartPathHandler import compileStartPathHandler
 from AutomationDesigner.OnLoopIterationFinishedHandler import onLoopIterationFinishedHandler
-from AutomationDesigner.CheckHardStartHandler import checkHardStartHandler
+from AutomationDesigner.OnHotkeyEventsHandler import onHotkeyEventsHandler
 from AutomationDesigner.OnNodeStartedHandler import onNodeStartedHandler
 from AutomationDesigner.CopyPasteEventHandler import (
     copyPasteEventHandler,
@@ -89,7 +105,7 @@ from AutomationDesigner.CopyPasteEventHandler import (
     pasteSelectedNodesHandler,
 )
 from AutomationDesigner.KeyPressEventHandler import keyPressEventHandler
-from AutomationDesigner.HighlightNodeInPathHandler import highlightNodeInPathHandler, updateAllBackdropsHighlightsHandler
+from AutomationDesigner.HighlightNodeInPathHandler import applyHighlightsHandler
 from AutomationDesigner.ClearHighlightsForPathHandler import clearHighlightsForPathHandler
 
 # ──────────────────────────────────────────────────────────────────────────────
@@ -124,6 +140,19 @@ class AutomationDesigner(QMainWindow):
         self._graph.register_node(DelayNode)
         self._graph.register_node(KeyboardNode)
         self._graph.register_node(MouseNode)
+        self._graph.register_node(CaptureNode)
+        self._graph.register_node(FindImageNode)
+
+        # 4.1.1b) Keep a key → StartNodes index in sync with the graph for hotkey dispatch:
+        self._hotkey_index = HotkeyIndex(StartNode)
+        self._graph.node_created.connect(self._hotkey_index.add_node)
+        self._graph.nodes_deleted.connect(self._hotkey_index.on_nodes_deleted)
+        self._graph.property_changed.connect(self._hotkey_index.on_property_changed)
+        self._hotkey_index.watch_undo_stack(self._graph.undo_stack())
+
+        # 4.1.1c) node → backdrop membership, used for backdrop highlights and parent lookups:
+        self._backdrop_index = BackdropIndex(self._graph, BackdropNode, NODE_HIGHLIGHT_COLOR, NODE_DEFAULT_COLOR)
+        self._backdrop_index.watch()
 
         # 4.1.2) Set the NodeGraph’s central widget:
         self.setCentralWidget(self._graph.widget)
@@ -151,17 +180,30 @@ class AutomationDesigner(QMainWindow):
         # 4.1.6) Remember the last scene position (for placing new nodes):
         self._last_scene_pos = QPointF(0, 0)
 
-        # 4.1.7) Build the top toolbar with Play | Pause | Stop:
+        # 4.1.6b) Background auto-save: debounced on the GUI thread, written on a worker thread:
+        self._autosave = AutosaveService()
+        self._autosave_timer = QTimer(self)
+        self._autosave_timer.setSingleShot(True)
+        self._autosave_timer.setInterval(g.autosave_debounce_ms)
+        self._autosave_timer.timeout.connect(self._autosave_now)
+
+        # 4.1.6c) Edit journal: every edit schedules an auto-save that appends only what changed:
+        self._journal = EditJournal(self._graph, self._autosave)
+        self._journal.watch(self.saveGraphs)
+
+        # 4.1.6d) F3 coordinates overlay: hidden (and not sampling the cursor) until toggled:
+        self._overlay = Overlay()
+
+        # 4.1.7) Build the top toolbar with Play | Pause | Stop | Record | Trace:
         self._build_toolbar()
         self._build_file_menu()
+        self._build_view_menu()
 
         # 4.1.8) Prepare loop control structures:
-        #      _loop_threads maps Start node ID (string) → threading.Thread
-        #      _loop_stop_flags maps Start node ID → threading.Event (to signal stop)
-        #      _loop_pause_flags maps Start node ID → threading.Event (to signal pause)
+        #      _loop_threads maps Start node ID (string) → threading.Thread (or PathTask with g.executor = 'asyncio')
+        #      _loop_tokens maps Start node ID → RunToken (to signal stop / pause / resume)
         self._loop_threads = {}
-        self._loop_stop_flags = {}
-        self._loop_pause_flags = {}
+        self._loop_tokens = {}
 
         # 4.1.9) A signal emitter if you need to hook back to the GUI when a loop iteration finishes:
         self._loop_controller = LoopController()
@@ -174,22 +216,24 @@ class AutomationDesigner(QMainWindow):
         self._graph.show()
         self._on_load(file_path=self.DEFAULT_GRAPH_FILE)
 
-        # 4.1.11) Add this timer to check hard_start flag every 33 ms
-        self._hard_start_timer = QTimer(self)
-        self._hard_start_timer.timeout.connect(self._check_hard_start)
-        self._hard_start_timer.start(33)
+        # 4.1.11) Hotkeys (F1, F2, Start node keys): the keyboard listener queues every
+        #         press and wakes the GUI thread through a queued signal - no polling.
+        self._hotkey_latencies_ms = deque(maxlen=100)
+        self._loop_controller.hotkey_pressed.connect(self._on_hotkey_events, Qt.QueuedConnection)
+        setHotkeyWakeup(self._loop_controller.hotkey_pressed.emit)
+        QTimer.singleShot(0, self._on_hotkey_events) # presses queued before the window existed
 
-        # 4.1.12) Define a clipboard for copy/paste operations:
-        self._clipboard = []
+        # 4.1.12) Last copied nodes (session format), used when the system clipboard has none:
+        self._clipboard = None
 
-        # 4.1.13) Initialize the active paths highlights dictionary:
+        # 4.1.13) Initialize the active paths highlights dictionary (what is painted right now),
+        #         the worker → GUI highlight slots and the frame timer that applies them:
         self._active_paths_highlights = {}
+        self._highlights = HighlightPipeline()
+        self._highlight_timer = QTimer(self)
+        self._highlight_timer.setInterval(max(1, int(1000 / g.highlight_refresh_hz)))
+        self._highlight_timer.timeout.connect(self._apply_highlights)
 
-        # 4.1.14) Add this timer to check Hotkeys every 50 ms
-        self._global_hotkey_poll_timer = QTimer(self)
-        self._global_hotkey_poll_timer.timeout.connect(self._check_global_hotkeys)
-        self._global_hotkey_poll_timer.start(50)
-        
 
     # ──────────────────────────────────────────────────────────────────────────
     # 4.1) KEY PRESS EVENT HANDLER
@@ -234,23 +278,34 @@ class AutomationDesigner(QMainWindow):
         onLoadHandler(self, file_path)
 
     def saveGraphs(self):
+        scheduleSaveGraphsHandler(self)
+
+    def _autosave_now(self):
         saveGraphsHandler(self)
 
     def closeEvent(self, event):
         self._on_stop()
-        self.saveGraphs()
-        mouseListener.stop()
+        self._autosave_timer.stop()
+        compactGraphsHandler(self)
+        self._autosave.close(timeout=10)
+        InputActions.getInjector().close(timeout=1) # deliver pending key/button releases
+        self._overlay.set_active(False)
+        self._overlay.close()
+        cursorSampler.close()
+        stopMouseHook()
         keyboardListener.stop()
-        mouseListener.join()
         keyboardListener.join()
         super().closeEvent(event)
         event.accept()
 
     # ──────────────────────────────────────────────────────────────────────────
-    # 4.4) Build File menu with New, Open, Save, Exit
+    # 4.4) Build File menu with New, Open, Save, Exit; View menu with the overlay options
     # ──────────────────────────────────────────────────────────────────────────
     def _build_file_menu(self):
         buildFileMenuHandler(self)
+
+    def _build_view_menu(self):
+        buildViewMenuHandler(self)
     
     # ──────────────────────────────────────────────────────────────────────────
     # 4.5) Canvas right‐click context menu
@@ -267,27 +322,47 @@ class AutomationDesigner(QMainWindow):
             'End': EndNode,
             'Delay': DelayNode,
             'Keyboard': KeyboardNode,
-            'Mouse': MouseNode
+            'Mouse': MouseNode,
+            'Capture Screen': CaptureNode,
+            'Find Image': FindImageNode
         }
         createNodeHandler(self, node_label, node_map)
 
     # ──────────────────────────────────────────────────────────────────────────
-    # 4.7) PLAY, PAUSE, STOP handlers
+    # 4.7) PLAY, PAUSE, STOP, RECORD, TRACE handlers
     # ──────────────────────────────────────────────────────────────────────────
     def _on_play(self):
         onPlayHandler(self, NODE_DEFAULT_COLOR, StartNode)
 
+    def _hard_start(self, trigger_ns=None):
+        onPlayHandler(self, NODE_DEFAULT_COLOR, StartNode, trigger_ns)
+
     def _on_pause(self):
         onPauseHandler(self)
 
     def _on_stop(self):
         onStopHandler(self, NODE_DEFAULT_COLOR, BackdropNode)
 
+    def _on_record(self, checked):
+        onRecordHandler(self, checked)
+
+    def _on_trace(self, checked):
+        onTraceHandler(self, checked)
+
     # ──────────────────────────────────────────────────────────────────────────
-    # 4.8) Loop worker function (runs in its own thread per Start node)
+    # 4.8) Loop worker (its own thread per Start node, or a coroutine with g.executor = 'asyncio')
     # ──────────────────────────────────────────────────────────────────────────
-    def _run_loop(self, start_node, stop_event: threading.Event, pause_event: threading.Event):
-        runLoopHandler(self, start_node, stop_event, pause_event, EndNode, DelayNode)
+    def _compile_start_path(self, start_node):
+        return compileStartPathHandler(self, start_node)
+
+    def _launch_path(self, start_node, trigger_ns=None):
+        return launchPathHandler(self, start_node, trigger_ns)
+
+    def _run_loop(self, plan, token: RunToken, trigger_ns=None):
+        runLoopHandler(self, plan, token, trigger_ns)
+
+    async def _run_loop_async(self, plan, token: RunToken, trigger_ns=None):
+        await runLoopAsyncHandler(self, plan, token, trigger_ns)
 
     # ──────────────────────────────────────────────────────────────────────────
     # 4.9) Receive a signal when each loop iteration finishes
@@ -297,10 +372,10 @@ class AutomationDesigner(QMainWindow):
 
         
     # ──────────────────────────────────────────────────────────────────────────
-    # 4.10) Check for F1 - hard start
+    # 4.10) Hotkey events from the global keyboard listener (F1, F2, Start keys)
     # ──────────────────────────────────────────────────────────────────────────
-    def _check_hard_start(self):
-        checkHardStartHandler(self)
+    def _on_hotkey_events(self):
+        onHotkeyEventsHandler(self)
 
 
     # ──────────────────────────────────────────────────────────────────────────
@@ -311,34 +386,27 @@ class AutomationDesigner(QMainWindow):
 
     def _get_parent_backdrop(self, node_id_or_object):
         if isinstance(node_id_or_object, str):
-            node = self._graph.get_node_by_id(node_id_or_object)
+            node_id = node_id_or_object
         else:
-            node = node_id_or_object
-        
-        if not node:
+            node_id = node_id_or_object.id if node_id_or_object else None
+
+        if not node_id:
             return None
 
-        for bp_node in self._graph.all_nodes():
-            if isinstance(bp_node, BackdropNode):
-                if node in bp_node.nodes():
-                    return bp_node
-        return None
-    
-    def _update_all_backdrop_highlights(self, NODE_HIGHLIGHT_COLOR, NODE_DEFAULT_COLOR):
-        updateAllBackdropsHighlightsHandler(self, BackdropNode, NODE_HIGHLIGHT_COLOR, NODE_DEFAULT_COLOR)
+        return self._backdrop_index.parent_of(node_id)
 
-    def _highlight_node_in_path(self, loop_start_id: str, node_id_to_highlight: str):
-        highlightNodeInPathHandler(self, loop_start_id, node_id_to_highlight, NODE_HIGHLIGHT_COLOR, NODE_DEFAULT_COLOR)
+    def _apply_highlights(self):
+        applyHighlightsHandler(self, NODE_HIGHLIGHT_COLOR, NODE_DEFAULT_COLOR)
 
     def _clear_highlights_for_path(self, loop_start_id: str):
-        clearHighlightsForPathHandler(self, loop_start_id, NODE_HIGHLIGHT_COLOR, NODE_DEFAULT_COLOR)
+        clearHighlightsForPathHandler(self, loop_start_id)
 
 
     # ──────────────────────────────────────────────────────────────────────────
-    # 4.12) Check global hotkeys
+    # 4.12) Start the Start node(s) bound to a global hotkey
     # ──────────────────────────────────────────────────────────────────────────
-    def _check_global_hotkeys(self):
-        keyPressEventHandler(self, StartNode)
+    def _dispatch_hotkey(self, key_str, trigger_ns=None):
+        keyPressEventHandler(self, StartNode, key_str, trigger_ns)
 
 # ──────────────────────────────────────────────────────────────────────────────
 # 5) Bootstrap the QApplication
@@ -355,8 +423,5 @@ if __name__ == '__main__':
     window = AutomationDesigner()
     window.show()
 
-    # Start the overlay async task
-    loop.create_task(overlay_update_loop())
-
     with loop:
         sys.exit(loop.run_forever())
\ No newline at end of file
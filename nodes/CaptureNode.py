@@ -0,0 +1,44 @@
+# nodes/CaptureNode.py
+
+from NodeGraphQt import (
+    BaseNode,
+)
+
+from engine.ExecutionPlan import compileNode
+from engine.PlanRunner import executeInstruction
+
+class CaptureNode(BaseNode):
+    """
+    "Capture Screen" node: grabs a screen region into the path's current frame.
+      • x, y:          Text input (top-left corner of the region)
+      • width, height: Text input (region size, 0 = to the screen edge)
+      • rate:          Text input (max captures per second, 0 = every time the path gets here)
+    """
+    __identifier__ = 'Automation'
+    NODE_NAME = 'Capture Screen'
+
+    def __init__(self):
+        super(CaptureNode, self).__init__()
+        # One input, one output socket
+        self.add_input('in')
+        self.add_output('out')
+
+        self.add_text_input('x', 'X Coordinate')
+        self.add_text_input('y', 'Y Coordinate')
+        self.add_text_input('width', 'Width (0 = full)')
+        self.add_text_input('height', 'Height (0 = full)')
+        self.add_text_input('rate', 'Max Rate (fps, 0 = no limit)')
+
+        # Defaults
+        self.set_property('x', '0')
+        self.set_property('y', '0')
+        self.set_property('width', '0')
+        self.set_property('height', '0')
+        self.set_property('rate', '0')
+
+    def process(self, token=None, **kwargs):
+        """
+        Compile this node on the spot and run it; loops use the precompiled plan instead.
+        """
+        props = {name: self.get_property(name) for name in ('x', 'y', 'width', 'height', 'rate')}
+        executeInstruction(compileNode(self.type_, self.id, props), token)
@@ -4,6 +4,10 @@ from NodeGraphQt import (
     BaseNode,
 )
 
+from shared.Log import getLogger
+
+log = getLogger('nodes.EndNode')
+
 class EndNode(BaseNode):
     """
     “End” node: no properties.
@@ -26,33 +30,4 @@ class EndNode(BaseNode):
         In a real engine, this would mark the loop’s end.
         Here it’s stubbed just to show the ID.
         """
-        print(f"[EndNode: {self.id}] Reached. Repeat: {self.get_property('repeat')}")
-
-        
-    def copy(self):
-        node_pos = self.pos() 
-        try:
-            orig_x, orig_y = node_pos.x(), node_pos.y()
-        except AttributeError: 
-            orig_x, orig_y = node_pos[0], node_pos[1]
-
-        props = {}
-
-        try:
-            all_prop_keys = list(self.properties().keys())
-            for name in all_prop_keys:
-                if name not in ('inputs', 'outputs', 'id'):
-                    val = self.get_property(name)
-                    props[name] = val
-        except Exception as e:
-            print(f"  [EndNode.copy] ERROR during collection from self.properties(): {e}")
-
-        custom_widget_prop_names = ['repeat']
-        for name in custom_widget_prop_names:
-            try:
-                val = self.get_property(name) 
-                props[name] = val
-            except Exception as e:
-                print(f"    [EndNode.copy] ERROR collecting explicitly for '{name}': {e}. It will not be copied.")
-                
-        return (self.id, self.__class__, props, (orig_x, orig_y))
\ No newline at end of file
+        log.debug("[EndNode: %s] Reached. Repeat: %s", self.id, self.get_property('repeat'))
@@ -0,0 +1,52 @@
+# nodes/FindImageNode.py
+
+from NodeGraphQt import (
+    BaseNode,
+)
+
+from engine.ExecutionPlan import compileNode, DEFAULT_FIND_THRESHOLD
+from engine.PlanRunner import executeInstruction
+
+class FindImageNode(BaseNode):
+    """
+    "Find Image" node: searches the path's current frame for a template image
+    and continues at 'found' or 'not found'. Mouse nodes anchored to
+    'Found Image' then act relative to the center of the match.
+      • template:      Text input (path of the image to look for, e.g. a PNG cut from a screenshot)
+      • threshold:     Text input (lowest match confidence that counts as found, 0 - 1)
+      • x, y:          Text input (top-left corner of the search region)
+      • width, height: Text input (search region size, 0 = to the frame edge)
+    Without a Capture Screen node earlier in the same pass (covering the search
+    region), the node captures the search region itself.
+    """
+    __identifier__ = 'Automation'
+    NODE_NAME = 'Find Image'
+
+    def __init__(self):
+        super(FindImageNode, self).__init__()
+        # One input; 'found' first (followed like any node's output), then the branch
+        self.add_input('in')
+        self.add_output('found')
+        self.add_output('not found')
+
+        self.add_text_input('template', 'Template Image')
+        self.add_text_input('threshold', 'Threshold (0 - 1)')
+        self.add_text_input('x', 'Search X')
+        self.add_text_input('y', 'Search Y')
+        self.add_text_input('width', 'Search Width (0 = full)')
+        self.add_text_input('height', 'Search Height (0 = full)')
+
+        # Defaults
+        self.set_property('template', '')
+        self.set_property('threshold', str(DEFAULT_FIND_THRESHOLD))
+        self.set_property('x', '0')
+        self.set_property('y', '0')
+        self.set_property('width', '0')
+        self.set_property('height', '0')
+
+    def process(self, token=None, **kwargs):
+        """
+        Compile this node on the spot and run it; loops use the precompiled plan instead.
+        """
+        props = {name: self.get_property(name) for name in ('template', 'threshold', 'x', 'y', 'width', 'height')}
+        executeInstruction(compileNode(self.type_, self.id, props), token)
@@ -0,0 +1,338 @@
+# shared/GraphFormat.py
+#
+# Graph files on disk:
+#   *.json  - the session dictionary from NodeGraphQt serialize_session(), pretty-printed
+#   *.bamz  - compact form of the same dictionary (see encodeCompact), round-trips to equal JSON
+#
+# Convert between them:
+#     python -m shared.GraphFormat autosave_graph.json autosave_graph.bamz
+#     python -m shared.GraphFormat autosave_graph.bamz autosave_graph.json
+
+import json
+import os
+import sys
+import tempfile
+import zlib
+from collections import Counter
+from itertools import repeat
+
+COMPACT_EXTENSION = '.bamz'
+COMPACT_MAGIC = b'BAMZ'
+COMPACT_VERSION = 1
+
+
+def isCompactPath(file_path):
+    return str(file_path).lower().endswith(COMPACT_EXTENSION)
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Compact encoding
+# ──────────────────────────────────────────────────────────────────────────────
+def _freeze(value):
+    # Hashable stand-in for any JSON value, used to count default candidates
+    return json.dumps(value, sort_keys=True, separators=(',', ':'))
+
+
+def _same(value, default):
+    # Equal and of the same JSON type: True is not 1, 160 is not 160.0
+    if type(value) is not type(default):
+        return False
+    if isinstance(value, (list, dict)):
+        return _freeze(value) == _freeze(default)
+    return value == default
+
+
+def cloneValue(value):
+    if isinstance(value, dict):
+        return {k: cloneValue(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [cloneValue(v) for v in value]
+    return value
+
+
+def _defaults_for(nodes):
+    """
+    Per key, the most common value among nodes of one type (key order of the first node).
+    """
+    keys = []
+    counts = {}
+    for node in nodes:
+        for k, v in node.items():
+            if k not in counts:
+                keys.append(k)
+                counts[k] = Counter()
+            counts[k][_freeze(v)] += 1
+    defaults = {}
+    for k in keys:
+        frozen, count = counts[k].most_common(1)[0]
+        if count * 2 > len(nodes) or len(nodes) == 1:
+            defaults[k] = json.loads(frozen)
+    return defaults
+
+
+_MISSING = object()
+
+
+def _copier(value):
+    # Fast copy for template values that are lists/dicts, so nodes never share them
+    if isinstance(value, list):
+        return list if not any(isinstance(v, (list, dict)) for v in value) else cloneValue
+    if isinstance(value, dict):
+        return dict if not any(isinstance(v, (list, dict)) for v in value.values()) else cloneValue
+    return None
+
+
+def encodeCompact(session) -> bytes:
+    """
+    Nodes are grouped by type. Each type stores its default properties once;
+    every property that differs from the default in any node becomes a column
+    (nested one level, so e.g. only the varying 'custom' properties are stored).
+    Node ids, type names and port names are interned, connections are stored
+    as a flat list of indices, and the whole payload is zlib-compressed.
+    """
+    strings = []
+    string_index = {}
+
+    def intern(s):
+        idx = string_index.get(s)
+        if idx is None:
+            idx = string_index[s] = len(strings)
+            strings.append(s)
+        return idx
+
+    nodes = session.get('nodes', {}) or {}
+
+    by_type = {}       # type_ -> [(node_id, node), ...]
+    type_index = {}
+    seq = []           # block index of every node, in session order
+    node_position = {}
+    for node_id, node in nodes.items():
+        type_ = node.get('type_')
+        if type_ not in type_index:
+            type_index[type_] = len(by_type)
+            by_type[type_] = []
+        by_type[type_].append((node_id, node))
+        node_position[node_id] = len(seq)
+        seq.append(type_index[type_])
+
+    blocks = []
+    for typed in by_type.values():
+        typed_nodes = [node for _, node in typed]
+        defaults = _defaults_for(typed_nodes)
+
+        # Keys holding a dict in every node (e.g. 'custom') get nested defaults and columns
+        nested_keys = []
+        for k in typed_nodes[0]:
+            if all(isinstance(n.get(k), dict) for n in typed_nodes):
+                defaults[k] = _defaults_for([n[k] for n in typed_nodes])
+                nested_keys.append(k)
+
+        columns = {}
+        nested_columns = {}
+        missing = []   # [row, key] or [row, key, subkey] for properties a node does not have
+        extra_keys = []
+        for n in typed_nodes:
+            for k in n:
+                if k not in defaults and k not in extra_keys:
+                    extra_keys.append(k)
+
+        for k in list(defaults) + extra_keys:
+            if k in nested_keys:
+                sub_keys = list(defaults[k])
+                for n in typed_nodes:
+                    sub_keys += [sk for sk in n[k] if sk not in sub_keys]
+                for sk in sub_keys:
+                    default = defaults[k].get(sk, _MISSING)
+                    values = [n[k].get(sk, _MISSING) for n in typed_nodes]
+                    if all(v is not _MISSING and _same(v, default) for v in values):
+                        continue
+                    for row, v in enumerate(values):
+                        if v is _MISSING:
+                            missing.append([row, k, sk])
+                    nested_columns.setdefault(k, {})[sk] = [None if v is _MISSING else v for v in values]
+                continue
+
+            default = defaults.get(k, _MISSING)
+            values = [n.get(k, _MISSING) for n in typed_nodes]
+            if all(v is not _MISSING and _same(v, default) for v in values):
+                continue
+            for row, v in enumerate(values):
+                if v is _MISSING:
+                    missing.append([row, k])
+            columns[k] = [None if v is _MISSING else v for v in values]
+
+        block = {
+            'defaults': defaults,
+            'ids': [intern(node_id) for node_id, _ in typed],
+            'columns': columns,
+            'nested': nested_columns,
+        }
+        if missing:
+            block['missing'] = missing
+        blocks.append(block)
+
+    def node_ref(node_id):
+        pos = node_position.get(node_id)
+        return pos if pos is not None else -1 - intern(node_id)
+
+    connections = session.get('connections', []) or []
+    flat_connections = []
+    plain_connections = True
+    for conn in connections:
+        if set(conn) != {'out', 'in'}:
+            plain_connections = False
+            break
+        (out_id, out_port), (in_id, in_port) = conn['out'], conn['in']
+        flat_connections += [node_ref(out_id), intern(out_port), node_ref(in_id), intern(in_port)]
+
+    payload = {
+        'v': COMPACT_VERSION,
+        'blocks': blocks,
+        'seq': seq,
+        'extra': {k: v for k, v in session.items() if k not in ('nodes', 'connections')},
+        'order': list(session.keys()),
+    }
+    if plain_connections:
+        payload['connections'] = flat_connections
+    else:
+        payload['raw_connections'] = connections
+    payload['strings'] = strings
+
+    raw = json.dumps(payload, separators=(',', ':')).encode('utf-8')
+    return COMPACT_MAGIC + bytes([COMPACT_VERSION]) + zlib.compress(raw, 9)
+
+
+def _rows(defaults, columns, count):
+    """
+    count dicts holding defaults overlaid with one entry of every column
+    (new keys in column order). List/dict defaults are copied per row, so
+    nodes never share them.
+    """
+    rows = list(map(dict.copy, repeat(defaults, count)))
+    for k, default in defaults.items():
+        copy = _copier(default)
+        if copy is not None and k not in columns:
+            for row, value in zip(rows, map(copy, repeat(default, count))):
+                row[k] = value
+    for k, column in columns.items():
+        for row, value in zip(rows, column):
+            row[k] = value
+    return rows
+
+
+def _decode_block(block, strings):
+    ids = block['ids']
+    count = len(ids)
+    columns = dict(block['columns'])
+    for k, sub_columns in block['nested'].items():
+        columns[k] = _rows(block['defaults'][k], sub_columns, count)
+    nodes = _rows(block['defaults'], columns, count)
+
+    for row, k, *sk in block.get('missing', ()):
+        if sk:
+            del nodes[row][k][sk[0]]
+        else:
+            del nodes[row][k]
+
+    return [strings[i] for i in ids], nodes
+
+
+def decodeCompact(data: bytes):
+    if data[:4] != COMPACT_MAGIC:
+        raise ValueError("not a compact BAM graph file")
+    if data[4] != COMPACT_VERSION:
+        raise ValueError(f"unsupported compact graph version {data[4]}")
+    payload = json.loads(zlib.decompress(data[5:]))
+    strings = payload['strings']
+
+    # Every block's (id, node) pairs, dealt out again in session order
+    pulls = []
+    for block in payload['blocks']:
+        block_ids, block_nodes = _decode_block(block, strings)
+        pulls.append(zip(block_ids, block_nodes).__next__)
+    pairs = [pulls[block_idx]() for block_idx in payload['seq']]
+    nodes = dict(pairs)
+
+    if 'connections' in payload:
+        flat = payload['connections']
+        ids = [node_id for node_id, _ in pairs]
+        refs = [ids[r] if r >= 0 else strings[-1 - r] for r in flat[0::2]]
+        ports = [strings[p] for p in flat[1::2]]
+        connections = [
+            {'out': [out_ref, out_port], 'in': [in_ref, in_port]}
+            for out_ref, out_port, in_ref, in_port in zip(refs[0::2], ports[0::2], refs[1::2], ports[1::2])
+        ]
+    else:
+        connections = payload['raw_connections']
+
+    parts = dict(payload['extra'])
+    parts['nodes'] = nodes
+    parts['connections'] = connections
+    return {k: parts[k] for k in payload['order'] if k in parts}
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Files
+# ──────────────────────────────────────────────────────────────────────────────
+def atomicWrite(file_path, data: bytes):
+    """
+    Write data to file_path through a temp file in the same directory,
+    fsync it, then rename it over the target. A crash mid-write leaves the
+    previous file intact instead of a truncated one.
+    """
+    directory = os.path.dirname(os.path.abspath(file_path))
+    fd, tmp_path = tempfile.mkstemp(prefix='.' + os.path.basename(file_path) + '.', suffix='.tmp', dir=directory)
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, file_path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+def encodeGraphFile(file_path, session) -> bytes:
+    """
+    Bytes to write for file_path; the format is chosen by extension.
+    """
+    if isCompactPath(file_path):
+        return encodeCompact(session)
+    return json.dumps(session, indent=4).encode('utf-8')
+
+
+def decodeGraphFile(data: bytes):
+    """
+    Session dictionary from either format (detected by content, not name).
+    """
+    if data[:4] == COMPACT_MAGIC:
+        return decodeCompact(data)
+    return json.loads(data)
+
+
+def loadGraphFile(file_path):
+    with open(file_path, 'rb') as f:
+        return decodeGraphFile(f.read())
+
+
+def saveGraphFile(file_path, session) -> bytes:
+    data = encodeGraphFile(file_path, session)
+    atomicWrite(file_path, data)
+    return data
+
+
+def convertGraphFile(src_path, dst_path):
+    atomicWrite(dst_path, encodeGraphFile(dst_path, loadGraphFile(src_path)))
+
+
+if __name__ == '__main__':
+    if len(sys.argv) != 3:
+        print("usage: python -m shared.GraphFormat <source.json|.bamz> <target.json|.bamz>")
+        sys.exit(2)
+    convertGraphFile(sys.argv[1], sys.argv[2])
+    print(f"[GraphFormat] {sys.argv[1]} ({os.path.getsize(sys.argv[1])} bytes) -> "
+          f"{sys.argv[2]} ({os.path.getsize(sys.argv[2])} bytes)")
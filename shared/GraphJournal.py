@@ -0,0 +1,182 @@
+# shared/GraphJournal.py
+#
+# Append-only edit journal kept next to a graph file (<graph file>.journal).
+# One JSON record per line:
+#   ["base", crc32, size]                          - snapshot the journal applies to (first line)
+#   ["n", node_id, node_data]                      - node added (or replaced)
+#   ["u", node_id, {key: value}, {key: {sub: v}}]  - node properties changed (nested one level)
+#   ["d", node_id]                                 - node removed, with its connections
+#   ["c", out_id, out_port, in_id, in_port]        - ports connected
+#   ["x", out_id, out_port, in_id, in_port]        - ports disconnected
+#
+# Loading a graph = snapshot + replay of the journal. Compaction writes a new
+# snapshot and removes the journal.
+
+import json
+import os
+import zlib
+
+from shared.GraphFormat import decodeGraphFile
+
+JOURNAL_SUFFIX = '.journal'
+
+
+def journalPathFor(file_path):
+    return str(file_path) + JOURNAL_SUFFIX
+
+
+def snapshotBase(data: bytes):
+    """
+    Identity of a snapshot's bytes; a journal only replays onto the snapshot it was written for.
+    """
+    return [zlib.crc32(data), len(data)]
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Records
+# ──────────────────────────────────────────────────────────────────────────────
+def connectionKey(conn):
+    return (conn['out'][0], conn['out'][1], conn['in'][0], conn['in'][1])
+
+
+def diffNode(node_id, old, new):
+    """
+    Record turning old node data into new, or None if they are equal.
+    """
+    if old is None:
+        return ['n', node_id, new]
+    if old == new:
+        return None
+    if any(k not in new for k in old):
+        return ['n', node_id, new]
+
+    changed = {}
+    nested = {}
+    for k, v in new.items():
+        old_v = old.get(k)
+        if old_v == v:
+            continue
+        if isinstance(v, dict) and isinstance(old_v, dict) and all(sk in v for sk in old_v):
+            nested[k] = {sk: sv for sk, sv in v.items() if sk not in old_v or old_v[sk] != sv}
+        else:
+            changed[k] = v
+    return ['u', node_id, changed, nested] if nested else ['u', node_id, changed]
+
+
+def diffConnections(old_keys, new_keys):
+    records = [['x', *key] for key in old_keys if key not in new_keys]
+    records += [['c', *key] for key in new_keys if key not in old_keys]
+    return records
+
+
+def applyRecords(session, records):
+    """
+    Apply journal records to a session dictionary in place. Returns the number applied.
+    """
+    nodes = session.setdefault('nodes', {})
+    connections = {}
+    keys_of = {}   # node_id -> connection keys touching it
+    for conn in session.get('connections', []) or []:
+        key = connectionKey(conn)
+        connections[key] = conn
+        keys_of.setdefault(key[0], set()).add(key)
+        keys_of.setdefault(key[2], set()).add(key)
+
+    applied = 0
+    for record in records:
+        op = record[0]
+        if op == 'n':
+            nodes[record[1]] = record[2]
+        elif op == 'u':
+            node = nodes.get(record[1])
+            if node is None:
+                continue
+            node.update(record[2])
+            for k, sub in (record[3] if len(record) > 3 else {}).items():
+                node.setdefault(k, {}).update(sub)
+        elif op == 'd':
+            nodes.pop(record[1], None)
+            for key in keys_of.pop(record[1], ()):
+                connections.pop(key, None)
+        elif op == 'c':
+            key = tuple(record[1:5])
+            connections.setdefault(key, {'out': [key[0], key[1]], 'in': [key[2], key[3]]})
+            keys_of.setdefault(key[0], set()).add(key)
+            keys_of.setdefault(key[2], set()).add(key)
+        elif op == 'x':
+            connections.pop(tuple(record[1:5]), None)
+        else:
+            continue
+        applied += 1
+
+    session['connections'] = list(connections.values())
+    return applied
+
+
+def encodeRecords(records) -> bytes:
+    return b''.join(json.dumps(r, separators=(',', ':')).encode('utf-8') + b'\n' for r in records)
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Files
+# ──────────────────────────────────────────────────────────────────────────────
+def readJournal(journal_path):
+    """
+    (base, records) of a journal file. A torn last line (crash mid-append) ends the read.
+    """
+    base = None
+    records = []
+    try:
+        with open(journal_path, 'rb') as f:
+            for line in f:
+                if not line.endswith(b'\n'):
+                    break
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    break
+                if record and record[0] == 'base':
+                    base = record[1:3]
+                else:
+                    records.append(record)
+    except FileNotFoundError:
+        pass
+    return base, records
+
+
+def appendJournal(journal_path, data: bytes, base=None):
+    """
+    Append encoded records and fsync. base is written first if the journal is new.
+    """
+    with open(journal_path, 'ab') as f:
+        if f.tell() == 0 and base is not None:
+            f.write(encodeRecords([['base', *base]]))
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+
+
+def removeJournal(journal_path):
+    try:
+        os.unlink(journal_path)
+    except FileNotFoundError:
+        pass
+
+
+def loadGraphWithJournal(file_path):
+    """
+    Session from file_path with its journal replayed on top.
+    Returns (session, base of the snapshot, number of records replayed).
+    """
+    with open(file_path, 'rb') as f:
+        data = f.read()
+    session = decodeGraphFile(data)
+    base = snapshotBase(data)
+
+    journal_base, records = readJournal(journalPathFor(file_path))
+    if not records:
+        return session, base, 0
+    if journal_base != base:
+        print(f"[Journal] Ignoring {journalPathFor(file_path)}: it belongs to a different snapshot")
+        return session, base, 0
+    return session, base, applyRecords(session, records)
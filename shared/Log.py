@@ -0,0 +1,215 @@
+# shared/Log.py
+#
+# Leveled logging for the hot paths (node execution, hotkeys, loop
+# iterations). A filtered-out call costs one attribute compare; an accepted
+# one appends (time, level, logger, format, args) to a bounded deque and
+# returns - formatting and writing happen on a background sink thread, so a
+# slow terminal never stalls a path. If the sink falls behind, the oldest
+# records are dropped (and counted) instead of blocking.
+#
+#   log = getLogger('engine.PlanRunner')
+#   log.debug("[DelayNode: %s] Beginning %d ms delay.", node_id, ms)
+
+import atexit
+import sys
+import threading
+import time
+from collections import deque
+
+DEBUG   = 10
+INFO    = 20
+WARNING = 30
+ERROR   = 40
+OFF     = 100
+
+LEVEL_NAMES = {'debug': DEBUG, 'info': INFO, 'warning': WARNING, 'error': ERROR, 'off': OFF}
+_LEVEL_TAGS = {DEBUG: 'DEBUG', INFO: 'INFO', WARNING: 'WARNING', ERROR: 'ERROR'}
+
+# Top-level areas, as offered in the View ▸ Logging menu
+AREAS = ['engine', 'nodes', 'handlers', 'AutomationDesigner', 'shared']
+
+RING_SIZE = 65536
+SINK_INTERVAL_S = 0.05
+
+_ring = deque(maxlen=RING_SIZE)
+_appended = 0
+_written = 0
+
+_loggers = {}
+_levels = {'': INFO}   # logger name prefix → level; '' is the default
+_registry_lock = threading.Lock()
+
+
+class Logger:
+    """
+    Named logger. .level is the effective level, resolved from the most
+    specific setLevel() prefix whenever levels change (never per call).
+    """
+    __slots__ = ('name', 'level')
+
+    def __init__(self, name, level):
+        self.name = name
+        self.level = level
+
+    def isEnabledFor(self, level):
+        return level >= self.level
+
+    def _log(self, level, fmt, args):
+        global _appended
+        _appended += 1
+        _ring.append((time.time(), level, self.name, fmt, args))
+        if _sink.idle:
+            _sink.wake()
+
+    def debug(self, fmt, *args):
+        if self.level <= DEBUG:
+            self._log(DEBUG, fmt, args)
+
+    def info(self, fmt, *args):
+        if self.level <= INFO:
+            self._log(INFO, fmt, args)
+
+    def warning(self, fmt, *args):
+        if self.level <= WARNING:
+            self._log(WARNING, fmt, args)
+
+    def error(self, fmt, *args):
+        if self.level <= ERROR:
+            self._log(ERROR, fmt, args)
+
+
+def _effective_level(name):
+    best, level = -1, _levels['']
+    for prefix, prefix_level in _levels.items():
+        if prefix and (name == prefix or name.startswith(prefix + '.')) and len(prefix) > best:
+            best, level = len(prefix), prefix_level
+    return level
+
+
+def getLogger(name):
+    logger = _loggers.get(name)
+    if logger is None:
+        with _registry_lock:
+            logger = _loggers.get(name)
+            if logger is None:
+                logger = _loggers[name] = Logger(name, _effective_level(name))
+    return logger
+
+
+def toLevel(level):
+    """
+    DEBUG ... OFF from a number or a name ('debug', 'INFO', ...).
+    """
+    if isinstance(level, int):
+        return level
+    try:
+        return LEVEL_NAMES[str(level).strip().lower()]
+    except KeyError:
+        raise ValueError(f"unknown log level '{level}' (choose from {', '.join(LEVEL_NAMES)})")
+
+
+def setLevel(prefix, level):
+    """
+    Level for every logger named prefix or prefix.* ('' = everything not set more specifically).
+    """
+    with _registry_lock:
+        _levels[prefix] = toLevel(level)
+        for logger in _loggers.values():
+            logger.level = _effective_level(logger.name)
+
+
+def getLevel(prefix=''):
+    return _levels.get(prefix, _effective_level(prefix))
+
+
+def configure(spec):
+    """
+    Apply a CLI level spec: 'debug', or 'engine=debug,handlers=warning', or both ('info,engine=debug').
+    """
+    for part in filter(None, (p.strip() for p in spec.split(','))):
+        prefix, _, level = part.rpartition('=')
+        setLevel(prefix.strip(), level)
+
+
+def stats():
+    """
+    Record counts (approximate while several threads log at once).
+    """
+    return {'logged': _appended, 'written': _written, 'dropped': max(0, _appended - _written - len(_ring))}
+
+
+def _format(record):
+    created, level, name, fmt, args = record
+    try:
+        message = fmt % args if args else fmt
+    except Exception as e:
+        message = f"{fmt!r} % {args!r} ({type(e).__name__})"
+    if level >= WARNING:
+        return f"{_LEVEL_TAGS[level]}: {message}"
+    return message
+
+
+class _Sink:
+    """
+    Background thread draining the ring to stdout every SINK_INTERVAL_S while
+    records keep coming. Once the ring is empty it sleeps until the next record
+    (only that first record pays for waking it), so an idle app has no wakeups.
+    """
+
+    def __init__(self):
+        self.idle = True
+        self._thread = None
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+
+    def wake(self):
+        if self._thread is None:
+            with _registry_lock:
+                if self._thread is None:
+                    self._thread = threading.Thread(target=self._run, name='LogSink', daemon=True)
+                    self._thread.start()
+        self._wake.set()
+
+    def _run(self):
+        while True:
+            if not _ring:
+                self.idle = True
+                # A record appended just before idle was set did not wake us: look again
+                if not _ring:
+                    self._wake.wait()
+                self._wake.clear()
+                self.idle = False
+            time.sleep(SINK_INTERVAL_S)
+            with self._lock:
+                self.drain()
+
+    def drain(self):
+        global _written
+        lines = []
+        while True:
+            try:
+                lines.append(_format(_ring.popleft()))
+            except IndexError:
+                break
+        if not lines:
+            return
+        _written += len(lines)
+        try:
+            sys.stdout.write('\n'.join(lines) + '\n')
+            sys.stdout.flush()
+        except Exception:
+            pass  # stdout gone (closed pipe, no console): the records are simply lost
+
+
+_sink = _Sink()
+
+
+def flush():
+    """
+    Write out everything logged so far (on the calling thread).
+    """
+    with _sink._lock:
+        _sink.drain()
+
+
+atexit.register(flush)
@@ -2,33 +2,81 @@
 
 _initialized = False
 version = ""
-hard_start = False
-hard_stop = False
-show_coords = False 
-mouse_x = 0
-mouse_y = 0
+overlay_mode = 'Corner'
+overlay_show_color = False
+timing_spin_window_ms = 2.0
+highlight_refresh_hz = 30
+autosave_debounce_ms = 1000
+journal_compact_records = 1000
+executor = 'threads'
+input_backend = 'pynput'
+record_move_tolerance_px = 3.0
+record_min_delay_ms = 20
+mouse_motion_hz = 500
+log_levels = 'info'
+trace_capacity = 1 << 20
+capture_backend = 'auto'
 
 _desired_key_strings = []       
 KEY_NAMES_AVAILABLE = []        
-GLOBAL_KEY_PRESS_STATE = {}
 
 
 def init():
     global version
-    global hard_start, hard_stop
-    global show_coords, mouse_x, mouse_y
+    global overlay_mode, overlay_show_color
+    global timing_spin_window_ms, highlight_refresh_hz
+    global autosave_debounce_ms, journal_compact_records
+    global executor, input_backend
+    global record_move_tolerance_px, record_min_delay_ms
+    global mouse_motion_hz, log_levels, trace_capacity
+    global capture_backend
     global _desired_key_strings
     global KEY_NAMES_AVAILABLE
-    global GLOBAL_KEY_PRESS_STATE
 
     version = "0.1.8alpha"
 
-    hard_start  = False
-    hard_stop   = False
+    # F3 coordinates overlay: 'Corner' (top-right of the screen) or 'Follow' (next to the
+    # cursor), optionally with the pixel color under the cursor
+    overlay_mode = 'Corner'
+    overlay_show_color = False
 
-    show_coords = False
-    mouse_x     = 0
-    mouse_y     = 0
+    # Delays sleep until this many ms before their deadline, then busy-wait the rest
+    timing_spin_window_ms = 2.0
+
+    # How many times per second running-node highlights are repainted
+    highlight_refresh_hz = 30
+
+    # Edits within this window are coalesced into a single background auto-save
+    autosave_debounce_ms = 1000
+
+    # Auto-saves append edits to <graph>.journal; after this many records it is folded into a full save
+    journal_compact_records = 1000
+
+    # How Start paths run: 'threads' (one thread each) or 'asyncio' (coroutines on the
+    # app's event loop with a single input-injector thread - scales to many paths)
+    executor = 'threads'
+
+    # Where key/mouse input goes: 'pynput' (real input), 'recording' or 'null' (no display needed)
+    input_backend = 'pynput'
+
+    # Record mode: recorded mouse paths keep only points more than this many px off the
+    # simplified path, and idle gaps shorter than this many ms get no Delay node
+    record_move_tolerance_px = 3.0
+    record_min_delay_ms = 20
+
+    # Cursor updates per second while a Mouse node glides or drags (Move Time > 0)
+    mouse_motion_hz = 500
+
+    # Log levels at startup (shared/Log.configure spec): 'info' hides the per-node/per-key
+    # messages, 'info,engine=debug' shows every node step; changeable from View ▸ Logging
+    log_levels = 'info'
+
+    # Records kept by one trace (Trace button / headless --trace); later ones are dropped
+    trace_capacity = 1 << 20
+
+    # Where Capture Screen nodes grab from: 'auto' (X11 shared memory / Windows GDI, whichever
+    # this machine has), 'xshm', 'x11' (plain XGetImage), 'gdi' or 'null' (black frames, no display)
+    capture_backend = 'auto'
 
     _desired_key_strings = [
         # Alphabetic
@@ -91,8 +139,6 @@ def init():
             unique_ordered_keys.append(key_str)
             seen_keys.add(key_str)
     KEY_NAMES_AVAILABLE = ['None'] + unique_ordered_keys
-    
-    GLOBAL_KEY_PRESS_STATE = {key_str: False for key_str in unique_ordered_keys}
 
 
 
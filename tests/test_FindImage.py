@@ -0,0 +1,80 @@
+# tests/test_FindImage.py
+#
+# Find Image searches what is on screen now: its own capture every time, or a
+# Capture Screen frame from the same pass that covers its search region.
+
+import numpy as np
+import pytest
+
+from engine import ScreenCapture
+from engine.ExecutionPlan import compileNode
+from engine.PlanRunner import executeInstruction
+from engine.RunToken import RunToken
+from engine.ScreenCapture import NullGrabber
+
+FOUND, NOT_FOUND = 1, 2
+
+
+@pytest.fixture
+def screen(tmp_path):
+    rng = np.random.default_rng(7)
+    image = rng.integers(0, 256, (240, 320, 4), dtype=np.uint8)
+    template = image[100:132, 150:190, :3][:, :, ::-1].copy()  # BGRA -> RGB
+    path = tmp_path / 'template.npy'
+    np.save(path, template)
+
+    grabber = NullGrabber(np.zeros_like(image))
+    previous = ScreenCapture.activeGrabber()
+    ScreenCapture.setGrabber(grabber)
+    yield grabber, image, str(path)
+    ScreenCapture.setGrabber(previous)
+
+
+def _find(template_path, x=0, y=0, width=0, height=0):
+    instr = compileNode('Automation.FindImageNode', 'find', {
+        'template': template_path, 'threshold': '0.9',
+        'x': str(x), 'y': str(y), 'width': str(width), 'height': str(height),
+    })
+    return instr._replace(next=FOUND, jump=NOT_FOUND)
+
+
+def _capture(x=0, y=0, width=0, height=0):
+    return compileNode('Automation.CaptureNode', 'capture', {
+        'x': str(x), 'y': str(y), 'width': str(width), 'height': str(height), 'rate': '0',
+    })
+
+
+def test_searches_a_fresh_capture_every_run(screen):
+    grabber, image, template_path = screen
+    token, find = RunToken(), _find(template_path)
+
+    assert executeInstruction(find, token) == NOT_FOUND
+    assert ScreenCapture.lastMatch(token) is None
+
+    grabber.screen = image
+    assert executeInstruction(find, token) == FOUND
+    match = ScreenCapture.lastMatch(token)
+    assert (match.left, match.top) == (150, 100)
+    assert match.confidence > 0.99
+
+
+def test_capture_frame_counts_only_for_its_pass(screen):
+    grabber, image, template_path = screen
+    token, find = RunToken(), _find(template_path)
+
+    executeInstruction(_capture(), token)
+    grabber.screen = image
+    # Same pass: the (blank) Capture Screen frame is what gets searched
+    assert executeInstruction(find, token) == NOT_FOUND
+
+    ScreenCapture.newPass(token)
+    assert executeInstruction(find, token) == FOUND
+
+
+def test_capture_not_covering_the_search_region_is_not_used(screen):
+    grabber, image, template_path = screen
+    token = RunToken()
+
+    executeInstruction(_capture(0, 0, 100, 100), token)
+    grabber.screen = image
+    assert executeInstruction(_find(template_path, 120, 80, 120, 80), token) == FOUND
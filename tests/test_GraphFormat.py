@@ -0,0 +1,63 @@
+# tests/test_GraphFormat.py
+#
+# The compact .bamz form must decode to exactly the session it was made from,
+# value types included.
+
+import json
+
+from shared.GraphFormat import encodeCompact, decodeCompact
+
+
+def _node(type_, **props):
+    node = {'type_': type_, 'width': 160.0, 'height': 120.0, 'color': [13, 18, 23, 255],
+            'pos': [0.0, 0.0], 'custom': {}}
+    node.update(props)
+    return node
+
+
+def _assert_round_trip(session):
+    decoded = decodeCompact(encodeCompact(session))
+    assert json.dumps(decoded, sort_keys=True) == json.dumps(session, sort_keys=True)
+
+
+def test_mixed_bool_int_float_values():
+    session = {
+        'nodes': {
+            'a': _node('Automation.T', x=True, flag=1, width=160, custom={'v': 1, 'on': True}),
+            'b': _node('Automation.T', x=1, flag=True, custom={'v': 1.0, 'on': 1}),
+            'c': _node('Automation.T', x=1, flag=1, custom={'v': 1, 'on': True}),
+            'd': _node('Automation.T', x=1.0, flag=False, height=120, custom={'v': True, 'on': 0}),
+        },
+        'connections': [{'out': ['a', 'out'], 'in': ['b', 'in']}],
+    }
+    _assert_round_trip(session)
+
+
+def test_nested_lists_and_missing_properties():
+    session = {
+        'nodes': {
+            'a': _node('Automation.T', pos=[1, 2.5], custom={'key': 'A', 'list': [1, True]}),
+            'b': _node('Automation.T', custom={'key': 'B', 'list': [1.0, 1]}),
+            'c': {'type_': 'Automation.T', 'custom': {'key': 'C'}},
+        },
+        'connections': [],
+    }
+    _assert_round_trip(session)
+    decoded = decodeCompact(encodeCompact(session))
+    assert decoded['nodes']['a']['color'] is not decoded['nodes']['b']['color']
+
+
+def test_previous_format_still_loads():
+    # Written before 'custom' became nested columns when it has no common value
+    from shared.GraphFormat import COMPACT_MAGIC, COMPACT_VERSION
+    import zlib
+    payload = {'v': 1, 'blocks': [{'defaults': {'type_': 'Automation.T'}, 'ids': [0, 1],
+                                   'columns': {'custom': [{'key': 'A'}, {'key': 'B'}]}, 'nested': {}}],
+               'seq': [0, 0], 'extra': {}, 'order': ['nodes', 'connections'],
+               'connections': [0, 2, 1, 3], 'strings': ['a', 'b', 'out', 'in']}
+    data = COMPACT_MAGIC + bytes([COMPACT_VERSION]) + zlib.compress(json.dumps(payload).encode())
+    assert decodeCompact(data) == {
+        'nodes': {'a': {'type_': 'Automation.T', 'custom': {'key': 'A'}},
+                  'b': {'type_': 'Automation.T', 'custom': {'key': 'B'}}},
+        'connections': [{'out': ['a', 'out'], 'in': ['b', 'in']}],
+    }
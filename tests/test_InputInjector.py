@@ -0,0 +1,51 @@
+# tests/test_InputInjector.py
+#
+# Posting from many threads at once: every event is counted, and once
+# flush() returns nothing is pending any more.
+
+import threading
+
+import pytest
+
+from engine.InputBackend import RecordingBackend
+from engine.InputInjector import InputInjector, KEY_DOWN, MOVE
+
+THREADS = 4
+POSTS = 20_000
+
+
+@pytest.mark.parametrize('coalesce_moves', [True, False])
+def test_counts_are_consistent_after_flush(coalesce_moves):
+    injector = InputInjector(RecordingBackend(keep_events=False), coalesce_moves=coalesce_moves)
+
+    def post_many():
+        for i in range(POSTS):
+            if i % 3:
+                injector.post(MOVE, i, i)
+            else:
+                injector.post(KEY_DOWN, 'a')
+
+    threads = [threading.Thread(target=post_many) for _ in range(THREADS)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    try:
+        assert injector.flush(timeout=10)
+        assert injector.posted == injector.handled == THREADS * POSTS
+        assert not injector.pending()
+        assert injector.injected + injector.coalesced == THREADS * POSTS
+    finally:
+        injector.close()
+
+
+def test_nothing_pending_once_flush_returns():
+    injector = InputInjector(RecordingBackend(keep_events=False))
+    try:
+        for i in range(2_000):
+            injector.post(MOVE, i, i)
+            assert injector.flush(timeout=10)
+            assert not injector.pending(), i
+    finally:
+        injector.close()
@@ -0,0 +1,64 @@
+# tests/test_MotionOrigin.py
+#
+# A glide or drag must start where the previous move left the cursor, even
+# while that move is still queued in the InputInjector.
+
+from engine import InputActions
+from engine.InputBackend import RecordingBackend
+from engine.ExecutionPlan import compileNode
+from engine.PlanRunner import executeInstruction
+from engine.RunToken import RunToken
+from engine.Timing import PathTimer
+
+
+def _mouse(node_id, button, x, y, move_ms=0):
+    return compileNode('Automation.MouseNode', node_id, {
+        'x': str(x), 'y': str(y), 'button': button, 'hold': '0',
+        'move_ms': str(move_ms), 'easing': 'Linear', 'anchor': 'Screen',
+    })
+
+
+def _moves_after(button, runs=50):
+    """
+    Move(500, 500), then a 20 ms glide/drag to (600, 500); every recorded move, per run.
+    """
+    backend = RecordingBackend()
+    injector = InputActions.setBackend(backend)
+    results = []
+    try:
+        for _ in range(runs):
+            backend.position = (0, 0)
+            backend.clear()
+            token, timer = RunToken(), PathTimer()
+            executeInstruction(_mouse('move', 'Move', 500, 500), token, timer)
+            executeInstruction(_mouse('glide', button, 600, 500, move_ms=20), token, timer)
+            injector.flush()
+            results.append([args for _, op, args in backend.events if op == 'move'])
+    finally:
+        InputActions.setBackend(RecordingBackend(keep_events=False))
+    return results
+
+
+def _assert_starts_at_previous_move(results):
+    for moves in results:
+        assert moves[-1] == (600, 500)
+        for x, y in moves:
+            assert y == 500 and 500 <= x <= 600, moves
+
+
+def test_glide_starts_at_queued_move():
+    _assert_starts_at_previous_move(_moves_after('Move'))
+
+
+def test_drag_starts_at_queued_move():
+    _assert_starts_at_previous_move(_moves_after('Drag'))
+
+
+def test_cursor_position_without_posted_moves():
+    backend = RecordingBackend()
+    backend.position = (12, 34)
+    InputActions.setBackend(backend)
+    try:
+        assert InputActions.motionOrigin() == (12, 34)
+    finally:
+        InputActions.setBackend(RecordingBackend(keep_events=False))
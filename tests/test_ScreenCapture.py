@@ -0,0 +1,109 @@
+# tests/test_ScreenCapture.py
+#
+# Capture through the 'null' grabber: reused buffers, clipping to the screen
+# and the rate-limit period grid.
+
+import os
+import sys
+
+import numpy as np
+import pytest
+
+from engine import ScreenCapture
+from engine.RunToken import RunToken
+from engine.ScreenCapture import NullGrabber, createGrabber, clipRegion, captureRegion, captureWaitMs
+
+MS = 1_000_000
+
+
+@pytest.fixture
+def grabber():
+    screen = np.arange(120 * 160 * 4, dtype=np.uint32).astype(np.uint8).reshape(120, 160, 4)
+    grabber = NullGrabber(screen)
+    previous = ScreenCapture.activeGrabber()
+    ScreenCapture.setGrabber(grabber)
+    yield grabber
+    ScreenCapture.setGrabber(previous)
+
+
+class _Clock:
+    def __init__(self, now_ns):
+        self.now_ns = now_ns
+
+    def __call__(self):
+        return self.now_ns
+
+
+def test_clip_region():
+    assert clipRegion(10, 20, 30, 40, (160, 120)) == (10, 20, 30, 40)
+    assert clipRegion(0, 0, 0, 0, (160, 120)) == (0, 0, 160, 120)
+    assert clipRegion(-10, 100, 50, 50, (160, 120)) == (0, 100, 40, 20)
+    assert clipRegion(150, 0, 0, 10, (160, 120)) == (150, 0, 10, 10)
+    assert clipRegion(200, 0, 10, 10, (160, 120)) is None
+
+
+def test_buffer_is_reused_across_captures(grabber):
+    token = RunToken()
+    first = captureRegion(token, 'capture', 10, 20, 30, 40)
+    pixels = first.pixels
+    np.testing.assert_array_equal(pixels, grabber.screen[20:60, 10:40])
+
+    grabber.screen = grabber.screen[::-1].copy()
+    second = captureRegion(token, 'capture', 10, 20, 30, 40)
+    assert second is first and second.pixels is pixels
+    np.testing.assert_array_equal(pixels, grabber.screen[20:60, 10:40])
+
+    # A new size gets a new buffer; other nodes and paths have their own
+    assert captureRegion(token, 'capture', 10, 20, 31, 40) is not first
+    assert captureRegion(token, 'other', 10, 20, 30, 40) is not first
+    assert captureRegion(RunToken(), 'capture', 10, 20, 30, 40) is not first
+
+
+def test_capture_is_clipped_to_the_screen(grabber):
+    token = RunToken()
+    frame = captureRegion(token, 'capture', 140, 100, 50, 50)
+    assert (frame.x, frame.y, frame.width, frame.height) == (140, 100, 20, 20)
+    np.testing.assert_array_equal(frame.pixels, grabber.screen[100:120, 140:160])
+    assert captureRegion(token, 'off', 500, 500, 10, 10) is None
+
+
+def test_rate_limit_follows_a_period_grid(grabber, monkeypatch):
+    clock = _Clock(1000 * MS)
+    monkeypatch.setattr(ScreenCapture, 'perf_counter_ns', clock)
+    token = RunToken()
+
+    assert captureWaitMs(token, 'capture', 100) is None
+    captureRegion(token, 'capture', 0, 0, 0, 0, 100)
+
+    clock.now_ns = 1030 * MS
+    assert captureWaitMs(token, 'capture', 100) == 70
+    # Captured a little late: the next slot stays on the grid (1200 ms, not 1205 ms)
+    clock.now_ns = 1105 * MS
+    assert captureWaitMs(token, 'capture', 100) is None
+    captureRegion(token, 'capture', 0, 0, 0, 0, 100)
+    clock.now_ns = 1150 * MS
+    assert captureWaitMs(token, 'capture', 100) == 50
+
+    # Far behind: a new grid starts from the late capture instead of a burst
+    clock.now_ns = 1500 * MS
+    captureRegion(token, 'capture', 0, 0, 0, 0, 100)
+    assert captureWaitMs(token, 'capture', 100) == 100
+
+    # No limit: never waits
+    assert captureWaitMs(token, 'capture', 0) is None
+
+
+@pytest.mark.skipif(sys.platform == 'win32' or not os.environ.get('DISPLAY'),
+                    reason="needs an X display (e.g. DISPLAY=:99 with Xvfb)")
+@pytest.mark.parametrize('backend', ['xshm', 'x11'])
+def test_x11_capture_reuses_its_buffer(backend):
+    grabber = createGrabber(backend)
+    try:
+        frame = grabber.allocate(64, 48)
+        pixels = frame.pixels
+        assert grabber.capture(frame, 0, 0) and grabber.capture(frame, 8, 8)
+        assert frame.pixels is pixels and pixels.shape == (48, 64, 4)
+        assert (frame.x, frame.y) == (8, 8) and grabber.stats()['frames'] == 2
+        grabber.release(frame)
+    finally:
+        grabber.close()
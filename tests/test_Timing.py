@@ -0,0 +1,41 @@
+# tests/test_Timing.py
+#
+# Delays keep to the path's schedule; holds always last their full length.
+
+from engine import Timing
+from engine.Timing import waitDeadlines, MAX_CATCH_UP_NS
+
+MS = 1_000_000
+
+
+def _at(monkeypatch, now_ns):
+    monkeypatch.setattr(Timing, 'perf_counter_ns', lambda: now_ns)
+
+
+def test_first_wait_starts_now(monkeypatch):
+    _at(monkeypatch, 1000 * MS)
+    assert waitDeadlines(None, 10 * MS, True) == (1010 * MS, 1010 * MS)
+
+
+def test_delay_makes_up_time_spent_since_the_last_wait(monkeypatch):
+    # Previous wait was due at 1000 ms; oversleep and dispatch took 0.3 ms
+    _at(monkeypatch, 1000 * MS + 300_000)
+    assert waitDeadlines(1000 * MS, 10 * MS, True) == (1010 * MS, 1010 * MS)
+
+
+def test_overdue_delay_does_not_wait_and_keeps_the_schedule(monkeypatch):
+    _at(monkeypatch, 1015 * MS)
+    assert waitDeadlines(1000 * MS, 10 * MS, True) == (1015 * MS, 1010 * MS)
+
+
+def test_hold_lasts_its_full_length(monkeypatch):
+    _at(monkeypatch, 1000 * MS + 300_000)
+    deadline_ns, due_ns = waitDeadlines(1000 * MS, 50 * MS, False)
+    assert deadline_ns == 1050 * MS + 300_000
+    assert due_ns == 1050 * MS
+
+
+def test_far_behind_starts_a_new_schedule(monkeypatch):
+    now_ns = 1000 * MS + MAX_CATCH_UP_NS + 1
+    _at(monkeypatch, now_ns)
+    assert waitDeadlines(1000 * MS, 10 * MS, True) == (now_ns + 10 * MS, now_ns + 10 * MS)